@@ -1,7 +1,5 @@
 import cv2
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
 import json
 import datetime
 
@@ -475,6 +473,7 @@ def detect_bubble_edges(image, coordinates, radius=20):
 
 def create_visualizations(image, bubble_data, heatmap):
     """Create additional visualizations."""
+    import matplotlib.pyplot as plt  # only needed for these debug plots
     # 1. Create fill percentage distribution plot
     plt.figure(figsize=(10, 6))
     fill_percentages = [b['fill_percent'] for b in bubble_data]
@@ -8,6 +8,60 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     HOST_REMOTE_URL: str
 
+    # Shared MongoDB client (app/database.py)
+    MONGO_APP_NAME: str = "assistant-api"
+    MONGO_MAX_POOL_SIZE: int = 100
+    MONGO_MIN_POOL_SIZE: int = 10  # also the number of connections opened at startup
+    MONGO_MAX_IDLE_TIME_MS: int = 300000
+    MONGO_CONNECT_TIMEOUT_MS: int = 5000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 5000
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = 5000
+    MONGO_SOCKET_TIMEOUT_MS: int = 0  # 0 = no socket timeout (driver default)
+    MONGO_COMPRESSORS: str = ""  # e.g. "zstd,snappy,zlib" for a remote server; empty = none
+    MONGO_RETRY_WRITES: bool = True
+    MONGO_READ_CONCERN: str = ""  # e.g. "majority"; empty = server default
+    MONGO_WRITE_CONCERN: str = ""  # e.g. "majority" or "1"; empty = server default
+    MONGO_READ_PRIMARY_PREFERRED: bool = False
+
+    # Uploaded images
+    UPLOAD_ORIGINALS_RETENTION_DAYS: int = 30
+    UPLOAD_COMPACT_JPEG_QUALITY: int = 70
+    UPLOAD_THUMBNAIL_WIDTH: int = 240
+
+    # Scheduled maintenance (subscription refresh, auto-archiving)
+    MAINTENANCE_INTERVAL_MINUTES: int = 60
+
+    # Batch attendance: repeated punches of a student within this window count once
+    ATTENDANCE_DEDUPE_SECONDS: int = 120
+
+    # Optional write-behind buffer for single punches (local write-ahead log, batched flushes)
+    ATTENDANCE_WRITE_BEHIND: bool = False
+    ATTENDANCE_WAL_DIR: str = "data/attendance_wal"
+    ATTENDANCE_FLUSH_INTERVAL_MS: int = 200
+    ATTENDANCE_FLUSH_MAX_RECORDS: int = 500
+
+    # Sequential ids (students, sales, outgoings) reserved per process in blocks of this size
+    ID_BLOCK_SIZE: int = 20
+
+    # bcrypt runs on its own pool of this many threads (also the number of concurrent hash/verify calls)
+    PASSWORD_HASH_WORKERS: int = 2
+    # /assistant/me confirms assistants from memory for this long (0 disables the cache);
+    # an assistant removed directly in Mongo is still confirmed until its entry expires
+    ASSISTANT_CACHE_SECONDS: int = 60
+
+    # Responses smaller than this are sent uncompressed
+    RESPONSE_COMPRESSION_MIN_BYTES: int = 1024
+
+    # Fingerprint host (HOST_REMOTE_URL): one pooled keep-alive client, every call bounded by these timeouts
+    HOST_TIMEOUT_SECONDS: float = 5
+    HOST_CONNECT_TIMEOUT_SECONDS: float = 2
+    HOST_MAX_CONNECTIONS: int = 20
+    # Device operations are queued in device_outbox and retried with exponential backoff
+    DEVICE_OUTBOX_MAX_ATTEMPTS: int = 8
+    DEVICE_OUTBOX_BACKOFF_SECONDS: int = 5
+    DEVICE_OUTBOX_MAX_BACKOFF_SECONDS: int = 900
+    DEVICE_OUTBOX_INTERVAL_SECONDS: int = 30
+
     class Config:
         env_file = ".env"
         validate_assignment = True  
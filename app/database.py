@@ -1,22 +1,63 @@
+import asyncio
+
 from motor.motor_asyncio import AsyncIOMotorClient
-from decouple import config
+from pymongo import ReadPreference
+from pymongo.read_concern import ReadConcern
+from pymongo.write_concern import WriteConcern
+
+from app.config import settings
+from app.utils.mongo_monitoring import mongo_stats
+
+MONGO_URI = settings.MONGO_URI
+DATABASE_NAME = settings.DATABASE_NAME
+
+
+def client_options() -> dict:
+    """Pool, timeout and compression settings for the shared client (see MONGO_* in config)."""
+    options = {
+        "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": settings.MONGO_MAX_IDLE_TIME_MS,
+        "connectTimeoutMS": settings.MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "waitQueueTimeoutMS": settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "retryWrites": settings.MONGO_RETRY_WRITES,
+        "appname": settings.MONGO_APP_NAME,
+        "event_listeners": mongo_stats.listeners,
+    }
+    if settings.MONGO_SOCKET_TIMEOUT_MS:
+        options["socketTimeoutMS"] = settings.MONGO_SOCKET_TIMEOUT_MS
+    if settings.MONGO_COMPRESSORS:
+        options["compressors"] = settings.MONGO_COMPRESSORS
+    return options
 
-MONGO_URI = config("MONGO_URI")
-DATABASE_NAME = config("DATABASE_NAME")
 
-client = AsyncIOMotorClient(MONGO_URI)
-db = client[DATABASE_NAME]
+def database_options() -> dict:
+    options = {"read_preference": ReadPreference.PRIMARY_PREFERRED if settings.MONGO_READ_PRIMARY_PREFERRED else ReadPreference.PRIMARY}
+    if settings.MONGO_READ_CONCERN:
+        options["read_concern"] = ReadConcern(settings.MONGO_READ_CONCERN)
+    if settings.MONGO_WRITE_CONCERN:
+        w = settings.MONGO_WRITE_CONCERN
+        options["write_concern"] = WriteConcern(w=int(w) if w.isdigit() else w)
+    return options
+
+
+# The one client of the process: Beanie and the raw collections below share its pool.
+# Motor connects lazily; main.py warms it up in the lifespan handler and closes it on shutdown.
+client = AsyncIOMotorClient(MONGO_URI, **client_options())
+db = client.get_database(DATABASE_NAME, **database_options())
 
 
 student_collection = db["students"]
 archived_student_collection = db["archived_students"]
 monthsale_collection = db["monthsales"]
 
-async def get_next_student_id():
-    counter = await db["counters"].find_one_and_update(
-        {"_id": "student_id"},
-        {"$inc": {"value": 1}},
-        upsert=True,
-        return_document=True
-    )
-    return counter["value"]
+
+async def warm_up(connections: int = None):
+    """Open up to `connections` pooled connections before the first request needs them."""
+    connections = connections or max(1, settings.MONGO_MIN_POOL_SIZE)
+    await asyncio.gather(*[client.admin.command("ping") for _ in range(connections)])
+
+
+def close():
+    client.close()
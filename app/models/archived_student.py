@@ -3,6 +3,7 @@ from bson import ObjectId
 from datetime import date, datetime
 from typing import Optional, List, Dict
 from beanie import Document
+from pymongo import IndexModel, ASCENDING
 from app.schemas.student import ExamEntry
 
 class ArchivedStudentModel(Document):
@@ -28,9 +29,14 @@ class ArchivedStudentModel(Document):
     months_without_payment: int = Field(default=0)
     archived_at: datetime = Field(default_factory=datetime.utcnow)
     archive_reason: Optional[str] = None
+    search_terms: List[str] = Field(default_factory=list)
 
     class Settings:
         name = "archived_students"  
+        indexes = [
+            IndexModel([("student_id", ASCENDING)]),
+            IndexModel([("search_terms", ASCENDING)]),
+        ]
 
     class Config:
         arbitrary_types_allowed = True
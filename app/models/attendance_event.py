@@ -0,0 +1,26 @@
+from beanie import Document
+from bson import ObjectId
+from datetime import datetime
+from typing import Optional
+from pymongo import IndexModel, ASCENDING, DESCENDING
+
+
+class AttendanceEvent(Document):
+    uid: int
+    student_id: ObjectId  # students._id
+    group_id: Optional[ObjectId] = None
+    timestamp: datetime  # UTC
+    approved: bool = False  # Recorded with assistant approval (schedule checks bypassed)
+    legacy_day: Optional[int] = None  # N of a migrated students.attendance["dayN"] entry (no real date)
+
+    class Settings:
+        name = "attendance_events"
+        indexes = [
+            IndexModel([("student_id", ASCENDING), ("timestamp", DESCENDING)]),  # student history
+            IndexModel([("group_id", ASCENDING), ("timestamp", ASCENDING)]),  # group/day roster
+            IndexModel([("uid", ASCENDING), ("timestamp", DESCENDING)]),
+        ]
+
+    model_config = {
+        "arbitrary_types_allowed": True
+    }
@@ -3,6 +3,7 @@ from pydantic import Field, ConfigDict
 from datetime import datetime, date
 from typing import Optional, Dict, List, Any
 from bson import ObjectId
+from pymongo import IndexModel, ASCENDING
 
 class BlacklistStudent(Document):
     model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -37,3 +38,9 @@ class BlacklistStudent(Document):
     
     class Settings:
         name = "blacklist"
+        indexes = [
+            IndexModel([("phone_number", ASCENDING)]),
+            IndexModel([("first_name", ASCENDING), ("last_name", ASCENDING)]),
+            IndexModel([("original_student_object_id", ASCENDING)]),
+            IndexModel([("student_id", ASCENDING)]),
+        ]
@@ -3,6 +3,7 @@ from bson import ObjectId, Decimal128
 from decimal import Decimal
 from datetime import datetime
 from pydantic import Field, field_validator
+from pymongo import IndexModel, ASCENDING, DESCENDING
 
 
 class BookSale(Document):
@@ -15,6 +16,11 @@ class BookSale(Document):
 
     class Settings:
         name = "booksales"
+        indexes = [
+            # Per-student sales and the latest one (last default price)
+            IndexModel([("student_id", ASCENDING), ("created_at", DESCENDING)]),
+            IndexModel([("created_at", ASCENDING)]),
+        ]
 
     model_config = {
         "arbitrary_types_allowed": True
@@ -1,5 +1,6 @@
 from beanie import Document
 from pydantic import Field
+from pymongo import IndexModel, ASCENDING
 
 class Counter(Document):
     name: str = Field(...)
@@ -7,15 +8,8 @@ class Counter(Document):
 
     class Settings:
         name = "counters"
-
-async def get_next_id(name: str) -> int:
-    counter = await Counter.find_one(Counter.name == name)
-
-    if counter:
-        counter.sequence_value += 1
-        await counter.save()
-        return counter.sequence_value
-    else:
-        new_counter = Counter(name=name, sequence_value=1)
-        await new_counter.insert()
-        return 1
+        indexes = [
+            # Unique so concurrent upserts of a new counter cannot create two documents
+            # (existing databases: run script/dedupe_counters.py first)
+            IndexModel([("name", ASCENDING)], unique=True),
+        ]
@@ -0,0 +1,25 @@
+from beanie import Document
+from pydantic import Field
+from datetime import datetime
+from typing import Optional
+from pymongo import IndexModel, ASCENDING
+
+
+class DeviceOutbox(Document):
+    operation: str  # e.g. delete_fingerprint
+    method: str  # HTTP method on the fingerprint host
+    path: str  # relative to HOST_REMOTE_URL
+    payload: Optional[dict] = None
+    status: str = "pending"  # pending / done / failed
+    attempts: int = 0
+    next_attempt_at: datetime = Field(default_factory=datetime.utcnow)
+    last_error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    completed_at: Optional[datetime] = None
+
+    class Settings:
+        name = "device_outbox"
+        indexes = [
+            # Due operations, oldest first
+            IndexModel([("status", ASCENDING), ("next_attempt_at", ASCENDING)]),
+        ]
@@ -16,6 +16,7 @@ class ExamModel(Document):
     solution_photo: str | None = None  # Legacy field for backward compatibility
     final_degree: int
     models: List[ExamModelVariant] = []  # New field for 3 exam models
+    student_count: int = 0  # Maintained incrementally with exam_results (app/utils/exam_results.py)
 
     class Settings:
         name = "exams"
@@ -0,0 +1,27 @@
+from beanie import Document
+from bson import ObjectId
+from pydantic import Field
+from datetime import datetime
+from typing import Optional
+from pymongo import IndexModel, ASCENDING
+
+
+class ExamResult(Document):
+    exam_id: str
+    student_id: ObjectId  # students._id
+    degree: Optional[float] = None
+    percentage: Optional[float] = None
+    delivery_time: datetime
+    solution_photo: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "exam_results"
+        indexes = [
+            IndexModel([("exam_id", ASCENDING), ("student_id", ASCENDING)], unique=True),
+            IndexModel([("student_id", ASCENDING)]),
+        ]
+
+    model_config = {
+        "arbitrary_types_allowed": True
+    }
@@ -0,0 +1,22 @@
+from beanie import Document
+from pydantic import Field
+from datetime import datetime
+from typing import Optional
+from pymongo import IndexModel, ASCENDING
+
+
+class GradingReview(Document):
+    exam_id: str
+    solution_photo: str
+    reason: str  # incomplete_id, ambiguous_id, duplicate_id, unknown_student, unreadable_sheet, ...
+    decoded_student_id: Optional[str] = None
+    exam_model: Optional[str] = None
+    details: Optional[str] = None
+    resolved: bool = False
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "grading_reviews"
+        indexes = [
+            IndexModel([("exam_id", ASCENDING), ("resolved", ASCENDING)]),
+        ]
@@ -8,6 +8,7 @@ from pydantic import BaseModel, Field
 from bson import ObjectId
 from pydantic_core import core_schema
 from pydantic import GetCoreSchemaHandler
+from pymongo import IndexModel, ASCENDING
 
 
 
@@ -48,3 +49,6 @@ class Group(Document):
 
     class Settings:
         name = "groups"
+        indexes = [
+            IndexModel([("students", ASCENDING)]),  # student -> group lookups
+        ]
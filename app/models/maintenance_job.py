@@ -0,0 +1,24 @@
+from beanie import Document
+from pydantic import Field
+from datetime import datetime
+from typing import Optional
+from pymongo import IndexModel, ASCENDING
+
+
+class MaintenanceJob(Document):
+    name: str
+    locked_until: Optional[datetime] = None
+    locked_by: Optional[str] = None
+    last_started_at: Optional[datetime] = None
+    last_finished_at: Optional[datetime] = None
+    last_status: Optional[str] = None  # success / failed
+    last_error: Optional[str] = None
+    last_duration_ms: Optional[float] = None
+    last_result: Optional[dict] = None
+    runs: int = Field(default=0)
+
+    class Settings:
+        name = "maintenance_jobs"
+        indexes = [
+            IndexModel([("name", ASCENDING)], unique=True),
+        ]
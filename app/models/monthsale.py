@@ -2,6 +2,7 @@ from beanie import Document
 from bson import ObjectId
 from pydantic import Field
 from datetime import datetime,date
+from pymongo import IndexModel, ASCENDING, DESCENDING
 
 class MonthlySale(Document):
     id: int
@@ -13,6 +14,12 @@ class MonthlySale(Document):
 
     class Settings:
         name = "monthsales"
+        indexes = [
+            # Per-student sales and the latest one (last default price)
+            IndexModel([("student_id", ASCENDING), ("created_at", DESCENDING)]),
+            IndexModel([("month", ASCENDING)]),
+            IndexModel([("created_at", ASCENDING)]),
+        ]
 
     class Config:
         arbitrary_types_allowed = True
@@ -1,6 +1,7 @@
 from beanie import Document
 from datetime import datetime
 from pydantic import Field
+from pymongo import IndexModel, ASCENDING
 
 class Outgoing(Document):
     id: int
@@ -10,3 +11,6 @@ class Outgoing(Document):
 
     class Settings:
         name = "outgoings"
+        indexes = [
+            IndexModel([("created_at", ASCENDING)]),
+        ]
@@ -3,6 +3,7 @@ from bson import ObjectId
 from datetime import date, datetime
 from typing import Optional, List, Dict
 from beanie import Document
+from pymongo import IndexModel, ASCENDING
 from app.schemas.student import ExamEntry
 
 class StudentModel(Document):  
@@ -27,9 +28,18 @@ class StudentModel(Document):
     subscription: Optional[Dict[str, Dict[str, float]]] = Field(default_factory=dict)
     months_without_payment: int = Field(default=0)
     archived: bool = Field(default=False)
+    search_terms: List[str] = Field(default_factory=list)  # see app/utils/student_search.py
 
     class Settings:
         name = "students"  
+        # StudentDocument maps the same collection; indexes are declared here only
+        indexes = [
+            IndexModel([("uid", ASCENDING)]),  # attendance
+            IndexModel([("student_id", ASCENDING)]),  # internal API, updates, deletes, batch grading
+            IndexModel([("phone_number", ASCENDING)]),
+            IndexModel([("first_name", ASCENDING), ("last_name", ASCENDING)]),
+            IndexModel([("search_terms", ASCENDING)]),  # /students/search (multikey)
+        ]
 
     class Config:
         arbitrary_types_allowed = True
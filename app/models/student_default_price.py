@@ -1,6 +1,7 @@
 from beanie import Document
 from pydantic import Field
 from decimal import Decimal
+from pymongo import IndexModel, ASCENDING
 
 
 class StudentDefaultPrice(Document):
@@ -8,4 +9,7 @@ class StudentDefaultPrice(Document):
     default_price: Decimal = Field(default=200)
 
     class Settings:
-        name = "student_default_prices"
\ No newline at end of file
+        name = "student_default_prices"
+        indexes = [
+            IndexModel([("student_id", ASCENDING)]),
+        ]
\ No newline at end of file
@@ -3,6 +3,9 @@ from bson import ObjectId
 from app.database import student_collection, archived_student_collection
 from app.models.archived_student import ArchivedStudentModel
 from app.models.student import StudentModel
+from app.utils.roster_index import roster_index
+from app.utils.attendance_cache import attendance_cache
+from app.utils.exam_results import remove_student_results, restore_student_results
 
 def get_month_key(date):
     return date.strftime("%Y-%m")
@@ -11,44 +14,52 @@ async def archive_unpaid_students():
     today = datetime.now()
     current_month = get_month_key(today)
     last_month = get_month_key(today.replace(day=1) - timedelta(days=1))
+    paid_this_month = f"subscription.monthsales.{current_month}"
+    paid_last_month = f"subscription.monthsales.{last_month}"
 
-    async for student in student_collection.find():
-        student_id = student["_id"]
-        subscription = student.get("subscription", {})
-        monthsales = subscription.get("monthsales", {})
+    # 🚫 Skip students with fewer than 2 months of payment history
+    has_history = {"$expr": {"$gte": [
+        {"$size": {"$objectToArray": {"$ifNull": ["$subscription.monthsales", {}]}}}, 2
+    ]}}
 
-        # 🚫 Skip students with fewer than 2 months of payment history
-        if len(monthsales) < 2:
-            continue
+    # 📌 Count months without payment, evaluated server-side
+    await student_collection.update_many(
+        {**has_history, paid_this_month: {"$exists": True}},
+        {"$set": {"months_without_payment": 0}}
+    )
+    await student_collection.update_many(
+        {**has_history, paid_this_month: {"$exists": False}, paid_last_month: {"$exists": True}},
+        {"$set": {"months_without_payment": 1}}
+    )
+    await student_collection.update_many(
+        {**has_history, paid_this_month: {"$exists": False}, paid_last_month: {"$exists": False}},
+        {"$set": {"months_without_payment": 2}}  # Missed 2 months in a row
+    )
 
-        paid_this_month = current_month in monthsales
-        paid_last_month = last_month in monthsales
+    # 📦 Archive only if unpaid for 2 consecutive months
+    to_archive = await student_collection.find(
+        {**has_history, "months_without_payment": {"$gte": 2}, "archived": {"$ne": True}}
+    ).to_list(length=None)
+    if not to_archive:
+        return {"archived": 0}
 
-        # 📌 Count months without payment
-        if paid_this_month:
-            months_without_payment = 0
-        elif paid_last_month:
-            months_without_payment = 1
-        else:
-            months_without_payment = 2  # Missed 2 months in a row
+    archived_students = []
+    for student in to_archive:
+        student["archived_at"] = today
+        student["archive_reason"] = "Unpaid for 2 consecutive months"
+        student["archived"] = True
+        archived_students.append(ArchivedStudentModel(**student).dict())
 
-        # Update the field for tracking
-        await student_collection.update_one(
-            {"_id": student_id},
-            {"$set": {"months_without_payment": months_without_payment}}
-        )
+    await archived_student_collection.insert_many(archived_students)
 
-        # 📦 Archive only if unpaid for 2 consecutive months
-        if months_without_payment >= 2 and not student.get("archived", False):
-            student["archived_at"] = today
-            student["archive_reason"] = "Unpaid for 2 consecutive months"
-            student["archived"] = True
+    # Delete the students from the student collection
+    await student_collection.delete_many({"_id": {"$in": [student["_id"] for student in to_archive]}})
+    await remove_student_results([student["_id"] for student in to_archive])
+    for student in to_archive:
+        roster_index.forget(student["student_id"])
+        attendance_cache.forget(student["student_id"])
 
-            archived_student = ArchivedStudentModel(**student)
-            await archived_student_collection.insert_one(archived_student.dict())
-
-            # Delete the student from the student collection
-            await student_collection.delete_one({"_id": student_id})
+    return {"archived": len(to_archive)}
 
 async def move_student_to_archive(student_id: int, archive_reason: str):
     student = await student_collection.find_one({"student_id": student_id})
@@ -61,6 +72,9 @@ async def move_student_to_archive(student_id: int, archive_reason: str):
     
     await archived_student_collection.insert_one(archived_student_data)
     await student_collection.delete_one({"student_id": student_id})
+    await remove_student_results([student["_id"]])
+    roster_index.forget(student_id)
+    attendance_cache.forget(student_id)
     
     return archived_student_data
 
@@ -81,6 +95,7 @@ async def restore_student_from_archive(student_id: int):
     await student_collection.insert_one(student_data)
     # Remove from archived collection
     await archived_student_collection.delete_one({"student_id": student_id})
+    await restore_student_results(student_data)
     
     return student_data
 
@@ -5,19 +5,16 @@ from app.database import student_collection
 from bson import ObjectId
 from datetime import datetime
 from app.schemas.archived_student import ArchivedStudentOut, ArchiveRequest, PaginatedArchivedStudentsResponse
-from typing import List, Any, Dict
+from typing import List, Dict, Optional
 from app.models.archived_student import ArchivedStudentModel
+from app.utils.roster_index import roster_index
+from app.utils.attendance_cache import attendance_cache
+from app.utils.exam_results import remove_student_results, restore_student_results
+from app.utils.pagination import paginate
+from app.utils.responses import ORJSONResponse
 
-# Helper function to convert ObjectIds to strings recursively
-def convert_objectids_to_strings(obj: Any) -> Any:
-    if isinstance(obj, ObjectId):
-        return str(obj)
-    elif isinstance(obj, dict):
-        return {key: convert_objectids_to_strings(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_objectids_to_strings(item) for item in obj]
-    else:
-        return obj
+# Raw archived documents minus the search prefixes
+ARCHIVE_LIST_PROJECTION = {"search_terms": 0}
 
 router = APIRouter(
     prefix="/archive",
@@ -44,6 +41,9 @@ async def move_student_to_archive(student_id: str, archive_reason: str):
     await archived_student.insert()
 
     await student_collection.delete_one({"_id": ObjectId(student_id)})
+    await remove_student_results([student["_id"]])
+    roster_index.forget(student["student_id"])
+    attendance_cache.forget(student["student_id"])
 
     return archived_student
 
@@ -72,40 +72,24 @@ async def restore_student(student_id: str):
 
     await student_collection.insert_one(archived_student)
     await archived_student_collection.delete_one({"_id": ObjectId(student_id)})
+    await restore_student_results(archived_student)
 
     return {"message": f"Student {student_id} restored successfully"}
 
 @router.get("/", response_model=PaginatedArchivedStudentsResponse)
-async def get_all_archived_students(page: int = 1, limit: int = 25):
+async def get_all_archived_students(page: int = 1, limit: int = 25, after: Optional[str] = None):
     from app.database import archived_student_collection
     try:
-        # Get total count
-        total = await archived_student_collection.count_documents({})
-        
-        # Calculate skip from page number
-        skip = (page - 1) * limit
-        
-        # Get archived students with pagination
-        archived = await archived_student_collection.find().skip(skip).limit(limit).to_list(length=None)
-
-        # Convert all ObjectId fields to strings recursively
-        archived = [convert_objectids_to_strings(student) for student in archived]
-        
-        # Calculate pagination metadata
-        total_pages = (total + limit - 1) // limit  # Ceiling division
-        has_next = page < total_pages
-        has_prev = page > 1
-
-        return PaginatedArchivedStudentsResponse(
-            archived_students=archived,
-            total=total,
-            page=page,
-            limit=limit,
-            total_pages=total_pages,
-            has_next=has_next,
-            has_prev=has_prev
-        )
+        archived, pagination = await paginate(archived_student_collection, page, limit, after, ARCHIVE_LIST_PROJECTION)
 
+        # Raw documents go straight to orjson (ObjectIds are rendered as strings)
+        return ORJSONResponse(content={
+            "archived_students": archived,
+            **pagination,
+        })
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -114,14 +98,14 @@ async def get_archived_student(student_id: str):
     from app.database import archived_student_collection
 
     try:
-        student = await archived_student_collection.find_one({"_id": ObjectId(student_id)})
+        student = await archived_student_collection.find_one({"_id": ObjectId(student_id)}, ARCHIVE_LIST_PROJECTION)
         if not student:
             raise HTTPException(status_code=404, detail="Archived student not found")
 
-        # Convert ObjectId to string
-        student["_id"] = str(student["_id"])
-
-        return jsonable_encoder(student)
+        # Same encoding as the list endpoint (ObjectIds anywhere in the document)
+        return ORJSONResponse(content=student)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -2,7 +2,7 @@ from fastapi import APIRouter, HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
 from app.database import db
 from app.schemas.assistant import AssistantRegister, AssistantLogin, AssistantOut
-from app.utils.auth import hash_password, verify_password
+from app.utils.auth import hash_password_async, verify_password_async, assistant_cache
 from app.utils.jwt import create_access_token, decode_access_token
 from datetime import timedelta
 
@@ -20,7 +20,7 @@ async def register(data: AssistantRegister):
     if existing:
         raise HTTPException(status_code=400, detail="Assistant name already exists")
 
-    hashed_pw = hash_password(data.password)
+    hashed_pw = await hash_password_async(data.password)
 
     new_assistant = {
         "name": data.name,
@@ -39,7 +39,7 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     if not assistant:
         raise HTTPException(status_code=404, detail="Assistant not found")
 
-    if not verify_password(form_data.password, assistant["hashed_password"]):
+    if not await verify_password_async(form_data.password, assistant["hashed_password"]):
         raise HTTPException(status_code=401, detail="Invalid password")
 
     payload = {
@@ -49,6 +49,7 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     }
 
     token = create_access_token(payload)
+    assistant_cache.put(assistant["name"], {"name": assistant["name"]})
     return {"access_token": token, "token_type": "bearer"}
 
 
@@ -58,9 +59,12 @@ async def get_me(token: str = Depends(oauth2_scheme)):
     if not payload or "sub" not in payload:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    assistant = await assistant_collection.find_one({"name": payload["sub"]})
-    if not assistant:
-        raise HTTPException(status_code=404, detail="Assistant not found")
+    assistant = assistant_cache.get(payload["sub"])
+    if assistant is None:
+        assistant = await assistant_collection.find_one({"name": payload["sub"]}, {"name": 1})
+        if not assistant:
+            raise HTTPException(status_code=404, detail="Assistant not found")
+        assistant_cache.put(assistant["name"], {"name": assistant["name"]})
 
     return AssistantOut(name=assistant["name"])
 
@@ -1,7 +1,12 @@
-from fastapi import APIRouter, HTTPException
-from datetime import datetime, timedelta
-from app.models.student import StudentModel
-from app.models.group import Group
+from fastapi import APIRouter, HTTPException, Depends, Query
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+from bson import ObjectId
+from app.database import student_collection
+from app.dependencies.auth import get_current_assistant
+from app.utils.attendance_cache import attendance_cache, EGYPT_TZ, GroupSchedule
+from app.utils.attendance_events import DATED_EVENTS, collection as attendance_events, event_document, local_day_bounds, record_attendance, record_attendance_batch, to_utc
+from app.utils.attendance_buffer import attendance_buffer
 from pydantic import BaseModel
 from dateutil.parser import isoparse
 import pytz
@@ -13,73 +18,70 @@ class AttendanceRequest(BaseModel):
     timestamp: str  # ISO format string, potentially with +03:00
     assistant_approved: bool = False  # Optional parameter to bypass group schedule validation
 
-@router.post("/")
-async def auto_attendance(data: AttendanceRequest):
-    try:
-        # Parse timestamp (aware or naive)
-        aware_timestamp = isoparse(data.timestamp)
-        egypt_tz = pytz.timezone("Africa/Cairo")
-        # Ensure timestamp is in Egypt time
-        local_timestamp = aware_timestamp.astimezone(egypt_tz)
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Invalid input format: {e}")
+def parse_punch_timestamp(timestamp: str) -> datetime:
+    # Parse timestamp (aware or naive)
+    aware_timestamp = isoparse(timestamp)
+    # Ensure timestamp is in Egypt time
+    return aware_timestamp.astimezone(EGYPT_TZ)
+
 
+def validate_punch(student: Optional[dict], group: Optional[GroupSchedule], local_timestamp: datetime,
+                   assistant_approved: bool) -> Optional[Tuple[int, str]]:
+    """Attendance rules for one punch. Returns (status_code, detail) when it is rejected."""
     # 1. Check if student exists
-    student = await StudentModel.find_one(StudentModel.uid == data.uid)
     if not student:
-        raise HTTPException(status_code=404, detail="Student not found")
+        return 404, "Student not found"
 
     # 2. Check if student belongs to a group
-    group = await Group.find(Group.students == student.id).first_or_none()
     if not group:
-        raise HTTPException(status_code=404, detail="Student is not assigned to any group")
+        return 404, "Student is not assigned to any group"
 
     # 3. Check if student's level matches group's level
-    if student.level != group.level:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Student level ({student.level}) does not match group level ({group.level})"
-        )
+    if student["level"] != group.level:
+        return 400, f"Student level ({student['level']}) does not match group level ({group.level})"
 
     # Skip validations 4 and 5 if assistant approved
-    if not data.assistant_approved:
-        # 4. Check if current day is in group's allowed days
-        current_day = local_timestamp.strftime("%A")  # Gets day name like "Monday", "Tuesday", etc.
-        allowed_days = [day.value for day in group.days]  # Convert enum to string values
-        if current_day not in allowed_days:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Attendance not allowed on {current_day}. Group schedule: {', '.join(allowed_days)}"
-            )
-
-        # 5. Check if attendance time is within allowed window
-        try:
-            group_start_time_str = group.start_time
-            group_start_time = datetime.strptime(group_start_time_str, "%H:%M").time()
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Invalid group start_time format: {e}")
+    if assistant_approved:
+        return None
 
-        today = local_timestamp.date()
-        scheduled_start_time = egypt_tz.localize(datetime.combine(today, group_start_time))
-        allowed_start = scheduled_start_time - timedelta(hours=1)
-        allowed_end = scheduled_start_time + timedelta(hours=1)
+    # 4. Check if current day is in group's allowed days
+    current_day = local_timestamp.strftime("%A")  # Gets day name like "Monday", "Tuesday", etc.
+    if current_day not in group.days:
+        return 400, f"Attendance not allowed on {current_day}. Group schedule: {', '.join(group.day_list)}"
 
-        is_on_time = allowed_start <= local_timestamp <= allowed_end
-        if not is_on_time:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Attendance time ({local_timestamp.strftime('%H:%M')}) is outside allowed window ({allowed_start.strftime('%H:%M')} - {allowed_end.strftime('%H:%M')})"
-            )
+    # 5. Check if attendance time is within allowed window
+    if group.start_time is None:
+        return 500, f"Invalid group start_time format: {group.start_time_str}"
 
-    # All validations passed - record attendance
-    if not hasattr(student, "attendance") or not isinstance(student.attendance, dict):
-        student.attendance = {}
+    allowed_start, allowed_end = group.window(local_timestamp)
+    is_on_time = allowed_start <= local_timestamp <= allowed_end
+    if not is_on_time:
+        return 400, f"Attendance time ({local_timestamp.strftime('%H:%M')}) is outside allowed window ({allowed_start.strftime('%H:%M')} - {allowed_end.strftime('%H:%M')})"
 
-    day_index = len(student.attendance) + 1
-    day_key = f"day{day_index}"
+    return None
 
-    student.attendance[day_key] = True  # Always True if all validations pass
-    await student.save()
+
+@router.post("/")
+async def auto_attendance(data: AttendanceRequest):
+    try:
+        local_timestamp = parse_punch_timestamp(data.timestamp)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid input format: {e}")
+
+    # Student and group schedule come from the resident cache
+    student, group = await attendance_cache.lookup(data.uid)
+    rejection = validate_punch(student, group, local_timestamp, data.assistant_approved)
+    if rejection:
+        raise HTTPException(status_code=rejection[0], detail=rejection[1])
+
+    # All validations passed - record an attendance event (dayN is the student's running count)
+    if attendance_buffer.enabled:
+        # Write-behind: acknowledged once on the local log; the count is not known until the flush
+        await attendance_buffer.append(event_document(student, group.group_id, local_timestamp, data.assistant_approved))
+        day_key = None
+    else:
+        attended = await record_attendance(student, group.group_id, local_timestamp, data.assistant_approved)
+        day_key = f"day{attended}"
 
     message = "Attendance recorded successfully"
     if data.assistant_approved:
@@ -89,10 +91,155 @@ async def auto_attendance(data: AttendanceRequest):
         "success": True,
         "message": message,
         "uid": data.uid,
-        "student": f"{student.first_name} {student.last_name}",
+        "student": f"{student['first_name']} {student['last_name']}",
         "group": group.group_name,
         "day": day_key,
         "status": True,
         "timestamp": local_timestamp.isoformat(),
-        "assistant_approved": data.assistant_approved
+        "assistant_approved": data.assistant_approved,
+        "buffered": attendance_buffer.enabled
+    }
+
+
+class PunchRecord(BaseModel):
+    uid: int
+    timestamp: str  # ISO format string, potentially with +03:00
+    assistant_approved: bool = False
+
+
+class AttendanceBatchRequest(BaseModel):
+    records: List[PunchRecord]
+
+
+@router.post("/batch")
+async def batch_attendance(data: AttendanceBatchRequest):
+    """
+    Ingest punches replayed from the device log.
+
+    Every record is validated in memory against the cached schedules, repeated
+    punches of a student within ATTENDANCE_DEDUPE_SECONDS are reported as
+    duplicates, and accepted events are written with one unordered bulk_write.
+    Returns one outcome per record, in request order.
+    """
+    # Buffered single punches must be visible to the duplicate check
+    if attendance_buffer.enabled:
+        await attendance_buffer.flush()
+
+    outcomes = [None] * len(data.records)
+    parsed = []
+    for index, record in enumerate(data.records):
+        try:
+            parsed.append((index, record, parse_punch_timestamp(record.timestamp)))
+        except Exception as e:
+            outcomes[index] = {"index": index, "uid": record.uid, "status": "rejected",
+                               "status_code": 400, "detail": f"Invalid input format: {e}"}
+
+    # Students and groups for all uids, cache misses resolved together
+    resolved = await attendance_cache.lookup_many(record.uid for _, record, _ in parsed)
+
+    accepted = []
+    for index, record, local_timestamp in parsed:
+        student, group = resolved.get(record.uid, (None, None))
+        rejection = validate_punch(student, group, local_timestamp, record.assistant_approved)
+        if rejection:
+            outcomes[index] = {"index": index, "uid": record.uid, "status": "rejected",
+                               "status_code": rejection[0], "detail": rejection[1]}
+            continue
+        accepted.append((index, student, group, local_timestamp, record.assistant_approved))
+
+    statuses = await record_attendance_batch([punch[1:] for punch in accepted])
+    for (index, student, group, local_timestamp, _), status in zip(accepted, statuses):
+        outcomes[index] = {
+            "index": index,
+            "uid": student["uid"],
+            "status": status,  # recorded / duplicate
+            "student": f"{student['first_name']} {student['last_name']}",
+            "group": group.group_name,
+            "timestamp": local_timestamp.isoformat(),
+        }
+
+    return {
+        "total": len(outcomes),
+        "recorded": sum(outcome["status"] == "recorded" for outcome in outcomes),
+        "duplicates": sum(outcome["status"] == "duplicate" for outcome in outcomes),
+        "rejected": sum(outcome["status"] == "rejected" for outcome in outcomes),
+        "results": outcomes
+    }
+
+
+def event_out(event: dict, student: Optional[dict] = None) -> dict:
+    timestamp = event["timestamp"]
+    return {
+        "id": str(event["_id"]),
+        "uid": event["uid"],
+        "student_object_id": str(event["student_id"]),
+        "student_id": student.get("student_id") if student else None,
+        "student": f"{student.get('first_name', '')} {student.get('last_name', '')}" if student else None,
+        "group_id": str(event["group_id"]) if event.get("group_id") else None,
+        # Migrated dayN entries carry no real date
+        "timestamp": None if event.get("legacy_day") else pytz.utc.localize(timestamp).astimezone(EGYPT_TZ).isoformat(),
+        "approved": event.get("approved", False),
+        "legacy_day": event.get("legacy_day"),
+    }
+
+
+@router.get("/groups/{group_id}")
+async def get_group_attendance(
+    group_id: str,
+    day: date = Query(description="Day in YYYY-MM-DD (Egypt time)"),
+    assistant=Depends(get_current_assistant)
+):
+    """Who attended a group on a given day (indexed range scan on group_id + timestamp)."""
+    if not ObjectId.is_valid(group_id):
+        raise HTTPException(status_code=400, detail="Invalid group ID")
+
+    start, end = local_day_bounds(day)
+    events = await attendance_events().find(
+        {"group_id": ObjectId(group_id), "timestamp": {"$gte": start, "$lt": end}, **DATED_EVENTS}
+    ).sort("timestamp", 1).to_list(length=None)
+
+    students = {}
+    async for student in student_collection.find(
+        {"_id": {"$in": list({event["student_id"] for event in events})}},
+        {"student_id": 1, "first_name": 1, "last_name": 1}
+    ):
+        students[student["_id"]] = student
+
+    return {
+        "group_id": group_id,
+        "day": day.isoformat(),
+        "count": len(events),
+        "attendance": [event_out(event, students.get(event["student_id"])) for event in events]
+    }
+
+
+@router.get("/students/{student_id}")
+async def get_student_attendance(
+    student_id: int,
+    start: Optional[datetime] = Query(None, description="From (inclusive)"),
+    end: Optional[datetime] = Query(None, description="Until (exclusive)"),
+    limit: int = Query(100, ge=1, le=1000),
+    assistant=Depends(get_current_assistant)
+):
+    """A student's attendance history, newest first (indexed range scan on student_id + timestamp)."""
+    student = await student_collection.find_one(
+        {"student_id": student_id}, {"student_id": 1, "first_name": 1, "last_name": 1}
+    )
+    if not student:
+        raise HTTPException(status_code=404, detail="Student not found")
+
+    query = {"student_id": student["_id"]}
+    if start or end:
+        query.update(DATED_EVENTS)
+        query["timestamp"] = {}
+        if start:
+            query["timestamp"]["$gte"] = to_utc(start if start.tzinfo else EGYPT_TZ.localize(start))
+        if end:
+            query["timestamp"]["$lt"] = to_utc(end if end.tzinfo else EGYPT_TZ.localize(end))
+
+    events = await attendance_events().find(query).sort("timestamp", -1).limit(limit).to_list(length=None)
+    return {
+        "student_id": student_id,
+        "count": len(events),
+        "attendance": [event_out(event, student) for event in events]
     }
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from typing import List, Optional
 from bson import ObjectId
 from datetime import datetime
 
@@ -7,6 +7,11 @@ from app.models.blacklist import BlacklistStudent
 from app.models.student import StudentModel
 from app.schemas.blacklist import BlacklistStudentRequest, BlacklistStudentResponse, RestoreStudentRequest, PaginatedBlacklistStudentsResponse
 from app.dependencies.auth import get_current_assistant
+from app.utils.roster_index import roster_index
+from app.utils.attendance_cache import attendance_cache
+from app.utils.blacklist_index import blacklist_index
+from app.utils.exam_results import remove_student_results
+from app.utils.pagination import paginate
 
 router = APIRouter(prefix="/blacklist", tags=["Blacklist"])
 
@@ -66,9 +71,13 @@ async def add_student_to_blacklist(
     
     # Save to blacklist collection
     await blacklist_student.insert()
+    blacklist_index.add(blacklist_student)
     
     # Delete from students collection
     await student.delete()
+    await remove_student_results([student_object_id])
+    roster_index.forget(student.student_id)
+    attendance_cache.forget(student.student_id)
     
     return BlacklistStudentResponse(
         id=str(blacklist_student.id),
@@ -107,6 +116,7 @@ async def remove_student_from_blacklist(
     
     # Delete from blacklist collection (permanent deletion)
     await blacklist_student.delete()
+    blacklist_index.remove(blacklist_student)
     
     return {
         "detail": f"Student {student_name} (ID: {student_id}) has been permanently deleted from the database",
@@ -115,18 +125,11 @@ async def remove_student_from_blacklist(
     }
 
 @router.get("/", response_model=PaginatedBlacklistStudentsResponse)
-async def get_all_blacklisted_students(page: int = 1, limit: int = 25, assistant=Depends(get_current_assistant)):
+async def get_all_blacklisted_students(page: int = 1, limit: int = 25, after: Optional[str] = None, assistant=Depends(get_current_assistant)):
     """
     Get all students in blacklist with pagination
     """
-    # Get total count
-    total = await BlacklistStudent.count()
-    
-    # Calculate skip from page number
-    skip = (page - 1) * limit
-    
-    # Get blacklisted students with pagination
-    blacklisted_students = await BlacklistStudent.find_all().skip(skip).limit(limit).to_list()
+    blacklisted_students, pagination = await paginate(BlacklistStudent, page, limit, after)
     
     # Convert to response objects
     students_response = [
@@ -143,20 +146,10 @@ async def get_all_blacklisted_students(page: int = 1, limit: int = 25, assistant
         )
         for student in blacklisted_students
     ]
-    
-    # Calculate pagination metadata
-    total_pages = (total + limit - 1) // limit  # Ceiling division
-    has_next = page < total_pages
-    has_prev = page > 1
-    
+
     return PaginatedBlacklistStudentsResponse(
         blacklist_students=students_response,
-        total=total,
-        page=page,
-        limit=limit,
-        total_pages=total_pages,
-        has_next=has_next,
-        has_prev=has_prev
+        **pagination
     )
 
 @router.get("/{blacklist_id}")
@@ -5,15 +5,18 @@ from app.models.booksale import BookSale
 from bson import ObjectId
 from app.models.booksale import BookSale
 from app.models.student import StudentModel
-from app.models.counter import get_next_id
+from app.utils.id_generator import id_allocator
 from app.schemas.booksale import BookSaleCreate, BookSaleResponse, MonthQuery, BookSaleMonthSummary, BookSaleDetailResponse, PaginatedBookSalesResponse
 from app.dependencies.auth import get_current_assistant
 from bson.decimal128 import Decimal128
 from decimal import Decimal
 from beanie import PydanticObjectId
-from beanie.operators import In
+from app.utils.pagination import paginate
+from app.utils.projection import student_name_map
+from app.utils.trusted_reads import raw_find
+from app.utils.responses import ORJSONResponse
 from collections import defaultdict
-from typing import List
+from typing import List, Optional
 
 
 router = APIRouter(prefix="/finance/booksales", tags=["Finance"])
@@ -21,7 +24,7 @@ router = APIRouter(prefix="/finance/booksales", tags=["Finance"])
 @router.post("/", response_model=BookSaleResponse)
 async def create_book_sale(data: BookSaleCreate, assistant=Depends(get_current_assistant)):
     sale = BookSale(
-        id=await get_next_id("booksales"),
+        id=await id_allocator.next_id("booksales"),
         student_id=ObjectId(data.student_id),
         price=data.price,
         default_price=data.default_price,
@@ -82,16 +85,17 @@ async def get_booksales_by_month(query: MonthQuery, assistant=Depends(get_curren
             next_month = datetime(month_start.year, month_start.month + 1, 1)
 
         # Query MongoDB using date range
-        booksales = await BookSale.find(
-            {"created_at": {"$gte": month_start, "$lt": next_month}}
-        ).to_list()
+        # Raw documents; the response class renders Decimal128 prices
+        booksales = await raw_find(
+            BookSale, {"created_at": {"$gte": month_start, "$lt": next_month}}
+        )
 
         # Convert ObjectIds to strings for JSON serialization
         for sale in booksales:
-            sale.id = str(sale.id)
-            sale.student_id = str(sale.student_id)
+            sale["_id"] = str(sale["_id"])
+            sale["student_id"] = str(sale["student_id"])
 
-        return booksales
+        return ORJSONResponse(content=booksales)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -129,22 +133,11 @@ async def get_booksales_by_month(student_id: str, assistant=Depends(get_current_
     return result
 
 @router.get("/all", response_model=PaginatedBookSalesResponse)
-async def get_all_booksales(page: int = 1, limit: int = 10, assistant=Depends(get_current_assistant)):
-    # Get total count
-    total = await BookSale.count()
-    
-    # Calculate skip from page number
-    skip = (page - 1) * limit
-    
-    # Get booksales with pagination
-    booksales = await BookSale.find_all().skip(skip).limit(limit).to_list()
+async def get_all_booksales(page: int = 1, limit: int = 10, after: Optional[str] = None, assistant=Depends(get_current_assistant)):
+    booksales, pagination = await paginate(BookSale, page, limit, after)
 
-    # Get all student IDs
-    student_ids = list({sale.student_id for sale in booksales})
-
-    # Fetch related students
-    students = await StudentModel.find(In(StudentModel.id, student_ids)).to_list()
-    student_map = {s.id: f"{s.first_name} {s.last_name}" for s in students}
+    # Fetch the names of related students
+    student_map = await student_name_map({sale.student_id for sale in booksales})
 
     response = []
     for sale in booksales:
@@ -155,20 +148,10 @@ async def get_all_booksales(page: int = 1, limit: int = 10, assistant=Depends(ge
             price=float(sale.price),
             created_at=sale.created_at
         ))
-    
-    # Calculate pagination metadata
-    total_pages = (total + limit - 1) // limit  # Ceiling division
-    has_next = page < total_pages
-    has_prev = page > 1
 
     return PaginatedBookSalesResponse(
         book_sales=response,
-        total=total,
-        page=page,
-        limit=limit,
-        total_pages=total_pages,
-        has_next=has_next,
-        has_prev=has_prev
+        **pagination
     )
 
 
@@ -1,47 +1,138 @@
 from io import BytesIO
-from fastapi import APIRouter, Depends, File, UploadFile
+from fastapi import APIRouter, Depends, File, UploadFile, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse, StreamingResponse
 from bson import ObjectId, errors as bson_errors
 from dotenv import load_dotenv
-import cv2
-import numpy as np
 import os
+import json
 import base64
-from utils.bubble_sheet_processor import process_bubble_sheet
 
 load_dotenv()
 
 bubbles_router = APIRouter(prefix="/bubble", tags=["Bubble"])
 
-@bubbles_router.post("/process")
-async def process_bubble_sheet_endpoint(image_file: UploadFile = File(...)):
-    try:
-        contents = await image_file.read()
-        image = cv2.imdecode(np.frombuffer(contents, np.uint8), cv2.IMREAD_COLOR)
 
-        result = process_bubble_sheet(image)
-        visualization_image = result.get("visualization_image")
+def grade_bubble_sheet_image(contents: bytes) -> dict:
+    """Decode a full resolution sheet, grade it and build the API response."""
+    # OpenCV, NumPy and the grading module load on first use, not at startup
+    import cv2
+    import numpy as np
+    from app.utils.bubble_sheet_processor import process_bubble_sheet
 
-        if visualization_image is None:
-            return {
-                "error": "No visualization image returned from processor",
-                "results": result.get("results", {})  # لإبقاء نفس البنية
-            }
+    image = cv2.imdecode(np.frombuffer(contents, np.uint8), cv2.IMREAD_COLOR)
 
-        # Encode image to PNG and then to base64
-        success, buffer = cv2.imencode(".png", visualization_image)
-        if not success:
-            return {"error": "Failed to encode image"}
+    result = process_bubble_sheet(image)
+    visualization_image = result.get("visualization_image")
 
-        base64_image = base64.b64encode(buffer.tobytes()).decode("utf-8")
-
-        # Build response
+    if visualization_image is None:
         return {
-            "image_base64": base64_image,
-            "results": result.get("results", {}),
+            "error": "No visualization image returned from processor",
+            "results": result.get("results", {})  # لإبقاء نفس البنية
         }
 
+    # Encode image to PNG and then to base64
+    success, buffer = cv2.imencode(".png", visualization_image)
+    if not success:
+        return {"error": "Failed to encode image"}
+
+    base64_image = base64.b64encode(buffer.tobytes()).decode("utf-8")
+
+    # Build response
+    return {
+        "image_base64": base64_image,
+        "results": result.get("results", {}),
+    }
+
+
+@bubbles_router.post("/process")
+async def process_bubble_sheet_endpoint(image_file: UploadFile = File(...)):
+    try:
+        contents = await image_file.read()
+        return grade_bubble_sheet_image(contents)
+
     except bson_errors.InvalidId as e:
         return {"error": "Invalid ObjectId format", "details": str(e)}
     except Exception as e:
-        return {"error": "An error occurred while processing the bubble sheet", "details": str(e)}
\ No newline at end of file
+        return {"error": "An error occurred while processing the bubble sheet", "details": str(e)}
+
+
+@bubbles_router.websocket("/live")
+async def live_capture_endpoint(websocket: WebSocket):
+    """
+    Real-time camera capture mode.
+
+    Protocol (one connection per camera session):
+    - Binary message: a low resolution preview frame (JPEG/PNG). The server
+      replies with {"type": "frame", ...} containing detected markers,
+      quality metrics, alignment hints and whether the sheet is stable.
+      Clients should send the next frame after receiving the reply so frames
+      never queue up behind each other.
+    - Text message {"action": "capture"}: accepted only once all four markers
+      are stable. The server replies {"type": "capture_ready"} and grades the
+      next binary message as the full resolution capture, replying with
+      {"type": "result", ...} (same body as POST /bubble/process).
+    - Text message {"action": "reset"}: restart marker stability tracking.
+    """
+    from app.utils.live_capture import analyze_frame, MarkerStabilityTracker
+
+    await websocket.accept()
+
+    tracker = MarkerStabilityTracker()
+    awaiting_capture = False
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+
+            text = message.get("text")
+            if text is not None:
+                try:
+                    command = json.loads(text)
+                except ValueError:
+                    command = None
+                if not isinstance(command, dict):
+                    await websocket.send_json({"type": "error", "message": "Invalid JSON command"})
+                    continue
+
+                action = command.get("action")
+                if action == "capture":
+                    if tracker.is_stable:
+                        awaiting_capture = True
+                        await websocket.send_json({"type": "capture_ready"})
+                    else:
+                        await websocket.send_json({
+                            "type": "capture_rejected",
+                            "message": "Markers are not stable yet, keep the sheet in frame"
+                        })
+                elif action == "reset":
+                    tracker.reset()
+                    awaiting_capture = False
+                    await websocket.send_json({"type": "reset"})
+                else:
+                    await websocket.send_json({"type": "error", "message": f"Unknown action: {action}"})
+                continue
+
+            data = message.get("bytes")
+            if data is None:
+                continue
+
+            if awaiting_capture:
+                awaiting_capture = False
+                try:
+                    result = await run_in_threadpool(grade_bubble_sheet_image, data)
+                except Exception as e:
+                    result = {"error": "An error occurred while processing the bubble sheet", "details": str(e)}
+                tracker.reset()
+                await websocket.send_json({"type": "result", **result})
+                continue
+
+            # Fast path: markers and quality checks only
+            analysis = await run_in_threadpool(analyze_frame, data)
+            analysis["stable"] = tracker.update(analysis)
+            await websocket.send_json({"type": "frame", **analysis})
+
+    except WebSocketDisconnect:
+        pass
@@ -2,10 +2,11 @@ from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, status,
 from app.schemas.course import CourseCreate, CourseOut, CourseUpdate
 from app.dependencies.auth import get_current_assistant
 from app.database import db
+from app.utils.image_storage import save_upload, thumbnail_path_for
+from fastapi.concurrency import run_in_threadpool
 from bson import ObjectId
 from datetime import datetime
 import os
-import shutil
 
 router = APIRouter(prefix="/courses", tags=["Courses"])
 courses_collection = db["courses"]
@@ -13,6 +14,16 @@ courses_collection = db["courses"]
 UPLOAD_DIR = "upload/photos"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+def course_thumbnail(photo_path):
+    """Thumbnail of a course photo if one has been generated."""
+    if not photo_path:
+        return None
+    try:
+        thumbnail_path = thumbnail_path_for(photo_path)
+    except ValueError:
+        return None
+    return thumbnail_path if os.path.exists(thumbnail_path) else None
+
 @router.post("/", response_model=CourseOut)
 async def create_course(
     course_name: str = Form(...),
@@ -22,10 +33,8 @@ async def create_course(
     photo: UploadFile = File(...),
     assistant=Depends(get_current_assistant)
 ):
-    # Save the uploaded photo
-    photo_path = os.path.join(UPLOAD_DIR, photo.filename)
-    with open(photo_path, "wb") as buffer:
-        shutil.copyfileobj(photo.file, buffer)
+    # Save the uploaded photo and its list thumbnail
+    photo_path = await run_in_threadpool(save_upload, photo, UPLOAD_DIR, "", True)
 
     course_data = {
         "course_name": course_name,
@@ -38,6 +47,7 @@ async def create_course(
 
     result = await courses_collection.insert_one(course_data)
     course_data["id"] = str(result.inserted_id)
+    course_data["thumbnail_path"] = course_thumbnail(photo_path)
     return CourseOut(**course_data)
 
 @router.get("/", response_model=list[CourseOut])
@@ -46,6 +56,7 @@ async def get_all_courses(assistant=Depends(get_current_assistant)):
     for course in courses:
         course["id"] = str(course["_id"])
         del course["_id"]
+        course["thumbnail_path"] = course_thumbnail(course.get("photo_path"))
     return [CourseOut(**c) for c in courses]
 
 @router.get("/{course_id}", response_model=CourseOut)
@@ -55,6 +66,7 @@ async def get_course_by_id(course_id: str, assistant=Depends(get_current_assista
         raise HTTPException(status_code=404, detail="Course not found")
     course["id"] = str(course["_id"])
     del course["_id"]
+    course["thumbnail_path"] = course_thumbnail(course.get("photo_path"))
     return CourseOut(**course)
 
 @router.put("/{course_id}", response_model=dict)
@@ -77,9 +89,7 @@ async def update_course(
     if course_end_date is not None:
         update_data["course_end_date"] = course_end_date
     if photo is not None:
-        photo_path = os.path.join(UPLOAD_DIR, photo.filename)
-        with open(photo_path, "wb") as buffer:
-            shutil.copyfileobj(photo.file, buffer)
+        photo_path = await run_in_threadpool(save_upload, photo, UPLOAD_DIR, "", True)
         update_data["photo_path"] = photo_path
 
     if not update_data:
@@ -1,9 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
 from datetime import date, datetime
-from typing import List
-from pathlib import Path
+from typing import List, Optional
 from bson import ObjectId
-import shutil
 import os
 
 from app.dependencies.auth import get_current_assistant
@@ -12,7 +11,13 @@ from app.models.student import StudentModel
 from app.models.common import PyObjectId  
 from app.schemas.student import ExamEntryCreate
 from app.schemas.exam import ExamCreate, ExamUpdate, ExamOut, PaginatedExamsResponse
-from app.models.student_document import StudentDocument, ExamEntry
+from app.models.student_document import ExamEntry
+from app.models.grading_review import GradingReview
+from app.models.exam_result import ExamResult
+from app.utils.batch_grader import grade_exam_batch
+from app.utils.exam_results import record_exam_result, delete_exam_results
+from app.utils.image_storage import save_upload, save_uploads, compact_student_sheet
+from app.utils.pagination import paginate
 from app.database import db
 
 students_collection = db["students"]
@@ -77,9 +82,7 @@ async def create_exam(
     # Legacy solution photo handling
     photo_path = None
     if solution_photo:
-        photo_path = f"{UPLOAD_DIR}/{solution_photo.filename}"
-        with open(photo_path, "wb") as f:
-            shutil.copyfileobj(solution_photo.file, f)
+        photo_path = await run_in_threadpool(save_upload, solution_photo, UPLOAD_DIR, "", True)
 
     # Handle 3 model solutions
     models = []
@@ -92,14 +95,9 @@ async def create_exam(
     for model_file, model_name, model_number in model_files:
         model_path = None
         if model_file and hasattr(model_file, 'filename') and model_file.filename and model_file.filename.strip():
-            # Create unique filename to avoid conflicts
-            model_filename = f"model_{model_number}_{model_file.filename}"
-            model_path = f"{UPLOAD_DIR}/{model_filename}"
-            
             try:
-                # Save the uploaded file
-                with open(model_path, "wb") as f:
-                    shutil.copyfileobj(model_file.file, f)
+                # Save the uploaded file under a unique generated name
+                model_path = await run_in_threadpool(save_upload, model_file, UPLOAD_DIR, f"model_{model_number}_", True)
                 print(f"✅ Saved model {model_number} solution: {model_path}")
             except Exception as e:
                 print(f"❌ Failed to save model {model_number} solution: {str(e)}")
@@ -133,42 +131,19 @@ async def create_exam(
 
 
 @router.get("/", response_model=PaginatedExamsResponse)
-async def get_all_exams(page: int = 1, limit: int = 25):
-    # Get total count
-    total = await exams_collection.count_documents({})
-    
-    # Calculate skip from page number
-    skip = (page - 1) * limit
-    
-    # Get exams with pagination
-    exams = await exams_collection.find().skip(skip).limit(limit).to_list(length=None)
-    students = await students_collection.find().to_list(length=None)
+async def get_all_exams(page: int = 1, limit: int = 25, after: Optional[str] = None):
+    exams, pagination = await paginate(exams_collection, page, limit, after)
     
     exam_list = []
     for exam in exams:
-        exam_id = str(exam["_id"])
-        # Count students who have this exam in their exams list
-        count = sum(
-            any(str(entry.get("exam_id", "")) == exam_id for entry in student.get("exams", []))
-            for student in students
-        )
-        exam["id"] = exam_id
-        exam["student_count"] = count
+        exam["id"] = str(exam["_id"])
+        # Participant count is kept on the exam document as results are recorded
+        exam.setdefault("student_count", 0)
         exam_list.append(ExamOut(**exam))
     
-    # Calculate pagination metadata
-    total_pages = (total + limit - 1) // limit  # Ceiling division
-    has_next = page < total_pages
-    has_prev = page > 1
-    
     return PaginatedExamsResponse(
         exams=exam_list,
-        total=total,
-        page=page,
-        limit=limit,
-        total_pages=total_pages,
-        has_next=has_next,
-        has_prev=has_prev
+        **pagination
     )
 
 
@@ -200,15 +175,12 @@ async def update_exam(
 
     
     if solution_photo:
-        photo_path = f"{UPLOAD_DIR}/{solution_photo.filename}"
-        with open(photo_path, "wb") as f:
-            shutil.copyfileobj(solution_photo.file, f)
+        photo_path = await run_in_threadpool(save_upload, solution_photo, UPLOAD_DIR, "", True)
         update_data["solution_photo"] = photo_path
 
-    for key, value in update_data.items():
-        setattr(exam, key, value)
-
-    await exam.save()
+    # $set only the changed fields so the incrementally maintained student_count is not overwritten
+    if update_data:
+        await exam.set(update_data)
     return ExamOut(**exam.dict(exclude={"id", "_id"}), id=str(exam.id))
 
 
@@ -218,6 +190,7 @@ async def delete_exam(exam_id: str, assistant=Depends(get_current_assistant)):
     if not exam:
         raise HTTPException(status_code=404, detail="Exam not found")
     await exam.delete()
+    await delete_exam_results(str(exam.id))
 
 
 
@@ -233,7 +206,7 @@ async def add_student_to_exam(
     solution_photo: UploadFile = File(None),
     assistant=Depends(get_current_assistant)
 ):
-    student = await StudentDocument.get(ObjectId(student_id))
+    student = await students_collection.find_one({"_id": ObjectId(student_id)}, {"_id": 1})
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
 
@@ -243,11 +216,9 @@ async def add_student_to_exam(
 
     solution_path = None
     if solution_photo:
-        filename = Path(solution_photo.filename).name
-        os.makedirs(STUDENT_SOLUTION_DIR, exist_ok=True)
-        solution_path = f"{STUDENT_SOLUTION_DIR}/{filename}"
-        with open(solution_path, "wb") as f:
-            shutil.copyfileobj(solution_photo.file, f)
+        # Already graded by the assistant, store the compact copy only
+        solution_path = await run_in_threadpool(save_upload, solution_photo, STUDENT_SOLUTION_DIR, f"{exam_id}_{student_id}_")
+        solution_path = await run_in_threadpool(compact_student_sheet, solution_path)
 
     new_entry = ExamEntry(
         exam_id=str(exam.id),
@@ -257,8 +228,8 @@ async def add_student_to_exam(
         solution_photo=solution_path
     )
 
-    student.exams.append(new_entry)
-    await student.save()
+    if not await record_exam_result(student["_id"], new_entry):
+        raise HTTPException(status_code=400, detail="Student has already submitted this exam")
 
     return {"msg": "Student exam record added successfully"}
 
@@ -282,22 +253,29 @@ async def get_students_for_exam(exam_id: str):
         "solution_photo": exam.get("solution_photo")
     }
 
-    # Search students who participated
-    students = await students_collection.find().to_list(length=None)
+    # Results of this exam (indexed on exam_id), then their students in one query
+    results = await ExamResult.get_motor_collection().find({"exam_id": exam_id}).to_list(length=None)
+    students = {}
+    async for student in students_collection.find(
+        {"_id": {"$in": [result["student_id"] for result in results]}},
+        {"student_id": 1, "first_name": 1, "last_name": 1, "phone_number": 1, "guardian_number": 1}
+    ):
+        students[student["_id"]] = student
+
     entered_students = []
-    for student in students:
-        for entry in student.get("exams", []):
-            if str(entry.get("exam_id", "")) == exam_id:
-                entered_students.append({
-                    "student_id": student["student_id"],
-                    "first_name": student["first_name"],
-                    "last_name": student["last_name"],
-                    "phone_number": student["phone_number"],
-                    "guardian_number": student["guardian_number"],
-                    "degree": entry.get("degree"),
-                    "percentage": entry.get("percentage"),
-                    "delivery_time": entry.get("delivery_time")
-                })
+    for result in results:
+        student = students.get(result["student_id"])
+        if student:
+            entered_students.append({
+                "student_id": student["student_id"],
+                "first_name": student["first_name"],
+                "last_name": student["last_name"],
+                "phone_number": student["phone_number"],
+                "guardian_number": student["guardian_number"],
+                "degree": result.get("degree"),
+                "percentage": result.get("percentage"),
+                "delivery_time": result.get("delivery_time")
+            })
 
     return {
         "exam": exam_details,
@@ -305,6 +283,62 @@ async def get_students_for_exam(exam_id: str):
         "students": entered_students
     }
 
+@router.post("/{exam_id}/batch-grade")
+async def batch_grade_exam(
+    exam_id: str,
+    sheets: List[UploadFile] = File(...),
+    assistant=Depends(get_current_assistant)
+):
+    """
+    Grade a stack of student bubble sheets in one request.
+    Students are matched from the ID bubbles on each sheet; sheets that cannot
+    be matched safely are added to the exam's review queue.
+    """
+    exam = await ExamModel.get(exam_id)
+    if not exam:
+        raise HTTPException(status_code=404, detail="Exam not found")
+
+    sheet_paths = await run_in_threadpool(save_uploads, sheets, STUDENT_SOLUTION_DIR, f"{exam_id}_")
+
+    try:
+        return await grade_exam_batch(exam, sheet_paths)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/{exam_id}/reviews")
+async def get_exam_reviews(exam_id: str, assistant=Depends(get_current_assistant)):
+    """Sheets from batch grading that need manual review."""
+    reviews = await GradingReview.find(
+        GradingReview.exam_id == exam_id,
+        GradingReview.resolved == False
+    ).to_list()
+
+    return [
+        {
+            "id": str(review.id),
+            "solution_photo": review.solution_photo,
+            "reason": review.reason,
+            "decoded_student_id": review.decoded_student_id,
+            "exam_model": review.exam_model,
+            "details": review.details,
+            "created_at": review.created_at
+        }
+        for review in reviews
+    ]
+
+
+@router.post("/{exam_id}/reviews/{review_id}/resolve")
+async def resolve_exam_review(exam_id: str, review_id: str, assistant=Depends(get_current_assistant)):
+    review = await GradingReview.get(review_id)
+    if not review or review.exam_id != exam_id:
+        raise HTTPException(status_code=404, detail="Review not found")
+
+    review.resolved = True
+    await review.save()
+    return {"message": "Review marked as resolved"}
+
+
 # Exam correction endpoints have been moved to the fingerprint backend
 # Students should submit their solutions to the fingerprint backend at:
 # POST /exams/{exam_id}/submit
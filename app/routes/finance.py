@@ -9,6 +9,8 @@ from app.models.booksale import BookSale
 from app.models.outgoing import Outgoing
 from app.schemas.profit import DailyProfitResponse, ProfitFilterRequest
 from app.dependencies.auth import get_current_assistant
+from app.utils.trusted_reads import raw_find, as_decimal, as_float
+from app.utils.responses import ORJSONResponse
 
 router = APIRouter(prefix="/finance", tags=["Finance"])
 egypt_tz = timezone("Africa/Cairo")
@@ -24,23 +26,24 @@ async def get_daily_profits(
         "outgoings": Decimal("0.0")
     })
 
-    # Fetch all records
-    monthsales = await MonthlySale.find_all().to_list()
-    booksales = await BookSale.find_all().to_list()
-    outgoings = await Outgoing.find_all().to_list()
+    # Fetch all records (trusted reads: just price and created_at, no model hydration)
+    projection = {"price": 1, "created_at": 1}
+    monthsales = await raw_find(MonthlySale, {}, projection)
+    booksales = await raw_find(BookSale, {}, projection)
+    outgoings = await raw_find(Outgoing, {}, projection)
 
     # Group and sum by Egypt day
     for sale in monthsales:
-        local_day = sale.created_at.astimezone(egypt_tz).date()
-        profits_by_day[local_day]["monthsales"] += Decimal(str(sale.price))
+        local_day = sale["created_at"].astimezone(egypt_tz).date()
+        profits_by_day[local_day]["monthsales"] += as_decimal(sale["price"])
 
     for sale in booksales:
-        local_day = sale.created_at.astimezone(egypt_tz).date()
-        profits_by_day[local_day]["booksales"] += Decimal(str(sale.price))
+        local_day = sale["created_at"].astimezone(egypt_tz).date()
+        profits_by_day[local_day]["booksales"] += as_decimal(sale["price"])
 
     for out in outgoings:
-        local_day = out.created_at.astimezone(egypt_tz).date()
-        profits_by_day[local_day]["outgoings"] += Decimal(str(out.price))
+        local_day = out["created_at"].astimezone(egypt_tz).date()
+        profits_by_day[local_day]["outgoings"] += as_decimal(out["price"])
 
     # Filter by date if provided
     result = []
@@ -49,7 +52,7 @@ async def get_daily_profits(
             continue
 
         profit = (values["monthsales"] + values["booksales"]) - values["outgoings"]
-        result.append(DailyProfitResponse(
+        result.append(DailyProfitResponse.model_construct(
             date=day,
             total_monthsales=values["monthsales"],
             total_booksales=values["booksales"],
@@ -98,8 +101,8 @@ async def get_last_month_default_price(student_id: str, assistant=Depends(get_cu
 
 @router.get("/monthly-summary")
 async def get_monthly_summary(assistant=Depends(get_current_assistant)):
-    monthsales = await MonthlySale.find_all().to_list()
-    booksales = await BookSale.find_all().to_list()
+    monthsales = await raw_find(MonthlySale, {}, {"month": 1, "student_id": 1, "price": 1})
+    booksales = await raw_find(BookSale, {}, {"created_at": 1, "price": 1})
 
     report = defaultdict(lambda: {
         "student_ids": set(),
@@ -111,24 +114,24 @@ async def get_monthly_summary(assistant=Depends(get_current_assistant)):
     # Process monthsales
     for sale in monthsales:
         # Ensure month is in "YYYY-MM" format
-        if isinstance(sale.month, str):
-            month = sale.month
-        elif isinstance(sale.month, datetime):
-            month = sale.month.strftime("%Y-%m")
+        if isinstance(sale["month"], str):
+            month = sale["month"]
+        elif isinstance(sale["month"], datetime):
+            month = sale["month"].strftime("%Y-%m")
         else:
             # If it's a date or invalid, convert it
             try:
-                month = sale.month.strftime("%Y-%m")
+                month = sale["month"].strftime("%Y-%m")
             except Exception:
-                raise ValueError(f"Invalid month value: {sale.month}")
+                raise ValueError(f"Invalid month value: {sale['month']}")
 
-        report[month]["student_ids"].add(str(sale.student_id))
-        report[month]["total_monthsales_price"] += float(sale.price)
+        report[month]["student_ids"].add(str(sale["student_id"]))
+        report[month]["total_monthsales_price"] += as_float(sale["price"])
 
     # Process booksales
     for sale in booksales:
-        month = sale.created_at.strftime("%Y-%m")
-        report[month]["total_booksales_price"] += float(sale.price)
+        month = sale["created_at"].strftime("%Y-%m")
+        report[month]["total_booksales_price"] += as_float(sale["price"])
         report[month]["books_sold_count"] += 1
 
     # Build response
@@ -142,4 +145,4 @@ async def get_monthly_summary(assistant=Depends(get_current_assistant)):
             "books_sold_count": data["books_sold_count"]
         })
 
-    return final_report
\ No newline at end of file
+    return ORJSONResponse(content=final_report)
\ No newline at end of file
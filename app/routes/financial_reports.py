@@ -9,6 +9,8 @@ from app.models.student import StudentModel
 from app.models.student_default_price import StudentDefaultPrice
 from app.models.archived_student import ArchivedStudentModel
 from app.database import student_collection, archived_student_collection
+from app.utils.trusted_reads import raw_find, as_float
+from app.utils.responses import ORJSONResponse
 
 router = APIRouter(
     prefix="/financial-reports",
@@ -57,7 +59,10 @@ async def get_monthly_subscription_report(
             raise HTTPException(status_code=400, detail="Invalid month format. Use YYYY-MM (e.g., 2025-07)")
         
         # Get all subscription students (active only)
-        all_students = await student_collection.find({"is_subscription": True}).to_list(length=None)
+        all_students = await student_collection.find(
+            {"is_subscription": True},
+            {"student_id": 1, "first_name": 1, "last_name": 1}
+        ).to_list(length=None)
         
         if not all_students:
             return {
@@ -81,16 +86,26 @@ async def get_monthly_subscription_report(
             }
         
         # Get all monthly sales for the specified month
-        monthly_sales = await MonthlySale.find(MonthlySale.month == target_date).to_list()
+        monthly_sales = await raw_find(MonthlySale, {"month": target_date}, {"student_id": 1, "price": 1})
         
         # Create a dictionary of payments by student_id
         payments_by_student = {}
         for sale in monthly_sales:
-            student_id = sale.student_id
+            student_id = sale["student_id"]
             if student_id in payments_by_student:
-                payments_by_student[student_id] += float(sale.price)
+                payments_by_student[student_id] += as_float(sale["price"])
             else:
-                payments_by_student[student_id] = float(sale.price)
+                payments_by_student[student_id] = as_float(sale["price"])
+        
+        # Expected prices for all students in one query
+        default_prices = {
+            doc["student_id"]: as_float(doc.get("default_price", 200))
+            for doc in await raw_find(
+                StudentDefaultPrice,
+                {"student_id": {"$in": [student["student_id"] for student in all_students]}},
+                {"student_id": 1, "default_price": 1}
+            )
+        }
         
         paying_students = []
         non_paying_students = []
@@ -103,8 +118,7 @@ async def get_monthly_subscription_report(
             student_name = f"{student.get('first_name', '')} {student.get('last_name', '')}"
             
             # Get student's expected price for this month
-            default_price_doc = await StudentDefaultPrice.find_one(StudentDefaultPrice.student_id == student_id)
-            expected_price = float(default_price_doc.default_price) if default_price_doc else 200.0
+            expected_price = default_prices.get(student_id, 200.0)
             
             # Check if student paid for this month
             amount_paid = payments_by_student.get(student_object_id, 0.0)
@@ -147,7 +161,8 @@ async def get_monthly_subscription_report(
         total_paying_pages = (len(paying_students) + limit - 1) // limit if paying_students else 0
         total_non_paying_pages = (len(non_paying_students) + limit - 1) // limit if non_paying_students else 0
         
-        return {
+        # Plain data: rendered directly instead of walked by jsonable_encoder
+        return ORJSONResponse(content={
             "month": month,
             "pagination": {
                 "current_page": page,
@@ -177,7 +192,7 @@ async def get_monthly_subscription_report(
                 "total_expected": round(total_expected, 2),
                 "collection_rate": round(collection_rate, 2)
             }
-        }
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating monthly report: {str(e)}")
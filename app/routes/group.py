@@ -6,6 +6,8 @@ from app.schemas.group import AddStudentToGroup
 from app.schemas.group import GroupWithStudentsOut, StudentInGroupOut
 from app.dependencies.auth import get_current_assistant
 from app.models.group import PyObjectId
+from app.utils.group_index import group_index
+from app.database import student_collection
 from typing import List
 
 router = APIRouter(
@@ -45,6 +47,7 @@ async def update_group(group_id: str, data: GroupUpdate):
         setattr(group, key, value)
 
     await group.save()
+    group_index.put_group(group)
     return {"message": "Group updated successfully"}
 
 
@@ -56,6 +59,7 @@ async def delete_group(group_id: str):
         raise HTTPException(status_code=404, detail="Group not found")
 
     await group.delete()
+    group_index.remove_group(group)
     return {"message": "Group deleted successfully"}
 
 
@@ -91,6 +95,7 @@ async def add_student_to_group(group_id: str, payload: AddStudentToGroup):
     if student_obj_id not in group.students:
         group.students.append(student_obj_id)
         await group.save()
+        group_index.put_group(group)
         return {"message": "Student moved to new group successfully"}
     else:
         return {"message": "Student already in this group"}
@@ -106,16 +111,24 @@ async def get_group_by_id(group_id: str):
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
 
+    # All members in one projected query, kept in group order
+    members = {}
+    async for student in student_collection.find(
+        {"_id": {"$in": list(group.students)}},
+        {"first_name": 1, "last_name": 1, "level": 1, "phone_number": 1, "guardian_number": 1, "is_subscription": 1}
+    ):
+        members[student["_id"]] = student
+
     students_out = []
     for student_id in group.students:
-        student = await StudentDocument.get(student_id)
+        student = members.get(student_id)
         if student:
             students_out.append(StudentInGroupOut(
-                student_name=f"{student.first_name} {student.last_name}",
-                level=student.level,
-                phone_number=student.phone_number,
-                guardian_number=student.guardian_number,
-                is_subscription=student.is_subscription,
+                student_name=f"{student['first_name']} {student['last_name']}",
+                level=student["level"],
+                phone_number=student["phone_number"],
+                guardian_number=student["guardian_number"],
+                is_subscription=student.get("is_subscription", False),
                 group_name=group.group_name
             ))
 
@@ -8,6 +8,8 @@ from app.database import db
 from app.models.exam import ExamModel
 from app.models.student_document import StudentDocument, ExamEntry
 from app.dependencies.auth import get_current_assistant
+from app.models.exam_result import ExamResult
+from app.utils.exam_results import record_exam_result, update_exam_result
 
 router = APIRouter(prefix="/internal", tags=["Internal API"])
 
@@ -73,7 +75,10 @@ async def get_student_by_numeric_id(student_numeric_id: int):
     Used by fingerprint backend to convert numeric ID to ObjectId.
     """
     try:
-        student = await students_collection.find_one({"student_id": student_numeric_id})
+        student = await students_collection.find_one(
+            {"student_id": student_numeric_id},
+            {"student_id": 1, "first_name": 1, "last_name": 1, "email": 1, "phone_number": 1}
+        )
         
         if not student:
             raise HTTPException(status_code=404, detail="Student not found")
@@ -99,22 +104,24 @@ async def get_student_exam_submission(exam_id: str, student_id: str):
     """
     try:
         student_obj_id = ObjectId(student_id)
-        student = await students_collection.find_one({"_id": student_obj_id})
+        student = await students_collection.find_one({"_id": student_obj_id}, {"_id": 1})
         
         if not student:
             raise HTTPException(status_code=404, detail="Student not found")
         
-        # Find the exam entry
-        for entry in student.get("exams", []):
-            if str(entry.get("exam_id")) == exam_id:
-                return {
-                    "student_id": str(student["_id"]),
-                    "exam_id": entry.get("exam_id"),
-                    "degree": entry.get("degree"),
-                    "percentage": entry.get("percentage"),
-                    "delivery_time": entry.get("delivery_time"),
-                    "solution_photo": entry.get("solution_photo")
-                }
+        # Indexed lookup on (exam_id, student_id)
+        result = await ExamResult.get_motor_collection().find_one(
+            {"exam_id": exam_id, "student_id": student_obj_id}
+        )
+        if result:
+            return {
+                "student_id": str(student["_id"]),
+                "exam_id": result["exam_id"],
+                "degree": result.get("degree"),
+                "percentage": result.get("percentage"),
+                "delivery_time": result.get("delivery_time"),
+                "solution_photo": result.get("solution_photo")
+            }
         
         raise HTTPException(status_code=404, detail="Student exam submission not found")
     
@@ -133,19 +140,14 @@ async def save_exam_results(exam_id: str, result_data: ExamResultData):
         exam_obj_id = ObjectId(exam_id)
         
         # Verify student and exam exist
-        student = await students_collection.find_one({"_id": student_obj_id})
+        student = await students_collection.find_one({"_id": student_obj_id}, {"_id": 1})
         if not student:
             raise HTTPException(status_code=404, detail="Student not found")
         
-        exam = await exams_collection.find_one({"_id": exam_obj_id})
+        exam = await exams_collection.find_one({"_id": exam_obj_id}, {"_id": 1})
         if not exam:
             raise HTTPException(status_code=404, detail="Exam not found")
         
-        # Check if student already has this exam
-        for entry in student.get("exams", []):
-            if str(entry.get("exam_id")) == exam_id:
-                raise HTTPException(status_code=400, detail="Student has already submitted this exam")
-        
         # Create new exam entry
         new_entry = ExamEntry(
             exam_id=exam_id,
@@ -155,11 +157,9 @@ async def save_exam_results(exam_id: str, result_data: ExamResultData):
             solution_photo=result_data.solution_photo
         )
         
-        # Add to student's exams
-        await students_collection.update_one(
-            {"_id": student_obj_id},
-            {"$push": {"exams": new_entry.dict()}}
-        )
+        # Store the result; the unique (exam_id, student_id) index rejects resubmissions
+        if not await record_exam_result(student_obj_id, new_entry):
+            raise HTTPException(status_code=400, detail="Student has already submitted this exam")
         
         return {
             "message": "Exam results saved successfully",
@@ -182,31 +182,15 @@ async def update_exam_results(exam_id: str, student_id: str, result_data: ExamRe
     try:
         student_obj_id = ObjectId(student_id)
         
-        student = await students_collection.find_one({"_id": student_obj_id})
+        student = await students_collection.find_one({"_id": student_obj_id}, {"_id": 1})
         if not student:
             raise HTTPException(status_code=404, detail="Student not found")
         
-        # Find and update the exam entry
-        exam_entry_index = None
-        for i, entry in enumerate(student.get("exams", [])):
-            if str(entry.get("exam_id")) == exam_id:
-                exam_entry_index = i
-                break
-        
-        if exam_entry_index is None:
+        # Update the stored result
+        updated = await update_exam_result(exam_id, student_obj_id, result_data.degree, result_data.percentage)
+        if not updated:
             raise HTTPException(status_code=404, detail="Student exam submission not found")
         
-        # Update the exam entry
-        await students_collection.update_one(
-            {"_id": student_obj_id},
-            {
-                "$set": {
-                    f"exams.{exam_entry_index}.degree": result_data.degree,
-                    f"exams.{exam_entry_index}.percentage": result_data.percentage
-                }
-            }
-        )
-        
         return {
             "message": "Exam results updated successfully",
             "student_id": student_id,
@@ -0,0 +1,85 @@
+from fastapi import APIRouter, HTTPException, Depends
+
+from app.dependencies.auth import get_current_assistant
+from app.models.maintenance_job import MaintenanceJob
+from app.utils.scheduler import scheduler
+from app.utils.mongo_monitoring import mongo_stats
+from app.utils.device_outbox import deliver_pending, outbox_status
+
+router = APIRouter(
+    prefix="/maintenance",
+    tags=["Maintenance"],
+    dependencies=[Depends(get_current_assistant)]
+)
+
+
+@router.get("/jobs")
+async def list_maintenance_jobs():
+    """
+    Registered maintenance jobs with their interval and last recorded run
+    """
+    runs = {job.name: job for job in await MaintenanceJob.find_all().to_list()}
+
+    jobs = []
+    for name, job in scheduler.jobs.items():
+        run = runs.get(name)
+        jobs.append({
+            "name": name,
+            "interval_seconds": int(job.interval.total_seconds()),
+            "locked_until": run.locked_until if run else None,
+            "locked_by": run.locked_by if run else None,
+            "last_started_at": run.last_started_at if run else None,
+            "last_finished_at": run.last_finished_at if run else None,
+            "last_status": run.last_status if run else None,
+            "last_error": run.last_error if run else None,
+            "last_duration_ms": run.last_duration_ms if run else None,
+            "last_result": run.last_result if run else None,
+            "runs": run.runs if run else 0,
+        })
+    return jobs
+
+
+@router.post("/jobs/{name}/run")
+async def run_maintenance_job(name: str):
+    """
+    Run a maintenance job now, regardless of its interval (still skipped while another worker holds the lock)
+    """
+    if name not in scheduler.jobs:
+        raise HTTPException(status_code=404, detail="Maintenance job not found")
+
+    ran = await scheduler.run_job(name, force=True)
+    if not ran:
+        raise HTTPException(status_code=409, detail="Maintenance job is already running")
+
+    job = await MaintenanceJob.find_one(MaintenanceJob.name == name)
+    return {
+        "name": name,
+        "last_status": job.last_status,
+        "last_error": job.last_error,
+        "last_duration_ms": job.last_duration_ms,
+        "last_result": job.last_result,
+    }
+
+
+@router.get("/mongo-stats")
+async def get_mongo_stats():
+    """
+    Connection pool counters and per-command latency of this worker's MongoDB client
+    """
+    return mongo_stats.snapshot()
+
+
+@router.get("/device-outbox")
+async def get_device_outbox():
+    """
+    Queued fingerprint host operations per status, with the latest failures
+    """
+    return await outbox_status()
+
+
+@router.post("/device-outbox/deliver")
+async def deliver_device_outbox():
+    """
+    Send due fingerprint host operations now instead of waiting for the next run
+    """
+    return await deliver_pending()
@@ -1,15 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import JSONResponse
-from typing import List
+from app.utils.responses import ORJSONResponse
+from typing import List, Optional
 from datetime import datetime
 from bson import ObjectId
-from beanie.operators import In
 
 from app.models.monthsale import MonthlySale
-from app.models.counter import get_next_id
+from app.utils.id_generator import id_allocator
 from app.schemas.monthsale import MonthlySaleCreate, MonthlySaleResponse, MonthQuery, MonthSaleDetailResponse, PaginatedMonthSalesResponse
 from app.dependencies.auth import get_current_assistant
 from app.models.student import StudentModel
+from app.utils.projection import student_name_map
+from app.utils.pagination import paginate
+from app.utils.trusted_reads import raw_find, as_date, as_float
 
 router = APIRouter(prefix="/finance/monthsales", tags=["Finance"])
 
@@ -17,7 +19,7 @@ router = APIRouter(prefix="/finance/monthsales", tags=["Finance"])
 @router.post("/", response_model=MonthlySaleResponse)
 async def create_month_sale(data: MonthlySaleCreate, assistant=Depends(get_current_assistant)):
     sale = MonthlySale(
-        id=await get_next_id("monthsales"),
+        id=await id_allocator.next_id("monthsales"),
         student_id=ObjectId(data.student_id),
         price=data.price,
         default_price=data.default_price,
@@ -83,24 +85,24 @@ async def get_month_sales_by_month(data: MonthQuery, assistant=Depends(get_curre
             else datetime(start_date.year, start_date.month + 1, 1)
         )
 
-        sales = await MonthlySale.find({
+        sales = await raw_find(MonthlySale, {
             "created_at": {
                 "$gte": start_date,
                 "$lt": end_date
             }
-        }).to_list()
+        })
 
-        return [
+        return ORJSONResponse(content=[
             {
-                "id": sale.id,
-                "student_id": str(sale.student_id),
-                "price": float(sale.price),
-                "default_price": float(sale.default_price),
-                "month": str(sale.month),
-                "created_at": sale.created_at.isoformat()
+                "id": sale["_id"],
+                "student_id": str(sale["student_id"]),
+                "price": as_float(sale["price"]),
+                "default_price": as_float(sale["default_price"]),
+                "month": str(as_date(sale["month"])),
+                "created_at": sale["created_at"].isoformat()
             }
             for sale in sales
-        ]
+        ])
 
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid month format. Use YYYY-MM")
@@ -135,22 +137,10 @@ async def get_monthsales_by_student(student_id: str, assistant=Depends(get_curre
     }
 
 @router.get("/all", response_model=PaginatedMonthSalesResponse)
-async def get_all_monthsales(page: int = 1, limit: int = 10, assistant=Depends(get_current_assistant)):
-    # Get total count
-    total = await MonthlySale.count()
-    
-    # Calculate skip from page number
-    skip = (page - 1) * limit
-    
-    # Get monthsales with pagination
-    monthsales = await MonthlySale.find_all().skip(skip).limit(limit).to_list()
+async def get_all_monthsales(page: int = 1, limit: int = 10, after: Optional[str] = None, assistant=Depends(get_current_assistant)):
+    monthsales, pagination = await paginate(MonthlySale, page, limit, after)
 
-    student_ids = list({sale.student_id for sale in monthsales})
-    students = await StudentModel.find(In(StudentModel.id, student_ids)).to_list()
-    
-    student_map = {
-        student.id: f"{student.first_name} {student.last_name}" for student in students
-    }
+    student_map = await student_name_map({sale.student_id for sale in monthsales})
 
     response = []
     for sale in monthsales:
@@ -163,18 +153,8 @@ async def get_all_monthsales(page: int = 1, limit: int = 10, assistant=Depends(g
             created_at=sale.created_at,
             month=sale_month
         ))
-    
-    # Calculate pagination metadata
-    total_pages = (total + limit - 1) // limit  # Ceiling division
-    has_next = page < total_pages
-    has_prev = page > 1
 
     return PaginatedMonthSalesResponse(
         month_sales=response,
-        total=total,
-        page=page,
-        limit=limit,
-        total_pages=total_pages,
-        has_next=has_next,
-        has_prev=has_prev
+        **pagination
     )
@@ -2,9 +2,11 @@ from fastapi import APIRouter
 from datetime import datetime
 from app.models.outgoing import Outgoing
 from app.schemas.outgoing import OutgoingCreate, OutgoingResponse, PaginatedOutgoingsResponse
-from app.models.counter import get_next_id
+from app.utils.id_generator import id_allocator
 from fastapi import HTTPException, Depends
 from app.dependencies.auth import get_current_assistant
+from app.utils.pagination import paginate
+from typing import Optional
 
 
 router = APIRouter(prefix="/finance/outgoings", tags=["Outgoings"])
@@ -12,7 +14,7 @@ router = APIRouter(prefix="/finance/outgoings", tags=["Outgoings"])
 @router.post("/", response_model=OutgoingResponse)
 async def create_outgoing(data: OutgoingCreate, assistant=Depends(get_current_assistant)):
     outgoing = Outgoing(
-        id=await get_next_id("outgoings"),
+        id=await id_allocator.next_id("outgoings"),
         product_name=data.product_name,
         price=data.price,
         created_at=datetime.utcnow()
@@ -21,15 +23,8 @@ async def create_outgoing(data: OutgoingCreate, assistant=Depends(get_current_as
     return outgoing
 
 @router.get("/", response_model=PaginatedOutgoingsResponse)
-async def get_all_outgoings(page: int = 1, limit: int = 30, assistant=Depends(get_current_assistant)):
-    # Get total count
-    total = await Outgoing.count()
-    
-    # Calculate skip from page number
-    skip = (page - 1) * limit
-    
-    # Get outgoings with pagination
-    outgoings_data = await Outgoing.find_all().skip(skip).limit(limit).to_list()
+async def get_all_outgoings(page: int = 1, limit: int = 30, after: Optional[str] = None, assistant=Depends(get_current_assistant)):
+    outgoings_data, pagination = await paginate(Outgoing, page, limit, after)
     
     # Convert model objects to OutgoingResponse objects
     outgoings = [
@@ -41,20 +36,10 @@ async def get_all_outgoings(page: int = 1, limit: int = 30, assistant=Depends(ge
         )
         for outgoing in outgoings_data
     ]
-    
-    # Calculate pagination metadata
-    total_pages = (total + limit - 1) // limit  # Ceiling division
-    has_next = page < total_pages
-    has_prev = page > 1
-    
+
     return PaginatedOutgoingsResponse(
         outgoings=outgoings,
-        total=total,
-        page=page,
-        limit=limit,
-        total_pages=total_pages,
-        has_next=has_next,
-        has_prev=has_prev
+        **pagination
     )
 
 
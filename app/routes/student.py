@@ -1,31 +1,35 @@
 from fastapi import APIRouter, HTTPException, status, Depends, Query
 from app.database import db
-from app.schemas.student import StudentCreate, StudentOut, StudentUpdate, StudentBase, PaginatedStudentsResponse
-from app.models.student import StudentModel
-from app.models.blacklist import BlacklistStudent
-from app.routes.archive import archive_unpaid_students, move_student_to_archive
+from app.schemas.student import StudentCreate, StudentOut, StudentUpdate, StudentBase, PaginatedStudentsResponse, StudentSearchResponse
+from app.routes.archive import move_student_to_archive
 from app.schemas.archived_student import ArchiveRequest
 from app.dependencies.auth import get_current_assistant
-from bson import ObjectId
 from datetime import datetime, date
 from typing import List, Optional
 from app.utils.fingerprint import enroll_fingerprint
 import subprocess
-from app.utils.id_generator import get_next_sequence
-from app.models.counter import Counter
-from app.models.group import Group
-import httpx
-import os
-from dotenv import load_dotenv
-# For Excel processing
-import pandas as pd
+from app.utils.id_generator import id_allocator
+from app.utils.group_index import group_index
+from app.utils.roster_index import roster_index
+from app.utils.attendance_cache import attendance_cache
+from app.utils.blacklist_index import blacklist_index
+from app.utils.exam_results import remove_student_results
+from app.utils.pagination import paginate
+from app.utils.projection import parse_fields, student_projection, sparse_student
+from app.utils.student_search import SEARCH_SOURCE_FIELDS, search_students, search_terms
+from app.utils.responses import ORJSONResponse
+from app.utils.trusted_reads import as_date, trusted_dict
+from app.utils.device_outbox import enqueue as enqueue_device_operation
+from fastapi.concurrency import run_in_threadpool
+from pymongo.errors import BulkWriteError
 from fastapi import UploadFile, File
 from app.schemas.excel_upload import ExcelUploadResponse, StudentCreationResult
-from typing import Any, Dict
+from typing import TYPE_CHECKING
 
+if TYPE_CHECKING:
+    # Annotations only; pandas is imported in parse_students_excel to keep it out of startup
+    import pandas as pd
 
-load_dotenv()
-HOST_REMOTE_URL = os.getenv("HOST_REMOTE_URL")
 
 # ✅ Apply authentication to all routes in this router
 router = APIRouter(
@@ -35,71 +39,15 @@ router = APIRouter(
 )
 
 students_collection = db["students"]
-counters_collection = db["counters"]
-
-# Utility to update students subscription status based on current month
-async def update_students_subscription_status():
-    # Get the current month in YYYY-MM format
-    current_month = datetime.utcnow().strftime("%Y-%m")
-
-    # Get all students
-    students = await StudentModel.find_all().to_list()
-    for student in students:
-        # Check if the student has a monthsale in the current month
-        current_month_sales = student.subscription.get("monthsales", {}).get(current_month, None)
-        if current_month_sales is not None:
-            student.is_subscription = True
-        else:
-            student.is_subscription = False
-
-        # Update student if subscription status changed
-        await student.save()
-
-# Utility to generate the next student_id
-async def get_next_student_id():
-    counter = await Counter.find_one(Counter.name == "student_id")
-    if not counter:
-        counter = Counter(name="student_id", sequence_value=9999)  # So first will be 10000
-        await counter.insert()
-    counter.sequence_value += 1
-    await counter.save()
-    return counter.sequence_value
 
 @router.get("/next-ids")
 async def get_next_ids():
-    counter = await Counter.find_one(Counter.name == "student_id")
-    next_id = counter.sequence_value + 1 if counter else 10000
+    next_id = await id_allocator.peek("student_id")
     return {"student_id": next_id, "uid": next_id}
 
 
-@router.post("/", response_model=StudentOut)
-async def create_student(student: StudentCreate):
-    student_data = student.dict()
-
-    # Check if student exists in blacklist with same phone number
-    blacklisted_by_phone = await BlacklistStudent.find_one(
-        BlacklistStudent.phone_number == student_data["phone_number"]
-    )
-    
-    # Check if student exists in blacklist with same first_name and last_name
-    blacklisted_by_name = await BlacklistStudent.find_one(
-        BlacklistStudent.first_name == student_data["first_name"],
-        BlacklistStudent.last_name == student_data["last_name"]
-    )
-    
-    if blacklisted_by_phone:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Cannot create student. A student with the same phone number ({student_data['phone_number']}) exists in the blacklist."
-        )
-    
-    if blacklisted_by_name:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Cannot create student. A student with the same name ({student_data['first_name']} {student_data['last_name']}) exists in the blacklist."
-        )
-
-    next_id = await get_next_student_id()
+def student_document(student_data: dict, next_id: int) -> dict:
+    """Stored form of a validated StudentCreate dict."""
     student_data["student_id"] = next_id
     student_data["uid"] = next_id
 
@@ -115,6 +63,22 @@ async def create_student(student: StudentCreate):
     student_data["created_at"] = datetime.utcnow()
     student_data["updated_at"] = None
     student_data["exams"] = []
+    student_data["search_terms"] = search_terms(student_data)
+    return student_data
+
+
+@router.post("/", response_model=StudentOut)
+async def create_student(student: StudentCreate):
+    student_data = student.dict()
+
+    # Blacklisted phone / name check against the in-memory index
+    await blacklist_index.ensure_loaded()
+    violation = blacklist_index.violation(student_data)
+    if violation:
+        raise HTTPException(status_code=400, detail=violation)
+
+    next_id = await id_allocator.next_id("student_id")
+    student_data = student_document(student_data, next_id)
 
     # Insert into DB
     result = await students_collection.insert_one(student_data)
@@ -125,51 +89,60 @@ async def create_student(student: StudentCreate):
 
 
 @router.get("/", response_model=PaginatedStudentsResponse)
-async def get_all_students(page: int = 1, limit: int = 25):
-    await update_students_subscription_status()
-    await archive_unpaid_students()
-    # Get total count
-    total = await students_collection.count_documents({})
-    
-    # Calculate skip from page number
-    skip = (page - 1) * limit
-    
-    # Get students with pagination
-    students = await students_collection.find().skip(skip).limit(limit).to_list(length=None)
+async def get_all_students(page: int = 1, limit: int = 25, after: Optional[str] = None, fields: Optional[str] = None):
+    # Subscription refresh and auto-archiving run as scheduled maintenance jobs (app/utils/maintenance.py)
+    # Only read what the response needs (fields=a,b,c narrows it further)
+    sparse = parse_fields(fields)
+    projection = student_projection(sparse)
+
+    students, pagination = await paginate(students_collection, page, limit, after, projection)
+
+    # Resolve the group of every student on the page at once
+    if sparse is None or "group" in sparse:
+        groups = await group_index.lookup(student["_id"] for student in students)
+    else:
+        groups = {}
+
     result = []
     for student in students:
+        group = groups.get(student["_id"])
         student["id"] = str(student["_id"])
         del student["_id"]
         student.setdefault("is_subscription", False)
         student.setdefault("uid", 0)
 
         # Attach group name
-        group = await Group.find(Group.students == ObjectId(student["id"])).first_or_none()
-        student["group"] = group.group_name if group else None
-
-        result.append(StudentOut(**student))
-
-    # Calculate pagination metadata
-    total_pages = (total + limit - 1) // limit  # Ceiling division
-    has_next = page < total_pages
-    has_prev = page > 1
-
-    return PaginatedStudentsResponse(
-        students=result,
-        total=total,
-        page=page,
-        limit=limit,
-        total_pages=total_pages,
-        has_next=has_next,
-        has_prev=has_prev
-    )
+        student["group"] = group["group_name"] if group else None
+        # Stored as a midnight datetime, returned as a date
+        if "birth_date" in student:
+            student["birth_date"] = as_date(student["birth_date"])
+
+        # Trusted read: documents were validated by StudentCreate on the way in
+        result.append(trusted_dict(StudentOut, student) if sparse is None else sparse_student(student, sparse))
 
+    # Rendered directly, without a second validation pass through PaginatedStudentsResponse
+    return ORJSONResponse(content={
+        "students": result,
+        **pagination,
+    })
 
 
 
+
+# Declared before /{student_id} so "search" is not parsed as a student id
+@router.get("/search", response_model=StudentSearchResponse)
+async def search_all_students(q: str = Query(..., min_length=1, max_length=100),
+                              limit: int = Query(20, ge=1, le=100),
+                              include_archived: bool = True):
+    """Type-ahead search by name words, student_id, phone or guardian number prefixes."""
+    results = await search_students(q, limit, include_archived)
+    return StudentSearchResponse(query=q, results=results)
+
+
 @router.get("/{student_id}", response_model=StudentOut)
-async def get_student_by_id(student_id: int):
-    student = await students_collection.find_one({"student_id": student_id})
+async def get_student_by_id(student_id: int, fields: Optional[str] = None):
+    sparse = parse_fields(fields)
+    student = await students_collection.find_one({"student_id": student_id}, student_projection(sparse))
     if student is None:
         raise HTTPException(status_code=404, detail="Student not found")
 
@@ -178,10 +151,12 @@ async def get_student_by_id(student_id: int):
     student.setdefault("is_subscription", False)
     student.setdefault("uid", 0)
 
-    # Find group(s) for this student
-    group = await Group.find(Group.students == ObjectId(student["id"])).first_or_none()
-    student["group"] = group.group_name if group else None
+    # Find group for this student
+    if sparse is None or "group" in sparse:
+        student["group"] = await group_index.group_name(student["id"])
 
+    if sparse is not None:
+        return ORJSONResponse(content=sparse_student(student, sparse))
     return StudentOut(**student)
 
 
@@ -191,9 +166,18 @@ async def update_student(student_id: int, student_update: StudentUpdate):
     if not update_data:
         raise HTTPException(status_code=400, detail="No data provided for update")
 
+    # Keep the search prefixes in step with the searchable fields
+    if any(field in update_data for field in SEARCH_SOURCE_FIELDS):
+        current = await students_collection.find_one({"student_id": student_id}, {field: 1 for field in SEARCH_SOURCE_FIELDS})
+        if current is None:
+            raise HTTPException(status_code=404, detail="Student not found or nothing changed")
+        update_data["search_terms"] = search_terms({**current, **update_data})
+
     result = await students_collection.update_one({"student_id": student_id}, {"$set": update_data})
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Student not found or nothing changed")
+    roster_index.forget(student_id)
+    attendance_cache.forget(student_id)
 
     return {"message": "Student updated successfully"}
 
@@ -201,19 +185,22 @@ async def update_student(student_id: int, student_update: StudentUpdate):
 @router.delete("/{student_id}")
 async def delete_student(student_id: int):
     # Delete from MongoDB
-    result = await students_collection.delete_one({"student_id": student_id})
-    if result.deleted_count == 0:
+    deleted = await students_collection.find_one_and_delete({"student_id": student_id}, projection={"_id": 1})
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Student not found")
+    await remove_student_results([deleted["_id"]])
+    roster_index.forget(student_id)
+    attendance_cache.forget(student_id)
 
-    # Notify fingerprint backend
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.delete(f"{HOST_REMOTE_URL}/students/delete_fingerprint/{student_id}")
-            response.raise_for_status()
-    except httpx.HTTPError as e:
-        raise HTTPException(status_code=500, detail=f"Student deleted from DB, but failed to remove from fingerprint device: {str(e)}")
+    # Fingerprint removal goes through the outbox: sent in the background, retried until the host accepts it
+    operation = await enqueue_device_operation(
+        "delete_fingerprint", "DELETE", f"/students/delete_fingerprint/{student_id}"
+    )
 
-    return {"message": "Student deleted from DB and fingerprint device"}
+    return {
+        "message": "Student deleted from DB; fingerprint removal queued for the device",
+        "device_operation_id": str(operation.id),
+    }
 
 @router.post("/{student_id}/archive")
 async def archive_student_endpoint(student_id: int, request: ArchiveRequest = ArchiveRequest()):
@@ -227,7 +214,75 @@ async def archive_student_endpoint(student_id: int, request: ArchiveRequest = Ar
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
     
-# New Excel upload endpoint for bulk adding students
+EXCEL_REQUIRED_COLUMNS = ['first_name', 'last_name', 'phone_number', 'guardian_number', 'gender', 'level', 'is_subscription']
+# Headerless sheets: first_name, middle_name, last_name, email, phone, guardian, gender, level, school, subscription
+EXCEL_POSITIONAL_COLUMNS = ['first_name', 'middle_name', 'last_name', 'email', 'phone_number', 'guardian_number', 'gender', 'level', 'school_name', 'is_subscription']
+
+
+def parse_students_excel(contents: bytes) -> "pd.DataFrame":
+    """
+    Read an uploaded student sheet once and clean its columns (CPU bound, call from a thread).
+    Adds `_level_invalid` for rows whose level is not a number.
+    """
+    import pandas as pd
+
+    raw = pd.read_excel(contents, header=None)
+
+    header = [str(value).strip() for value in raw.iloc[0]] if len(raw) else []
+    if any(col in header for col in EXCEL_REQUIRED_COLUMNS):
+        # Proper English headers on the first row
+        df = raw.iloc[1:].reset_index(drop=True)
+        df.columns = header
+    elif len(raw.columns) >= 10:
+        # No proper headers: data starts from the first row, columns by position
+        df = raw.iloc[:, :10].copy()
+        df.columns = EXCEL_POSITIONAL_COLUMNS
+        # Combine middle_name + last_name into last_name
+        df['last_name'] = df['middle_name'].astype(str) + ' ' + df['last_name'].astype(str)
+        df = df.drop('middle_name', axis=1)
+    else:
+        raise HTTPException(status_code=400, detail=f"Expected at least 10 columns, got {len(raw.columns)}")
+
+    missing_cols = [col for col in EXCEL_REQUIRED_COLUMNS if col not in df.columns]
+    if missing_cols:
+        raise HTTPException(status_code=400, detail=f"Missing required columns in Excel: {missing_cols}")
+
+    # Header rows repeated inside the data (Arabic or English headers)
+    df['_header_row'] = (
+        df['first_name'].astype(str).str.strip().isin(['الاسم الاول', 'first_name'])
+        | df['gender'].astype(str).str.strip().isin(['الجنس', 'gender'])
+    )
+
+    if 'birth_date' in df.columns:
+        df['birth_date'] = df['birth_date'].map(
+            lambda v: v.date() if isinstance(v, (pd.Timestamp, datetime)) and pd.notnull(v) else v
+        )
+
+    # Gender conversion - Handle Arabic gender values
+    gender = df['gender'].astype(str).str.strip()
+    has_gender = df['gender'].notna() & (df['gender'].astype(str) != '')
+    gender = gender.replace({'ذكر': 'male', 'انثي': 'female'})
+    gender = gender.where(gender.isin(['male', 'female']), gender.str.lower())
+    df['gender'] = df['gender'].where(~has_gender, gender)
+
+    # Level conversion
+    level = pd.to_numeric(df['level'], errors='coerce')
+    df['_level_invalid'] = level.isna()
+    df['level'] = [value if invalid else int(number)
+                   for value, number, invalid in zip(df['level'], level, df['_level_invalid'])]
+
+    # Bool conversion for subscription
+    subscription = df['is_subscription']
+    is_text = subscription.map(lambda v: isinstance(v, str))
+    df['is_subscription'] = subscription.astype(bool).where(
+        ~is_text, subscription.astype(str).str.strip().str.lower().isin(['true', '1', 'yes'])
+    )
+
+    return df
+
+
+# Bulk Excel import: one parse in a worker thread, blacklist checked in memory,
+# one reservation for all student_ids and one insert_many
 @router.post("/excel-upload", response_model=ExcelUploadResponse)
 async def upload_students_excel(file: UploadFile = File(...)):
     if not file.filename.endswith(('.xlsx', '.xls')):
@@ -236,101 +291,71 @@ async def upload_students_excel(file: UploadFile = File(...)):
     try:
         # Read the file content into memory
         contents = await file.read()
-        
-        # Try to read with headers first
-        df = pd.read_excel(contents)
-        
-        # Check if we have proper English headers
-        english_required = ['first_name', 'last_name', 'phone_number', 'guardian_number', 'gender', 'level', 'is_subscription']
-        
-        # If no proper headers found, assume data starts from first row without headers
-        if not any(col in df.columns for col in english_required):
-            # Read again without headers and assign column names based on position
-            df = pd.read_excel(contents, header=None)
-            # Your data structure: first_name, middle_name, last_name, email, phone, guardian, gender, level, school, subscription
-            if len(df.columns) >= 10:
-                df.columns = ['first_name', 'middle_name', 'last_name', 'email', 'phone_number', 'guardian_number', 'gender', 'level', 'school_name', 'is_subscription']
-                # Combine middle_name + last_name into last_name
-                df['last_name'] = df['middle_name'].astype(str) + ' ' + df['last_name'].astype(str)
-                # Drop the middle_name column as we don't need it anymore
-                df = df.drop('middle_name', axis=1)
-            else:
-                raise HTTPException(status_code=400, detail=f"Expected at least 10 columns, got {len(df.columns)}")
-                
+        df = await run_in_threadpool(parse_students_excel, contents)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Could not read Excel file: {e}")
 
-    # Now check for required columns after processing
-    required_columns = ['first_name', 'last_name', 'phone_number', 'guardian_number', 'gender', 'level', 'is_subscription']
-    missing_cols = [col for col in required_columns if col not in df.columns]
-    if missing_cols:
-        raise HTTPException(status_code=400, detail=f"Missing required columns in Excel: {missing_cols}")
+    await blacklist_index.ensure_loaded()
 
     results = []
     successful_creations = 0
     failed_creations = 0
+    pending = []  # (row_result, validated student dict)
+
+    flags = df[['_header_row', '_level_invalid']].to_dict('records')
+    rows = df.drop(columns=['_header_row', '_level_invalid']).to_dict('records')
+    for i, (student_dict, flag) in enumerate(zip(rows, flags)):
+        # Skip if this looks like a header row (contains Arabic headers)
+        if flag['_header_row']:
+            continue
 
-    # Iterate rows
-    for i, row in df.iterrows():
-        student_dict: Dict[str, Any] = row.to_dict()
         row_result = StudentCreationResult(row_number=i+1,  # Since we removed headers, start from 1
                                            success=False,
                                            student_data=student_dict)
-        
-        # Skip if this looks like a header row (contains Arabic headers)
-        if (str(student_dict.get('first_name', '')).strip() in ['الاسم الاول', 'first_name'] or
-            str(student_dict.get('gender', '')).strip() in ['الجنس', 'gender']):
+        if flag['_level_invalid']:
+            row_result.error = 'Invalid value for level'
+            failed_creations += 1
+            results.append(row_result)
             continue
-            
-        # Format corrections
+
         try:
-            # Type fixes
-            if 'birth_date' in student_dict and pd.notnull(student_dict['birth_date']):
-                if isinstance(student_dict['birth_date'], pd.Timestamp):
-                    student_dict['birth_date'] = student_dict['birth_date'].date()
-            
-            # Gender conversion - Handle Arabic gender values
-            if 'gender' in student_dict and student_dict['gender']:
-                gender_val = str(student_dict['gender']).strip()
-                if gender_val == 'ذكر':
-                    student_dict['gender'] = 'male'
-                elif gender_val == 'انثي':
-                    student_dict['gender'] = 'female'
-                else:
-                    student_dict['gender'] = gender_val.lower()
-            
-            # Level conversion
-            if 'level' in student_dict:
-                try:
-                    student_dict['level'] = int(row['level'])
-                except Exception:
-                    row_result.error = 'Invalid value for level'
-                    failed_creations += 1
-                    results.append(row_result)
-                    continue
-            
-            # Bool conversion for subscription
-            if 'is_subscription' in student_dict:
-                v = student_dict['is_subscription']
-                if isinstance(v, str):
-                    student_dict['is_subscription'] = v.strip().lower() in ['true', '1', 'yes']
-                else:
-                    student_dict['is_subscription'] = bool(v)
-
-            # Create student logic (reuse endpoint logic)
-            student_create_schema = StudentCreate(**student_dict)
-            # Use internal create_student flow (reuse most checks, use helper to mimic request)
-            created = await create_student(student_create_schema)
-            row_result.success = True
-            row_result.student_id = created.student_id
-            successful_creations += 1
-        except HTTPException as httpe:
-            row_result.error = str(httpe.detail)
-            failed_creations += 1
+            student_data = StudentCreate(**student_dict).dict()
         except Exception as ex:
             row_result.error = str(ex)
             failed_creations += 1
+            results.append(row_result)
+            continue
+
+        row_result.error = blacklist_index.violation(student_data)
+        if row_result.error:
+            failed_creations += 1
+            results.append(row_result)
+            continue
+
         results.append(row_result)
+        pending.append((row_result, student_data))
+
+    if pending:
+        # One contiguous block of student_ids for the whole sheet
+        student_ids = await id_allocator.reserve("student_id", len(pending))
+        documents = [student_document(student_data, next_id) for (_, student_data), next_id in zip(pending, student_ids)]
+
+        failed_rows = {}
+        try:
+            await students_collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            failed_rows = {error["index"]: error.get("errmsg", "Insert failed") for error in e.details.get("writeErrors", [])}
+
+        for index, ((row_result, _), document) in enumerate(zip(pending, documents)):
+            if index in failed_rows:
+                row_result.error = failed_rows[index]
+                failed_creations += 1
+            else:
+                row_result.success = True
+                row_result.student_id = document["student_id"]
+                successful_creations += 1
 
     summary = f"{successful_creations} students created, {failed_creations} failed"
     return ExcelUploadResponse(
@@ -28,3 +28,4 @@ class PaginatedBlacklistStudentsResponse(BaseModel):
     total_pages: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None  # Only set in cursor mode (?after=...)
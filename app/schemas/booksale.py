@@ -39,3 +39,4 @@ class PaginatedBookSalesResponse(BaseModel):
     total_pages: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None  # Only set in cursor mode (?after=...)
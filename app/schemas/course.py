@@ -16,6 +16,7 @@ class CourseCreate(BaseModel):
 class CourseOut(CourseCreate):
     id: str
     photo_path: str
+    thumbnail_path: str | None = None
 
 class CourseUpdate(BaseModel):
     course_name: str | None = None
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field
 from enum import IntEnum
 from datetime import date
-from typing import List
+from typing import List, Optional
 
 class LevelChoices(IntEnum):
     level1 = 1
@@ -39,3 +39,4 @@ class PaginatedExamsResponse(BaseModel):
     total_pages: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None  # Only set in cursor mode (?after=...)
@@ -33,3 +33,4 @@ class PaginatedMonthSalesResponse(BaseModel):
     total_pages: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None  # Only set in cursor mode (?after=...)
@@ -55,6 +55,22 @@ class StudentOut(StudentBase):
     group: Optional[str] = None
 
 
+class StudentSearchResult(BaseModel):
+    id: str
+    student_id: int
+    first_name: str
+    last_name: str
+    phone_number: Optional[str] = None
+    guardian_number: Optional[str] = None
+    level: Optional[int] = None
+    archived: bool = False
+
+
+class StudentSearchResponse(BaseModel):
+    query: str
+    results: List[StudentSearchResult]
+
+
 class ExamEntryCreate(BaseModel):
     student_degree: int
     degree_percentage: float
@@ -69,4 +85,5 @@ class PaginatedStudentsResponse(BaseModel):
     total_pages: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None  # Only set in cursor mode (?after=...)
 
@@ -0,0 +1,279 @@
+import asyncio
+import os
+import socket
+import threading
+from typing import List, Optional, Tuple
+
+from bson import json_util
+from fastapi.concurrency import run_in_threadpool
+from pymongo import InsertOne
+from pymongo.errors import BulkWriteError
+
+from app.config import settings
+from app.utils.attendance_events import collection
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, so only this process's own log is ever replayed
+    fcntl = None
+
+LOCK_NAME = ".lock"
+RECOVERY_LOCK_NAME = ".recovery.lock"
+
+
+async def insert_events(documents: List[dict]):
+    """Unordered bulk insert; events that already exist (same deterministic _id) are skipped."""
+    if not documents:
+        return
+    try:
+        await collection().bulk_write([InsertOne(document) for document in documents], ordered=False)
+    except BulkWriteError as e:
+        if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+            raise
+
+
+def _remove_missing_ok(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _try_lock(path: str, blocking: bool = False):
+    """Open `path` and take an exclusive flock on it. Returns the open file, or None if another process holds it."""
+    handle = open(path, "a")
+    if fcntl is None:
+        return handle
+    try:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        handle.close()
+        return None
+    return handle
+
+
+class AttendanceWriteBuffer:
+    """
+    Optional write-behind buffer for attendance punches (ATTENDANCE_WRITE_BEHIND).
+
+    A punch is acknowledged once its event is appended and fsynced to the
+    current segment of a local write-ahead log. Buffered events are flushed to
+    Mongo with one bulk_write every ATTENDANCE_FLUSH_INTERVAL_MS, or as soon as
+    ATTENDANCE_FLUSH_MAX_RECORDS are waiting. Segments are deleted only after
+    their events are stored; segments left behind by a crash are replayed on
+    startup. Events carry deterministic _ids, so replaying is idempotent.
+
+    Every process logs into its own namespace (worker-<host>-<pid>) and holds
+    a flock on it while running. On startup a worker replays its own namespace
+    and any namespace whose lock is free (its process is gone), never the log
+    of a live worker.
+    """
+
+    def __init__(self, directory: str, flush_interval_ms: int, max_records: int):
+        self.directory = directory
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_records = max_records
+        self._file = None
+        self._segment: Optional[str] = None
+        self._sequence = 0
+        self._pending: List[dict] = []  # appended since the last rotation
+        self._unflushed: List[dict] = []  # taken from closed segments, not yet stored
+        self._closed_segments: List[str] = []
+        self._namespace: Optional[str] = None
+        self._namespace_lock = None
+        self._orphans: List[Tuple[str, object]] = []  # recovered namespaces, locked until their segments are gone
+        self._file_lock = threading.Lock()
+        self._flush_lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._task is not None
+
+    @staticmethod
+    def _segment_files(directory: str) -> List[str]:
+        try:
+            names = os.listdir(directory)
+        except FileNotFoundError:
+            return []
+        return sorted(name for name in names if name.startswith("segment-") and name.endswith(".log"))
+
+    def _open_segment(self):
+        self._sequence += 1
+        self._segment = os.path.join(self._namespace, f"segment-{self._sequence:012d}.log")
+        self._file = open(self._segment, "ab")
+
+    def _append_sync(self, document: dict, line: bytes):
+        with self._file_lock:
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending.append(document)
+
+    def _take_sync(self) -> Tuple[List[dict], Optional[str]]:
+        """Swap out the pending events and rotate to a new segment."""
+        with self._file_lock:
+            if not self._pending:
+                return [], None
+            documents, self._pending = self._pending, []
+            self._file.close()
+            closed = self._segment
+            self._open_segment()
+            return documents, closed
+
+    def _read_segments_sync(self, directory: str, documents: List[dict], paths: List[str]):
+        for name in self._segment_files(directory):
+            path = os.path.join(directory, name)
+            if directory == self._namespace:
+                self._sequence = max(self._sequence, int(name[len("segment-"):-len(".log")]))
+            try:
+                with open(path, "rb") as f:
+                    lines = f.readlines()
+            except FileNotFoundError:
+                continue
+            paths.append(path)
+            for line in lines:
+                try:
+                    documents.append(json_util.loads(line))
+                except ValueError:
+                    continue  # Torn final line from a crash mid-append; it was never acknowledged
+
+    def _claim_namespace_sync(self):
+        self._namespace = os.path.join(self.directory, f"worker-{socket.gethostname()}-{os.getpid()}")
+        os.makedirs(self._namespace, exist_ok=True)
+        self._namespace_lock = _try_lock(os.path.join(self._namespace, LOCK_NAME))
+        if self._namespace_lock is None:
+            raise RuntimeError(f"Attendance log {self._namespace} is locked by another process")
+
+    def _recover_sync(self) -> Tuple[List[dict], List[str]]:
+        """Read this process's leftover segments and those of dead workers (under the recovery lock)."""
+        documents, paths = [], []
+        self._read_segments_sync(self._namespace, documents, paths)
+        if fcntl is None:
+            return documents, paths
+
+        recovery_lock = _try_lock(os.path.join(self.directory, RECOVERY_LOCK_NAME), blocking=True)
+        try:
+            # Segments written before logs were split per process
+            self._read_segments_sync(self.directory, documents, paths)
+            for name in sorted(os.listdir(self.directory)):
+                directory = os.path.join(self.directory, name)
+                if not name.startswith("worker-") or directory == self._namespace or not os.path.isdir(directory):
+                    continue
+                try:
+                    lock = _try_lock(os.path.join(directory, LOCK_NAME))
+                except FileNotFoundError:
+                    continue  # Removed by its owner on shutdown
+                if lock is None:
+                    continue  # A live worker
+                self._orphans.append((directory, lock))
+                self._read_segments_sync(directory, documents, paths)
+        finally:
+            recovery_lock.close()
+        return documents, paths
+
+    def _remove_segments_sync(self, paths: List[str]):
+        for path in paths:
+            _remove_missing_ok(path)
+        # Recovered namespaces are released once nothing of theirs is left
+        for directory, lock in self._orphans:
+            _remove_missing_ok(os.path.join(directory, LOCK_NAME))
+            lock.close()
+            try:
+                os.rmdir(directory)
+            except OSError:
+                pass
+        self._orphans = []
+
+    async def append(self, document: dict):
+        """Durably log one event; returns once it is on disk."""
+        line = (json_util.dumps(document) + "\n").encode()
+        await run_in_threadpool(self._append_sync, document, line)
+        if len(self._pending) >= self.max_records:
+            self._wake.set()
+
+    async def flush(self) -> int:
+        """Store everything logged so far. Returns the number of events written."""
+        async with self._flush_lock:
+            documents, segment = await run_in_threadpool(self._take_sync)
+            if segment:
+                self._closed_segments.append(segment)
+            self._unflushed.extend(documents)
+            if not self._unflushed:
+                return 0
+
+            try:
+                for start in range(0, len(self._unflushed), self.max_records):
+                    await insert_events(self._unflushed[start:start + self.max_records])
+            except Exception as e:
+                # Keep the segments; the next flush (or the next startup) retries
+                print(f"⚠️ Attendance buffer flush failed, {len(self._unflushed)} events kept: {e}")
+                return 0
+
+            # Stored: forget the events before touching the files, so a failed removal cannot replay them again
+            written = len(self._unflushed)
+            paths, self._closed_segments, self._unflushed = self._closed_segments, [], []
+            try:
+                await run_in_threadpool(self._remove_segments_sync, paths)
+            except OSError as e:
+                print(f"⚠️ Could not remove flushed attendance log segments: {e}")
+            return written
+
+    async def _loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"❌ Attendance buffer error: {e}")
+
+    async def start(self):
+        """Replay segments left by a previous run, then start accepting punches."""
+        os.makedirs(self.directory, exist_ok=True)
+        await run_in_threadpool(self._claim_namespace_sync)
+        documents, paths = await run_in_threadpool(self._recover_sync)
+        self._unflushed = documents
+        self._closed_segments = paths
+        self._open_segment()
+        if documents:
+            written = await self.flush()
+            print(f"🔁 Replayed {written} buffered attendance events from {len(paths)} log segments")
+        else:
+            self._closed_segments = []
+            await run_in_threadpool(self._remove_segments_sync, paths)
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self.flush()
+        with self._file_lock:
+            self._file.close()
+            if os.path.getsize(self._segment) == 0:
+                _remove_missing_ok(self._segment)
+            # Nothing left to replay: drop the namespace; otherwise keep it locked until the process exits
+            if not self._segment_files(self._namespace):
+                _remove_missing_ok(os.path.join(self._namespace, LOCK_NAME))
+                self._namespace_lock.close()
+                try:
+                    os.rmdir(self._namespace)
+                except OSError:
+                    pass
+
+
+attendance_buffer = AttendanceWriteBuffer(
+    settings.ATTENDANCE_WAL_DIR,
+    settings.ATTENDANCE_FLUSH_INTERVAL_MS,
+    settings.ATTENDANCE_FLUSH_MAX_RECORDS,
+)
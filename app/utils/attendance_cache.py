@@ -0,0 +1,129 @@
+import time
+from datetime import datetime, timedelta
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+import pytz
+
+from app.database import student_collection
+from app.utils.group_index import group_index
+
+EGYPT_TZ = pytz.timezone("Africa/Cairo")
+
+# Punches are accepted from one hour before to one hour after the group start time
+WINDOW_BEFORE = timedelta(hours=1)
+WINDOW_AFTER = timedelta(hours=1)
+
+
+class GroupSchedule:
+    """A group's attendance rules with start_time parsed once."""
+
+    def __init__(self, info: dict):
+        self.group_id = info["id"]
+        self.group_name = info["group_name"]
+        self.level = info["level"]
+        self.days: FrozenSet[str] = frozenset(info["days"])
+        self.day_list = list(info["days"])
+        self.start_time_str = info["start_time"]
+        try:
+            self.start_time = datetime.strptime(info["start_time"], "%H:%M").time()
+        except (TypeError, ValueError):
+            self.start_time = None
+
+    def window(self, local_timestamp: datetime) -> Tuple[datetime, datetime]:
+        """Allowed (start, end) on the local day of `local_timestamp`."""
+        scheduled_start = EGYPT_TZ.localize(datetime.combine(local_timestamp.date(), self.start_time))
+        return scheduled_start - WINDOW_BEFORE, scheduled_start + WINDOW_AFTER
+
+
+class AttendanceCache:
+    """
+    Resident uid -> student cache for the attendance path.
+
+    A punch needs the student's ObjectId, numeric id, level and name plus the
+    group schedule. Students are cached by uid (indexed lookup on a miss) and
+    dropped whenever the student is updated, deleted, archived or blacklisted.
+    Groups come from the shared group index, which the group router keeps in
+    sync on group writes; parsed schedules are memoized per group version.
+    """
+
+    PROJECTION = {"_id": 1, "student_id": 1, "uid": 1, "level": 1, "first_name": 1, "last_name": 1}
+
+    def __init__(self, ttl_seconds: int = 600):
+        self.ttl_seconds = ttl_seconds
+        self._students: Dict[int, tuple] = {}
+        self._schedules: Dict[tuple, GroupSchedule] = {}
+
+    def _schedule(self, info: Optional[dict]) -> Optional[GroupSchedule]:
+        if info is None:
+            return None
+        key = (info["id"], info["group_name"], info["level"], tuple(info["days"]), info["start_time"])
+        schedule = self._schedules.get(key)
+        if schedule is None:
+            schedule = self._schedules[key] = GroupSchedule(info)
+        return schedule
+
+    async def warm(self):
+        """Load every student's attendance fields with one query (run at startup)."""
+        now = time.monotonic()
+        try:
+            async for student in student_collection.find({"uid": {"$exists": True}}, self.PROJECTION):
+                self._students[student["uid"]] = (now, student)
+            # One $in query fills the group index for all of them
+            await group_index.lookup(student["_id"] for _, student in self._students.values())
+        except Exception as e:
+            print(f"⚠️ Attendance cache warm-up failed: {e}")
+            return
+        print(f"✅ Attendance cache warmed with {len(self._students)} students")
+
+    async def student(self, uid: int) -> Optional[dict]:
+        entry = self._students.get(uid)
+        if entry and time.monotonic() - entry[0] < self.ttl_seconds:
+            return entry[1]
+
+        student = await student_collection.find_one({"uid": uid}, self.PROJECTION)
+        if student is None:
+            self._students.pop(uid, None)
+            return None
+        self._students[uid] = (time.monotonic(), student)
+        return student
+
+    async def lookup(self, uid: int) -> Tuple[Optional[dict], Optional[GroupSchedule]]:
+        """(student, group schedule) for a punch; either may be None."""
+        student = await self.student(uid)
+        if student is None:
+            return None, None
+        groups = await group_index.lookup([student["_id"]])
+        return student, self._schedule(groups[student["_id"]])
+
+    async def lookup_many(self, uids: Iterable[int]) -> Dict[int, Tuple[dict, Optional[GroupSchedule]]]:
+        """{uid: (student, group schedule)} for many punches; unknown uids are omitted."""
+        now = time.monotonic()
+        students = {}
+        missing = []
+        for uid in set(uids):
+            entry = self._students.get(uid)
+            if entry and now - entry[0] < self.ttl_seconds:
+                students[uid] = entry[1]
+            else:
+                missing.append(uid)
+
+        if missing:
+            async for student in student_collection.find({"uid": {"$in": missing}}, self.PROJECTION):
+                self._students[student["uid"]] = (now, student)
+                students[student["uid"]] = student
+
+        groups = await group_index.lookup(student["_id"] for student in students.values())
+        return {uid: (student, self._schedule(groups[student["_id"]])) for uid, student in students.items()}
+
+    def forget(self, student_id: int):
+        """Drop the cached student with this numeric student_id (after any student write)."""
+        for uid, (_, student) in list(self._students.items()):
+            if student.get("student_id") == student_id:
+                self._students.pop(uid, None)
+
+    def clear(self):
+        self._students.clear()
+        self._schedules.clear()
+
+
+attendance_cache = AttendanceCache()
@@ -0,0 +1,126 @@
+import bisect
+import hashlib
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import pytz
+from bson import ObjectId
+from pymongo import InsertOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from app.config import settings
+from app.models.attendance_event import AttendanceEvent
+from app.utils.attendance_cache import EGYPT_TZ, GroupSchedule
+
+
+# Timestamp of events migrated from students.attendance["dayN"] (no real date); day queries skip them
+LEGACY_TIMESTAMP = datetime(1970, 1, 1)
+# Matches punches with a real timestamp (legacy_day is null or missing)
+DATED_EVENTS = {"legacy_day": None}
+
+
+def collection():
+    """Raw collection (available once init_beanie has run)."""
+    return AttendanceEvent.get_motor_collection()
+
+
+def to_utc(timestamp: datetime) -> datetime:
+    """Naive UTC datetime as stored by Mongo."""
+    return timestamp.astimezone(pytz.utc).replace(tzinfo=None)
+
+
+def local_day_bounds(day: date) -> Tuple[datetime, datetime]:
+    """UTC [start, end) of a calendar day in Egypt time."""
+    start = EGYPT_TZ.localize(datetime.combine(day, time.min))
+    end = EGYPT_TZ.localize(datetime.combine(day + timedelta(days=1), time.min))
+    return to_utc(start), to_utc(end)
+
+
+def event_id(uid: int, timestamp: datetime) -> ObjectId:
+    """
+    Deterministic _id for a punch (uid + UTC timestamp), so a punch that is
+    posted or replayed twice is stored once.
+    """
+    digest = hashlib.sha1(f"{uid}:{timestamp.isoformat()}".encode()).digest()
+    return ObjectId(digest[:12])
+
+
+def event_document(student: dict, group_id: Optional[str], local_timestamp: datetime, approved: bool) -> dict:
+    timestamp = to_utc(local_timestamp)
+    return {
+        "_id": event_id(student["uid"], timestamp),
+        "uid": student["uid"],
+        "student_id": student["_id"],
+        "group_id": ObjectId(group_id) if group_id else None,
+        "timestamp": timestamp,
+        "approved": approved,
+        "legacy_day": None,
+    }
+
+
+async def record_attendance(student: dict, group_id: Optional[str], local_timestamp: datetime, approved: bool) -> int:
+    """Insert one attendance event and return the student's attendance count including it."""
+    try:
+        await collection().insert_one(event_document(student, group_id, local_timestamp, approved))
+    except DuplicateKeyError:
+        pass  # The same punch was already recorded
+    return await collection().count_documents({"student_id": student["_id"]})
+
+
+async def record_attendance_batch(punches: List[Tuple[dict, GroupSchedule, datetime, bool]]) -> List[str]:
+    """
+    Store validated punches (student, group, local timestamp, approved) with one
+    unordered bulk_write. Returns "recorded" or "duplicate" for each punch.
+
+    A punch is a duplicate when the same student has another punch (stored or
+    earlier in the batch) within ATTENDANCE_DEDUPE_SECONDS, or when the exact
+    same punch was already stored.
+    """
+    statuses = ["recorded"] * len(punches)
+    if not punches:
+        return statuses
+
+    window = timedelta(seconds=settings.ATTENDANCE_DEDUPE_SECONDS)
+    documents = [event_document(student, group.group_id, local_timestamp, approved)
+                 for student, group, local_timestamp, approved in punches]
+
+    # Punches already stored around this batch, per student (one indexed query)
+    seen: Dict[ObjectId, List[datetime]] = {}
+    if window:
+        timestamps = [document["timestamp"] for document in documents]
+        async for event in collection().find(
+            {
+                "student_id": {"$in": list({document["student_id"] for document in documents})},
+                "timestamp": {"$gte": min(timestamps) - window, "$lte": max(timestamps) + window},
+                **DATED_EVENTS,
+            },
+            {"student_id": 1, "timestamp": 1}
+        ):
+            seen.setdefault(event["student_id"], []).append(event["timestamp"])
+        for stored in seen.values():
+            stored.sort()
+
+    operations = []
+    positions = []
+    for position in sorted(range(len(documents)), key=lambda i: documents[i]["timestamp"]):
+        document = documents[position]
+        if window:
+            stored = seen.setdefault(document["student_id"], [])
+            i = bisect.bisect_left(stored, document["timestamp"] - window)
+            if i < len(stored) and stored[i] <= document["timestamp"] + window:
+                statuses[position] = "duplicate"
+                continue
+            bisect.insort(stored, document["timestamp"])
+        operations.append(InsertOne(document))
+        positions.append(position)
+
+    if operations:
+        try:
+            await collection().bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                if error.get("code") != 11000:
+                    raise
+                statuses[positions[error["index"]]] = "duplicate"
+
+    return statuses
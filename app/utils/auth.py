@@ -1,9 +1,64 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
 from passlib.context import CryptContext
 
+from app.config import settings
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt takes 100-300 ms per call; it runs on a small dedicated pool so logins
+# never block the event loop (attendance punches keep flowing) and never take
+# over the default threadpool. The semaphore keeps extra logins waiting on the
+# loop, where they are cheap and cancelled if the client goes away.
+_password_pool = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+_password_slots = asyncio.Semaphore(settings.PASSWORD_HASH_WORKERS)
+
+
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+
+async def _run_password_op(func, *args):
+    async with _password_slots:
+        return await asyncio.get_running_loop().run_in_executor(_password_pool, func, *args)
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_password_op(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_password_op(verify_password, plain_password, hashed_password)
+
+
+class AssistantCache:
+    """
+    Short-lived, per-worker cache of assistant name -> {"name": ...} so
+    /assistant/me does not query Mongo on every call. It is only an existence
+    check: the API never renames or removes assistants, so there is nothing to
+    invalidate, and an assistant removed directly in the database is still
+    confirmed for up to ttl_seconds. Disabled when ttl_seconds is 0.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[float, dict]] = {}
+
+    def get(self, name: str) -> Optional[dict]:
+        entry = self._entries.get(name)
+        if entry and time.monotonic() - entry[0] < self.ttl_seconds:
+            return entry[1]
+        return None
+
+    def put(self, name: str, assistant: dict):
+        if self.ttl_seconds > 0:
+            self._entries[name] = (time.monotonic(), assistant)
+
+
+assistant_cache = AssistantCache(settings.ASSISTANT_CACHE_SECONDS)
@@ -0,0 +1,236 @@
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from app.models.exam import ExamModel
+from app.models.grading_review import GradingReview
+from app.models.student_document import ExamEntry
+from app.utils.exam_results import record_exam_results
+from app.utils.image_storage import compact_student_sheet
+from app.utils.roster_index import roster_index
+
+
+def read_sheets(sheet_paths: List[str]) -> List[Dict]:
+    """Run the bubble sheet reader over a stack of sheets (CPU bound, call from a thread)."""
+    # OpenCV and the grading module load on the first grading request, not at startup
+    from app.utils.exam_corrector import ExamCorrector
+    corrector = ExamCorrector()
+    sheets = []
+    for path in sheet_paths:
+        sheet = corrector.read_sheet(path)
+        # Grading is done, keep a compact copy (the original is retained for a while)
+        sheet['solution_photo'] = compact_student_sheet(path)
+        sheets.append(sheet)
+    return sheets
+
+
+def get_answer_key_paths(exam: ExamModel) -> Dict[Optional[int], str]:
+    """
+    Answer key image per exam model number.
+    Exams without model keys use the legacy solution photo for every sheet (key None).
+    """
+    model_keys = {model.model_number: model.solution_photo for model in exam.models if model.solution_photo}
+    if model_keys:
+        return model_keys
+    if exam.solution_photo:
+        return {None: exam.solution_photo}
+    return {}
+
+
+def load_answer_keys(key_paths: Dict[Optional[int], str]) -> Dict[Optional[int], list]:
+    """Extract every model's answer key (CPU bound, call from a thread)."""
+    from app.utils.exam_corrector import ExamCorrector
+    corrector = ExamCorrector()
+    return {model_number: corrector.get_answer_key(path) for model_number, path in key_paths.items()}
+
+
+def detected_model_number(sheet: Dict):
+    """Return (model number, review reason) for the exam model bubble read from a sheet."""
+    exam_model = sheet.get('exam_model')
+    if not exam_model or not exam_model.get('is_valid'):
+        return None, 'invalid_exam_model'
+    return ord(exam_model['value']) - ord('A') + 1, None
+
+
+def score_group(sheets: List[Dict], correct_answers: list, final_degree: int):
+    """
+    Score every sheet of one exam model against its key in one vectorized comparison.
+    Unanswered and multiple answers never match; scoring matches ExamCorrector._calculate_score.
+    """
+    import numpy as np
+
+    total_questions = max([len(correct_answers)] + [len(sheet['answers']) for sheet in sheets])
+    if total_questions == 0:
+        for sheet in sheets:
+            sheet.update({'score': 0, 'percentage': 0, 'correct_answers': 0, 'total_questions': 0})
+        return
+
+    def to_row(answers):
+        row = [str(answer).upper() if answer is not None else '' for answer in answers]
+        return row + [''] * (total_questions - len(row))
+
+    key = np.array(to_row(correct_answers))
+    matrix = np.array([to_row(sheet['answers']) for sheet in sheets])
+
+    correct_counts = ((matrix == key) & (key != '')).sum(axis=1)
+    percentages = correct_counts / total_questions * 100
+    scores = correct_counts / total_questions * final_degree
+
+    for sheet, correct_count, percentage, score in zip(sheets, correct_counts, percentages, scores):
+        sheet['score'] = round(float(score), 2)
+        sheet['percentage'] = round(float(percentage), 2)
+        sheet['correct_answers'] = int(correct_count)
+        sheet['total_questions'] = total_questions
+
+
+def decoded_student_id(sheet: Dict):
+    """Return (numeric id, review reason) for the ID decoded from a sheet."""
+    id_summary = sheet.get('student_id')
+    if not id_summary or not id_summary.get('value'):
+        return None, 'incomplete_id'
+
+    value = id_summary['value']
+    if 'X' in value:
+        return None, 'ambiguous_id'
+    if not id_summary.get('is_complete') or not value.isdigit():
+        return None, 'incomplete_id'
+
+    return int(value), None
+
+
+async def attach_results(exam: ExamModel, graded: List[Dict]):
+    """
+    Record graded sheets in exam_results with one bulk insert.
+    Sheets whose student already has this exam are flagged instead.
+    """
+    exam_id = str(exam.id)
+    entries = [
+        (sheet['student']['_id'], ExamEntry(
+            exam_id=exam_id,
+            degree=sheet['score'],
+            percentage=sheet['percentage'],
+            delivery_time=datetime.utcnow(),
+            solution_photo=sheet['solution_photo']
+        ))
+        for sheet in graded
+    ]
+
+    stored = await record_exam_results(entries)
+    for sheet in graded:
+        if (sheet['student']['_id'], exam_id) not in stored:
+            sheet['review_reason'] = 'already_submitted'
+
+
+async def grade_exam_batch(exam: ExamModel, sheet_paths: List[str]) -> Dict:
+    """
+    Grade a stack of student sheets for one exam, possibly mixing exam models.
+
+    Every sheet is read once, decoded student IDs are resolved together through
+    the roster index, sheets are grouped by the exam model bubble and each group
+    is scored against that model's answer key. Results are attached to the
+    matched students. Sheets that cannot be matched or graded safely are stored
+    in the grading review queue.
+    """
+    key_paths = get_answer_key_paths(exam)
+    if not key_paths:
+        raise ValueError("Exam has no answer key uploaded")
+
+    answer_keys = await run_in_threadpool(load_answer_keys, key_paths)
+    sheets = await run_in_threadpool(read_sheets, sheet_paths)
+    model_aware = None not in answer_keys
+
+    # Decode IDs and flag incomplete / ambiguous reads
+    for sheet in sheets:
+        sheet['review_reason'] = None
+        if not sheet['success']:
+            sheet['review_reason'] = 'unreadable_sheet'
+            continue
+        sheet['decoded_id'], sheet['review_reason'] = decoded_student_id(sheet)
+
+    # Two sheets claiming the same ID in one stack cannot both be trusted
+    id_counts = Counter(sheet['decoded_id'] for sheet in sheets if sheet.get('decoded_id') is not None)
+    for sheet in sheets:
+        if sheet.get('decoded_id') is not None and id_counts[sheet['decoded_id']] > 1:
+            sheet['review_reason'] = 'duplicate_id'
+
+    # Resolve every decoded ID with a single roster lookup
+    candidates = [sheet for sheet in sheets if sheet['review_reason'] is None]
+    roster = await roster_index.resolve(sheet['decoded_id'] for sheet in candidates)
+
+    groups: Dict[Optional[int], List[Dict]] = {}
+    for sheet in candidates:
+        matches = roster.get(sheet['decoded_id'], [])
+        if not matches:
+            sheet['review_reason'] = 'unknown_student'
+            continue
+        if len(matches) > 1:
+            sheet['review_reason'] = 'ambiguous_id'
+            continue
+        sheet['student'] = matches[0]
+
+        # Group by the exam model read from the sheet
+        model_number = None
+        if model_aware:
+            model_number, sheet['review_reason'] = detected_model_number(sheet)
+            if sheet['review_reason']:
+                continue
+            if model_number not in answer_keys:
+                sheet['review_reason'] = 'missing_answer_key'
+                continue
+        sheet['model_number'] = model_number
+        groups.setdefault(model_number, []).append(sheet)
+
+    graded = []
+    for model_number, group in groups.items():
+        score_group(group, answer_keys[model_number], exam.final_degree)
+        graded.extend(group)
+
+    await attach_results(exam, graded)
+
+    # Queue everything that needs a human
+    reviews = [
+        GradingReview(
+            exam_id=str(exam.id),
+            solution_photo=sheet['solution_photo'],
+            reason=sheet['review_reason'],
+            decoded_student_id=(sheet.get('student_id') or {}).get('value'),
+            exam_model=(sheet.get('exam_model') or {}).get('value'),
+            details=None if sheet['success'] else sheet['message']
+        )
+        for sheet in sheets if sheet['review_reason']
+    ]
+    if reviews:
+        await GradingReview.insert_many(reviews)
+
+    results = []
+    for sheet in sheets:
+        entry = {
+            "solution_photo": sheet['solution_photo'],
+            "decoded_student_id": (sheet.get('student_id') or {}).get('value'),
+            "exam_model": (sheet.get('exam_model') or {}).get('value'),
+            "status": "needs_review" if sheet['review_reason'] else "graded",
+            "review_reason": sheet['review_reason'],
+        }
+        if not sheet['review_reason']:
+            student = sheet['student']
+            entry.update({
+                "student_object_id": str(student["_id"]),
+                "student_id": student["student_id"],
+                "student_name": f"{student.get('first_name', '')} {student.get('last_name', '')}",
+                "model_number": sheet['model_number'],
+                "degree": sheet['score'],
+                "percentage": sheet['percentage'],
+                "correct_answers": sheet['correct_answers'],
+                "total_questions": sheet['total_questions'],
+            })
+        results.append(entry)
+
+    graded_count = sum(1 for entry in results if entry["status"] == "graded")
+    return {
+        "exam_id": str(exam.id),
+        "total_sheets": len(results),
+        "graded": graded_count,
+        "needs_review": len(results) - graded_count,
+        "results": results
+    }
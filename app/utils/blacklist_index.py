@@ -0,0 +1,93 @@
+import asyncio
+import time
+from collections import Counter
+from typing import Optional
+
+from app.models.blacklist import BlacklistStudent
+from app.utils.text_normalization import normalize_name, normalize_phone
+
+
+class BlacklistIndex:
+    """
+    In-memory sets of normalized blacklisted phone numbers and (first, last) names.
+
+    Student creation and the Excel import check against it without touching
+    the database. It is loaded with one projected query at startup, the
+    blacklist router updates it on add/remove, and it reloads after
+    `ttl_seconds` so changes made by other workers are picked up.
+    Entries are counted so removing one of two blacklisted students that
+    share a phone keeps the phone blocked.
+    """
+
+    PROJECTION = {"phone_number": 1, "first_name": 1, "last_name": 1}
+
+    def __init__(self, ttl_seconds: int = 300):
+        self.ttl_seconds = ttl_seconds
+        self._phones: Counter = Counter()
+        self._names: Counter = Counter()
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def _keys(entry) -> tuple:
+        get = entry.get if isinstance(entry, dict) else lambda field: getattr(entry, field, None)
+        return normalize_phone(get("phone_number")), (normalize_name(get("first_name")), normalize_name(get("last_name")))
+
+    async def _load(self):
+        phones, names = Counter(), Counter()
+        async for entry in BlacklistStudent.get_motor_collection().find({}, self.PROJECTION):
+            phone, name = self._keys(entry)
+            if phone:
+                phones[phone] += 1
+            names[name] += 1
+        self._phones, self._names = phones, names
+        self._loaded_at = time.monotonic()
+        print(f"✅ Blacklist index loaded with {sum(names.values())} entries")
+
+    def _stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at >= self.ttl_seconds
+
+    async def load(self):
+        """Rebuild both sets from the blacklist collection (one query)."""
+        async with self._lock:
+            await self._load()
+
+    async def ensure_loaded(self):
+        if self._stale():
+            async with self._lock:
+                # Another request may have reloaded while we waited
+                if self._stale():
+                    await self._load()
+
+    async def warm(self):
+        """Startup load; a failure is retried by the first check."""
+        try:
+            await self.load()
+        except Exception as e:
+            print(f"⚠️ Blacklist index load failed: {e}")
+
+    def add(self, entry):
+        phone, name = self._keys(entry)
+        if phone:
+            self._phones[phone] += 1
+        self._names[name] += 1
+
+    def remove(self, entry):
+        phone, name = self._keys(entry)
+        for counter, key in ((self._phones, phone), (self._names, name)):
+            if counter[key] > 1:
+                counter[key] -= 1
+            else:
+                counter.pop(key, None)
+
+    def violation(self, student_data: dict) -> Optional[str]:
+        """Error message if the student's phone or name is blacklisted, else None (call ensure_loaded first)."""
+        phone, name = self._keys(student_data)
+        if phone and phone in self._phones:
+            return f"Cannot create student. A student with the same phone number ({student_data['phone_number']}) exists in the blacklist."
+        if name in self._names:
+            return f"Cannot create student. A student with the same name ({student_data['first_name']} {student_data['last_name']}) exists in the blacklist."
+        return None
+
+
+blacklist_index = BlacklistIndex()
@@ -10,9 +10,15 @@ from datetime import datetime
 from BubbleSheetCorrecterModule.compare_bubbles import highlight_reference_bubbles, create_visualization, calculate_grade
 from BubbleSheetCorrecterModule.bubble_edge_detector import detect_aruco_markers, compare_with_reference
 from BubbleSheetCorrecterModule.aruco_based_exam_model import calculate_exam_model_positions_from_aruco, detect_bubble_contour_at_position
+from app.utils.result_writer import result_writer
 
 load_dotenv()
 
+# Visualization artifacts are optional and downscaled before encoding
+SAVE_VISUALIZATION = os.getenv('SAVE_VISUALIZATION', 'true').lower() == 'true'
+VISUALIZATION_MAX_WIDTH = int(os.getenv('VISUALIZATION_MAX_WIDTH', 1024))
+VISUALIZATION_JPEG_QUALITY = int(os.getenv('VISUALIZATION_JPEG_QUALITY', 80))
+
 def process_bubble_sheet(image, 
                         reference_data_file='BubbleSheetCorrecterModule/reference_data.json',
                         id_reference_file='BubbleSheetCorrecterModule/id_coordinates.json', 
@@ -43,7 +49,9 @@ def process_bubble_sheet(image,
     os.makedirs(output_dir, exist_ok=True)
     
     # Generate base Name from input image
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    save_results = os.getenv('SAVE_RESULTS', 'false').lower() == 'true'
+    json_path = csv_path = vis_path = None
 
     print(f"Processing bubble sheet")
     print("=" * 60)
@@ -131,22 +139,13 @@ def process_bubble_sheet(image,
                 'is_complete': grade_data['id']['is_complete']
             }
         
-        if os.getenv('SAVE_RESULTS', 'false').lower() == 'true':
-            # Save detailed JSON results
+        if save_results:
+            # Artifacts are written by the background writer, the request does not wait on disk I/O
             json_path = os.path.join(output_dir, f"results_{timestamp}.json")
-            with open(json_path, 'w') as f:
-                json.dump(results, f, indent=2)
-            print(f"Detailed results saved: {json_path}")
-            
-            # Create comprehensive CSV file
             csv_path = os.path.join(output_dir, f"grades_{timestamp}.csv")
-            create_comprehensive_csv(results, csv_path)
-            print(f"Grade CSV saved: {csv_path}")
-            
-            # Save visualization image
-            vis_path = os.path.join(output_dir, f"visualization_{timestamp}.jpg")
-            cv2.imwrite(vis_path, vis_image)
-            print(f"Visualization saved: {vis_path}")
+            if SAVE_VISUALIZATION:
+                vis_path = os.path.join(output_dir, f"visualization_{timestamp}.jpg")
+            result_writer.submit(save_result_artifacts, results, vis_image, json_path, csv_path, vis_path)
             
         print("=" * 60)
         print("✅ Processing completed successfully!")
@@ -154,9 +153,9 @@ def process_bubble_sheet(image,
         return {
             'visualization_image': vis_image,
             'results': results,
-            'csv_path': [csv_path if os.getenv('SAVE_RESULTS', 'false').lower() == 'true' else None],
-            'json_path': [json_path if os.getenv('SAVE_RESULTS', 'false').lower() == 'true' else None],
-            'visualization_path': [vis_path if os.getenv('SAVE_RESULTS', 'false').lower() == 'true' else None],
+            'csv_path': [csv_path],
+            'json_path': [json_path],
+            'visualization_path': [vis_path],
             'success': True,
             'message': 'Processing completed successfully'
         }
@@ -175,6 +174,24 @@ def process_bubble_sheet(image,
             'message': error_msg
         }
 
+def save_result_artifacts(results, vis_image, json_path, csv_path, vis_path=None):
+    """Write the JSON, CSV and visualization artifacts of one processed sheet."""
+    
+    # Compact JSON, these files are machine-read
+    with open(json_path, 'w') as f:
+        json.dump(results, f, separators=(',', ':'))
+    
+    create_comprehensive_csv(results, csv_path)
+    
+    if vis_path is not None and vis_image is not None:
+        height, width = vis_image.shape[:2]
+        if width > VISUALIZATION_MAX_WIDTH:
+            scale = VISUALIZATION_MAX_WIDTH / width
+            vis_image = cv2.resize(vis_image, (VISUALIZATION_MAX_WIDTH, int(height * scale)), interpolation=cv2.INTER_AREA)
+        cv2.imwrite(vis_path, vis_image, [cv2.IMWRITE_JPEG_QUALITY, VISUALIZATION_JPEG_QUALITY])
+    
+    print(f"Results saved: {json_path}, {csv_path}" + (f", {vis_path}" if vis_path else ""))
+
 def create_comprehensive_csv(results, csv_path):
     """Create a comprehensive CSV file with all grade information."""
     
@@ -0,0 +1,105 @@
+import asyncio
+import random
+from datetime import datetime, timedelta
+from typing import Optional
+
+from pymongo import ReturnDocument
+
+from app.config import settings
+from app.models.device_outbox import DeviceOutbox
+from app.utils.host_client import host_request
+
+# How long a claimed operation is hidden from other workers while it is being sent
+CLAIM_SECONDS = 60
+
+# Delivery tasks started by enqueue (kept referenced until they finish)
+_background_tasks = set()
+
+
+def backoff(attempts: int) -> timedelta:
+    """Exponential backoff with jitter: base, 2x base, 4x base ... capped."""
+    delay = min(settings.DEVICE_OUTBOX_BACKOFF_SECONDS * 2 ** (attempts - 1), settings.DEVICE_OUTBOX_MAX_BACKOFF_SECONDS)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+async def enqueue(operation: str, method: str, path: str, payload: Optional[dict] = None) -> DeviceOutbox:
+    """
+    Record a device-side operation and try to deliver it in the background.
+    The caller does not wait for the fingerprint host; failures are retried
+    by the deliver_device_outbox maintenance job.
+    """
+    entry = DeviceOutbox(operation=operation, method=method, path=path, payload=payload)
+    await entry.insert()
+    task = asyncio.create_task(deliver_pending())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return entry
+
+
+async def _claim() -> Optional[dict]:
+    now = datetime.utcnow()
+    return await DeviceOutbox.get_motor_collection().find_one_and_update(
+        {"status": "pending", "next_attempt_at": {"$lte": now}},
+        {"$set": {"next_attempt_at": now + timedelta(seconds=CLAIM_SECONDS)}, "$inc": {"attempts": 1}},
+        sort=[("next_attempt_at", 1)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+def _retryable(status_code: int) -> bool:
+    return status_code >= 500 or status_code in (408, 429)
+
+
+async def _send(entry: dict) -> str:
+    """Deliver one claimed operation and record the outcome: "done", "retry" or "failed"."""
+    import httpx
+
+    collection = DeviceOutbox.get_motor_collection()
+    retryable = True
+    try:
+        response = await host_request(entry["method"], entry["path"], entry.get("payload"))
+        # A fingerprint that is already gone counts as removed
+        if response.status_code < 400 or (response.status_code == 404 and entry["method"] == "DELETE"):
+            await collection.update_one(
+                {"_id": entry["_id"]},
+                {"$set": {"status": "done", "completed_at": datetime.utcnow(), "last_error": None}}
+            )
+            return "done"
+        error = f"HTTP {response.status_code}: {response.text[:200]}"
+        retryable = _retryable(response.status_code)
+    except httpx.HTTPError as e:
+        error = f"{type(e).__name__}: {e}"
+
+    if not retryable or entry["attempts"] >= settings.DEVICE_OUTBOX_MAX_ATTEMPTS:
+        await collection.update_one({"_id": entry["_id"]}, {"$set": {"status": "failed", "last_error": error}})
+        print(f"❌ Device operation {entry['operation']} {entry['path']} failed after {entry['attempts']} attempts: {error}")
+        return "failed"
+
+    await collection.update_one(
+        {"_id": entry["_id"]},
+        {"$set": {"next_attempt_at": datetime.utcnow() + backoff(entry["attempts"]), "last_error": error}}
+    )
+    return "retry"
+
+
+async def deliver_pending(limit: int = 100) -> dict:
+    """Send due operations one at a time (maintenance job, also kicked after enqueue)."""
+    counts = {"done": 0, "retry": 0, "failed": 0}
+    for _ in range(limit):
+        entry = await _claim()
+        if entry is None:
+            break
+        counts[await _send(entry)] += 1
+    return {"delivered": counts["done"], "retried": counts["retry"], "failed": counts["failed"]}
+
+
+async def outbox_status() -> dict:
+    """Entry counts per status and the most recent failures."""
+    collection = DeviceOutbox.get_motor_collection()
+    counts = {row["_id"]: row["count"] async for row in collection.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}])}
+    failures = await collection.find(
+        {"status": "failed"}, {"operation": 1, "path": 1, "attempts": 1, "last_error": 1, "created_at": 1}
+    ).sort("created_at", -1).limit(20).to_list(length=None)
+    for failure in failures:
+        failure["_id"] = str(failure["_id"])
+    return {"counts": counts, "recent_failures": failures}
@@ -6,6 +6,9 @@ import os
 from typing import Dict, Optional, Tuple
 from app.utils.bubble_sheet_processor import process_bubble_sheet
 
+# Answer keys extracted from solution images, keyed by (path, mtime)
+_answer_key_cache: Dict[Tuple[str, float], list] = {}
+
 
 class ExamCorrector:
     """
@@ -91,6 +94,60 @@ class ExamCorrector:
                 'message': f"Error during exam correction: {str(e)}"
             }
     
+    def read_sheet(self, image_path: str) -> Dict:
+        """
+        Process a student's bubble sheet without grading it.
+        
+        Args:
+            image_path: Path to student's bubble sheet image
+            
+        Returns:
+            Dict containing:
+            - success: bool
+            - answers: list of answers
+            - student_id: decoded ID summary ({'value', 'is_complete'}) or None
+            - exam_model: detected exam model summary or None
+            - message: str
+        """
+        result = self._process_bubble_sheet(image_path)
+        if not result['success']:
+            return {
+                'success': False,
+                'message': f"Failed to process student solution: {result['message']}"
+            }
+        
+        summary = result['results'].get('summary', {})
+        return {
+            'success': True,
+            'answers': self._extract_answers(result['results']),
+            'student_id': summary.get('student_id'),
+            'exam_model': summary.get('exam_model'),
+            'message': 'Sheet processed successfully'
+        }
+    
+    def get_answer_key(self, exam_solution_path: str) -> list:
+        """
+        Extract the answers of an answer key image, processing each file only once.
+        
+        Args:
+            exam_solution_path: Path to exam's answer key bubble sheet image
+            
+        Returns:
+            List of correct answers
+        """
+        try:
+            cache_key = (exam_solution_path, os.path.getmtime(exam_solution_path))
+        except OSError:
+            raise ValueError(f"Image file not found: {exam_solution_path}")
+        
+        if cache_key not in _answer_key_cache:
+            exam_result = self._process_bubble_sheet(exam_solution_path)
+            if not exam_result['success']:
+                raise ValueError(f"Failed to process exam answer key: {exam_result['message']}")
+            _answer_key_cache[cache_key] = self._extract_answers(exam_result['results'])
+        
+        return list(_answer_key_cache[cache_key])
+    
     def _process_bubble_sheet(self, image_path: str) -> Dict:
         """
         Process a bubble sheet image using the existing bubble sheet processor.
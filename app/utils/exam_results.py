@@ -0,0 +1,137 @@
+from collections import Counter
+from datetime import datetime
+from typing import List, Set, Tuple
+
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.database import db, student_collection
+from app.models.exam_result import ExamResult
+from app.models.student_document import ExamEntry
+
+exams_collection = db["exams"]
+
+
+def result_document(student_oid: ObjectId, entry: ExamEntry) -> dict:
+    return {
+        "exam_id": entry.exam_id,
+        "student_id": student_oid,
+        "degree": entry.degree,
+        "percentage": entry.percentage,
+        "delivery_time": entry.delivery_time,
+        "solution_photo": entry.solution_photo,
+        "created_at": datetime.utcnow(),
+    }
+
+
+def entry_from_embedded(exam: dict) -> ExamEntry:
+    """
+    ExamEntry from an embedded `exams` item as older data stored it (non-string
+    exam_id, student_degree/degree_percentage names, no delivery_time);
+    same fallbacks as script/migrate_exam_results.py, without validation.
+    """
+    return ExamEntry.model_construct(
+        exam_id=str(exam.get("exam_id", "")),
+        degree=exam.get("degree", exam.get("student_degree")),
+        percentage=exam.get("percentage", exam.get("degree_percentage")),
+        delivery_time=exam.get("delivery_time") or datetime.utcnow(),
+        solution_photo=exam.get("solution_photo"),
+    )
+
+
+async def record_exam_results(entries: List[Tuple[ObjectId, ExamEntry]], embed: bool = True) -> Set[Tuple[ObjectId, str]]:
+    """
+    Store exam submissions in exam_results and return the (student, exam_id) pairs that were stored.
+
+    The unique (exam_id, student_id) index rejects students that already
+    submitted an exam. For stored results each exam's student_count is
+    incremented and, with `embed`, the entry is also pushed to the embedded
+    `exams` array, which is kept for older readers.
+    """
+    if not entries:
+        return set()
+
+    documents = [result_document(student_oid, entry) for student_oid, entry in entries]
+    duplicates = set()
+    try:
+        await ExamResult.get_motor_collection().insert_many(documents, ordered=False)
+    except BulkWriteError as e:
+        for error in e.details.get("writeErrors", []):
+            if error.get("code") != 11000:
+                raise
+            duplicates.add(error["index"])
+
+    stored = [(student_oid, entry) for i, (student_oid, entry) in enumerate(entries) if i not in duplicates]
+    if stored:
+        per_exam = Counter(entry.exam_id for _, entry in stored)
+        await exams_collection.bulk_write([
+            UpdateOne({"_id": ObjectId(exam_id)}, {"$inc": {"student_count": count}})
+            for exam_id, count in per_exam.items()
+            if ObjectId.is_valid(exam_id)
+        ], ordered=False)
+        if embed:
+            await student_collection.bulk_write([
+                UpdateOne(
+                    {"_id": student_oid, "exams.exam_id": {"$ne": entry.exam_id}},
+                    {"$push": {"exams": entry.dict()}}
+                )
+                for student_oid, entry in stored
+            ], ordered=False)
+
+    return {(student_oid, entry.exam_id) for student_oid, entry in stored}
+
+
+async def record_exam_result(student_oid: ObjectId, entry: ExamEntry) -> bool:
+    """Store one submission. Returns False if the student already submitted this exam."""
+    return (student_oid, entry.exam_id) in await record_exam_results([(student_oid, entry)])
+
+
+async def update_exam_result(exam_id: str, student_oid: ObjectId, degree: float, percentage: float) -> bool:
+    """Correct a stored result (and its embedded copy). Returns False if there is none."""
+    result = await ExamResult.get_motor_collection().update_one(
+        {"exam_id": exam_id, "student_id": student_oid},
+        {"$set": {"degree": degree, "percentage": percentage}}
+    )
+    if result.matched_count == 0:
+        return False
+
+    await student_collection.update_one(
+        {"_id": student_oid, "exams.exam_id": exam_id},
+        {"$set": {"exams.$.degree": degree, "exams.$.percentage": percentage}}
+    )
+    return True
+
+
+async def delete_exam_results(exam_id: str):
+    await ExamResult.get_motor_collection().delete_many({"exam_id": exam_id})
+
+
+async def remove_student_results(student_oids: List[ObjectId]):
+    """
+    Drop the results of students leaving the students collection (deleted,
+    archived or blacklisted) and decrement the student_count of their exams.
+    The embedded `exams` copies travel with archived students, so
+    restore_student_results can bring the results back.
+    """
+    if not student_oids:
+        return
+    collection = ExamResult.get_motor_collection()
+    removed = [
+        UpdateOne({"_id": ObjectId(row["_id"])}, {"$inc": {"student_count": -row["count"]}})
+        async for row in collection.aggregate([
+            {"$match": {"student_id": {"$in": student_oids}}},
+            {"$group": {"_id": "$exam_id", "count": {"$sum": 1}}},
+        ])
+        if ObjectId.is_valid(row["_id"])
+    ]
+    if removed:
+        await exams_collection.bulk_write(removed, ordered=False)
+    await collection.delete_many({"student_id": {"$in": student_oids}})
+
+
+async def restore_student_results(student: dict):
+    """Re-create exam_results (and student_count) from a restored student's embedded `exams`."""
+    entries = [(student["_id"], entry_from_embedded(exam)) for exam in student.get("exams") or []]
+    # The embedded copies are already on the student
+    await record_exam_results([(student_oid, entry) for student_oid, entry in entries if entry.exam_id], embed=False)
@@ -1,8 +1,8 @@
 import base64
-from zk import ZK
-from zk.finger import Finger  # optional, for clarity
 
 def connect_device():
+    from zk import ZK  # pyzk is only needed when a device is contacted
+
     try:
         zk = ZK('192.168.1.201', port=4370, timeout=5)
         conn = zk.connect()
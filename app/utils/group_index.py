@@ -0,0 +1,86 @@
+import time
+from typing import Dict, Iterable, Optional
+
+from beanie.operators import In
+from bson import ObjectId
+
+from app.models.group import Group
+
+
+def group_info(group: Group) -> dict:
+    """The group fields student endpoints and attendance checks need."""
+    return {
+        "id": str(group.id),
+        "group_name": group.group_name,
+        "level": group.level,
+        "days": [day.value if hasattr(day, "value") else day for day in group.days],
+        "start_time": group.start_time,
+    }
+
+
+class GroupIndex:
+    """
+    In-memory index of student ObjectId -> group info.
+
+    Student list and detail endpoints resolve a whole page with one lookup;
+    students that are not cached are fetched together with a single `$in`
+    query on `Group.students` (students without a group are cached as None).
+    The group router keeps entries current on every group write, and entries
+    expire after `ttl_seconds` so writes made by other workers are picked up.
+    """
+
+    def __init__(self, ttl_seconds: int = 300):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[ObjectId, tuple] = {}
+
+    async def lookup(self, student_ids: Iterable) -> Dict[ObjectId, Optional[dict]]:
+        """Return {student ObjectId: group info or None} for the given students."""
+        now = time.monotonic()
+        resolved = {}
+        missing = []
+
+        for student_id in {ObjectId(str(student_id)) for student_id in student_ids}:
+            entry = self._entries.get(student_id)
+            if entry and now - entry[0] < self.ttl_seconds:
+                resolved[student_id] = entry[1]
+            else:
+                missing.append(student_id)
+
+        if missing:
+            for student_id in missing:
+                resolved[student_id] = None
+            async for group in Group.find(In(Group.students, missing)):
+                info = group_info(group)
+                for student_id in group.students:
+                    if student_id in resolved:
+                        resolved[student_id] = info
+            for student_id in missing:
+                self._entries[student_id] = (now, resolved[student_id])
+
+        return resolved
+
+    async def group_name(self, student_id) -> Optional[str]:
+        info = (await self.lookup([student_id]))[ObjectId(str(student_id))]
+        return info["group_name"] if info else None
+
+    def put_group(self, group: Group):
+        """Point every member of `group` at its current info (after create/update/add-student)."""
+        now = time.monotonic()
+        info = group_info(group)
+        for student_id in group.students:
+            self._entries[ObjectId(str(student_id))] = (now, info)
+
+    def remove_group(self, group: Group):
+        """Members of a deleted group no longer belong to any group."""
+        now = time.monotonic()
+        for student_id in group.students:
+            self._entries[ObjectId(str(student_id))] = (now, None)
+
+    def forget(self, student_id):
+        self._entries.pop(ObjectId(str(student_id)), None)
+
+    def clear(self):
+        self._entries.clear()
+
+
+group_index = GroupIndex()
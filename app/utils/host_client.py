@@ -0,0 +1,40 @@
+from typing import Optional
+
+from app.config import settings
+
+_client = None
+
+
+def get_host_client():
+    """
+    The shared HTTP client for the fingerprint host (HOST_REMOTE_URL).
+    Keep-alive connections are pooled and every call has a timeout, so a slow
+    host cannot hold requests open. Created on first use (httpx is not
+    imported at startup).
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        import httpx
+
+        _client = httpx.AsyncClient(
+            base_url=settings.HOST_REMOTE_URL,
+            timeout=httpx.Timeout(settings.HOST_TIMEOUT_SECONDS, connect=settings.HOST_CONNECT_TIMEOUT_SECONDS),
+            limits=httpx.Limits(
+                max_connections=settings.HOST_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HOST_MAX_CONNECTIONS,
+                keepalive_expiry=30,
+            ),
+        )
+    return _client
+
+
+async def close_host_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def host_request(method: str, path: str, payload: Optional[dict] = None):
+    """Send one request to the fingerprint host; raises httpx errors."""
+    return await get_host_client().request(method, path, json=payload)
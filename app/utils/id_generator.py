@@ -1,12 +1,72 @@
+import asyncio
+from collections import defaultdict
+from typing import Dict, List
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.config import settings
 from app.models.counter import Counter
 
-async def get_next_sequence(name: str):
-    counter = await Counter.find_one(Counter.name == name)
-    if not counter:
-        counter = Counter(name=name, sequence_value=1000 if name == "student_id" else 10035)
-        await counter.insert()
-    else:
-        counter.sequence_value += 1
-        await counter.save()
-    return counter.sequence_value
- 
+# Value a missing counter starts from (the first id handed out is one more)
+COUNTER_STARTS = {"student_id": 9999}  # So first student will be 10000
+
+
+async def reserve_ids(name: str, count: int, start_after: int = 0) -> range:
+    """
+    Reserve `count` consecutive ids from counter `name` with one atomic update.
+    A missing counter starts after `start_after`. Returns the reserved range.
+    """
+    update = [{"$set": {"sequence_value": {"$add": [{"$ifNull": ["$sequence_value", start_after]}, count]}}}]
+    try:
+        counter = await Counter.get_motor_collection().find_one_and_update(
+            {"name": name}, update, upsert=True, return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        # Another worker created the counter at the same moment; it exists now
+        counter = await Counter.get_motor_collection().find_one_and_update(
+            {"name": name}, update, return_document=ReturnDocument.AFTER
+        )
+    last = counter["sequence_value"]
+    return range(last - count + 1, last + 1)
+
+
+class IdAllocator:
+    """
+    Sequential ids for students, month/book sales and outgoings.
+
+    Each process reserves a block of ID_BLOCK_SIZE ids with one atomic
+    update and serves the following allocations from memory, so ids are
+    unique across workers. Ids left in a block when the process stops are
+    skipped (gaps, never duplicates).
+    """
+
+    def __init__(self, block_size: int):
+        self.block_size = max(1, block_size)
+        self._blocks: Dict[str, List[int]] = {}  # name -> [next, last]
+        self._locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    async def next_id(self, name: str) -> int:
+        async with self._locks[name]:
+            block = self._blocks.get(name)
+            if block is None or block[0] > block[1]:
+                reserved = await reserve_ids(name, self.block_size, COUNTER_STARTS.get(name, 0))
+                block = self._blocks[name] = [reserved.start, reserved.stop - 1]
+            block[0] += 1
+            return block[0] - 1
+
+    async def reserve(self, name: str, count: int) -> range:
+        """Consecutive ids for bulk inserts, straight from the counter."""
+        return await reserve_ids(name, count, COUNTER_STARTS.get(name, 0))
+
+    async def peek(self, name: str) -> int:
+        """The id the next `next_id(name)` call in this process would most likely return."""
+        block = self._blocks.get(name)
+        if block is not None and block[0] <= block[1]:
+            return block[0]
+        counter = await Counter.get_motor_collection().find_one({"name": name}, {"sequence_value": 1})
+        last = counter["sequence_value"] if counter else COUNTER_STARTS.get(name, 0)
+        return last + 1
+
+
+id_allocator = IdAllocator(settings.ID_BLOCK_SIZE)
@@ -0,0 +1,141 @@
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import List, Optional
+
+from app.config import settings
+
+UPLOAD_ROOT = "upload"
+ORIGINALS_DIR = f"{UPLOAD_ROOT}/originals"
+THUMBNAILS_DIR = f"{UPLOAD_ROOT}/thumbnails"
+
+# Size of the bubble sheet template (image_size in BubbleSheetCorrecterModule/reference_data.json);
+# sheets are aligned to this resolution before grading so nothing above it is ever used
+TEMPLATE_WIDTH = 1012
+TEMPLATE_HEIGHT = 1310
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".bmp"}
+
+
+def safe_filename(original_name: Optional[str], prefix: str = "") -> str:
+    """Server-generated file name; only the (validated) extension of the client name is kept."""
+    extension = Path(original_name or "").suffix.lower()
+    if extension not in IMAGE_EXTENSIONS:
+        extension = ".jpg"
+    return f"{prefix}{uuid.uuid4().hex}{extension}"
+
+
+def thumbnail_path_for(path: str) -> str:
+    """Thumbnail location for an uploaded image, e.g. upload/photos/a.png -> upload/thumbnails/photos/a.jpg."""
+    relative = Path(path).relative_to(UPLOAD_ROOT)
+    return str(Path(THUMBNAILS_DIR) / relative.with_suffix(".jpg"))
+
+
+def create_thumbnail(path: str) -> Optional[str]:
+    """Write a small JPEG thumbnail for list views. Returns its path or None."""
+    import cv2  # loaded on first upload, not at startup
+
+    # Reduced decoding is much faster than decoding the full photo and resizing
+    image = cv2.imread(path, cv2.IMREAD_REDUCED_COLOR_4)
+    if image is None:
+        return None
+
+    height, width = image.shape[:2]
+    target_width = settings.UPLOAD_THUMBNAIL_WIDTH
+    if width > target_width:
+        image = cv2.resize(image, (target_width, int(height * target_width / width)), interpolation=cv2.INTER_AREA)
+
+    thumbnail_path = thumbnail_path_for(path)
+    os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
+    cv2.imwrite(thumbnail_path, image, [cv2.IMWRITE_JPEG_QUALITY, 75])
+    return thumbnail_path
+
+
+def save_upload(upload_file, directory: str, prefix: str = "", thumbnail: bool = False) -> str:
+    """
+    Store an uploaded image under a generated name and return its path.
+    Optionally creates the list-view thumbnail right away.
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = f"{directory}/{safe_filename(upload_file.filename, prefix)}"
+    with open(path, "wb") as f:
+        shutil.copyfileobj(upload_file.file, f)
+
+    if thumbnail:
+        create_thumbnail(path)
+    return path
+
+
+def save_uploads(upload_files, directory: str, prefix: str = "") -> List[str]:
+    """save_upload for a stack of files (one threadpool call for the whole batch)."""
+    return [save_upload(upload_file, directory, prefix) for upload_file in upload_files]
+
+
+def original_path_for(path: str) -> Path:
+    """Where the full-quality original of an uploaded sheet is kept after compaction."""
+    return Path(ORIGINALS_DIR) / Path(path).relative_to(UPLOAD_ROOT)
+
+
+def is_compacted(path: str) -> bool:
+    return original_path_for(path).exists()
+
+
+def compact_student_sheet(path: str) -> str:
+    """
+    Re-encode a graded student sheet as a grayscale JPEG at template resolution.
+
+    The original is moved under upload/originals and kept for
+    UPLOAD_ORIGINALS_RETENTION_DAYS. JPEG files keep their path so stored
+    references stay valid; other formats get a .jpg path which is returned.
+    Sheets that already have a kept original are left as they are.
+    """
+    if is_compacted(path):
+        return path
+
+    import cv2
+    import numpy as np
+
+    image = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+    if image is None:
+        return path
+
+    height, width = image.shape[:2]
+    scale = min(TEMPLATE_WIDTH / width, TEMPLATE_HEIGHT / height, 1.0)
+    if scale < 1.0:
+        image = cv2.resize(image, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+
+    success, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, settings.UPLOAD_COMPACT_JPEG_QUALITY])
+    if not success:
+        return path
+
+    original_path = original_path_for(path)
+    os.makedirs(original_path.parent, exist_ok=True)
+    shutil.move(path, original_path)
+    # Retention is counted from the moment the sheet was compacted
+    os.utime(original_path, None)
+
+    compact_path = path if Path(path).suffix.lower() in (".jpg", ".jpeg") else str(Path(path).with_suffix(".jpg"))
+    with open(compact_path, "wb") as f:
+        f.write(np.asarray(buffer).tobytes())
+    return compact_path
+
+
+def purge_expired_originals(retention_days: Optional[int] = None) -> int:
+    """Delete kept originals older than the retention period. Returns the number of removed files."""
+    if retention_days is None:
+        retention_days = settings.UPLOAD_ORIGINALS_RETENTION_DAYS
+
+    cutoff = time.time() - retention_days * 86400
+    removed = 0
+    for root, _, files in os.walk(ORIGINALS_DIR):
+        for name in files:
+            file_path = os.path.join(root, name)
+            try:
+                if os.path.getmtime(file_path) < cutoff:
+                    os.remove(file_path)
+                    removed += 1
+            except OSError:
+                continue
+    return removed
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+import cv2
+import numpy as np
+
+# ArUco marker ids printed on the sheet (see reference_data.json)
+MARKER_POSITIONS = {
+    0: "top-left",
+    1: "top-right",
+    2: "bottom-left",
+    3: "bottom-right",
+}
+
+# Preview frames are downscaled to this width before any processing
+PREVIEW_MAX_WIDTH = 640
+
+# Quality thresholds for preview frames
+MIN_SHARPNESS = 60.0        # Variance of the Laplacian
+MIN_BRIGHTNESS = 60         # Mean gray level
+MAX_BRIGHTNESS = 225
+MIN_SHEET_COVERAGE = 0.30   # Marker quadrilateral area / frame area
+MAX_EDGE_RATIO = 1.15       # Opposite edge length ratio before we call it tilted
+
+# A capture is accepted once all markers were seen and barely moved for this many frames
+STABLE_FRAMES = 5
+STABLE_MAX_SHIFT = 0.01     # Normalized (0-1) marker center displacement
+
+# ArucoDetector instances are not thread-safe, keep one per worker thread
+_thread_state = threading.local()
+
+
+def get_aruco_detector():
+    """Return a cached ArUco detector for the current thread."""
+    detector = getattr(_thread_state, "detector", None)
+    if detector is None:
+        aruco_dict = cv2.aruco.getPredefinedDictionary(cv2.aruco.DICT_4X4_50)
+        parameters = cv2.aruco.DetectorParameters()
+        detector = cv2.aruco.ArucoDetector(aruco_dict, parameters)
+        _thread_state.detector = detector
+    return detector
+
+
+def decode_preview_frame(data: bytes) -> Optional[np.ndarray]:
+    """Decode an encoded preview frame straight to a small grayscale image."""
+    if not data:
+        return None
+
+    gray = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        return None
+
+    height, width = gray.shape[:2]
+    if width > PREVIEW_MAX_WIDTH:
+        scale = PREVIEW_MAX_WIDTH / width
+        gray = cv2.resize(gray, (PREVIEW_MAX_WIDTH, int(height * scale)), interpolation=cv2.INTER_AREA)
+
+    return gray
+
+
+def _direction_hints(missing: List[int]) -> List[str]:
+    """Turn the set of missing markers into camera movement hints."""
+    if len(missing) >= 3:
+        return ["Move the camera back so the whole sheet is in frame"]
+
+    positions = [MARKER_POSITIONS[marker_id] for marker_id in missing]
+    hints = [f"The {position} marker is not visible" for position in positions]
+
+    if all(position.startswith("top") for position in positions):
+        hints.append("Move the camera up")
+    elif all(position.startswith("bottom") for position in positions):
+        hints.append("Move the camera down")
+    if all(position.endswith("left") for position in positions):
+        hints.append("Move the camera left")
+    elif all(position.endswith("right") for position in positions):
+        hints.append("Move the camera right")
+
+    return hints
+
+
+def _edge_length(a, b) -> float:
+    return float(np.hypot(a[0] - b[0], a[1] - b[1]))
+
+
+def analyze_frame(data: bytes) -> Dict:
+    """
+    Run the fast marker-detection and quality checks on one preview frame.
+
+    Only grayscale decoding, ArUco detection and a handful of image statistics
+    are computed, so a 640px frame is analyzed in a few milliseconds.
+
+    Returns:
+        Dict with detected marker ids, missing marker positions, quality
+        metrics, user-facing alignment hints and a `ready` flag.
+    """
+    gray = decode_preview_frame(data)
+    if gray is None:
+        return {
+            'ready': False,
+            'error': 'Could not decode frame',
+            'markers_found': [],
+            'missing_markers': list(MARKER_POSITIONS.values()),
+            'hints': ['Frame could not be decoded'],
+        }
+
+    height, width = gray.shape[:2]
+
+    corners, ids, _ = get_aruco_detector().detectMarkers(gray)
+
+    centers = {}
+    if ids is not None:
+        for marker_corners, marker_id in zip(corners, ids):
+            marker_id = int(marker_id[0])
+            if marker_id not in MARKER_POSITIONS:
+                continue
+            center = marker_corners[0].mean(axis=0)
+            centers[marker_id] = [float(center[0]) / width, float(center[1]) / height]
+
+    missing = [marker_id for marker_id in MARKER_POSITIONS if marker_id not in centers]
+
+    brightness = float(gray.mean())
+    sharpness = float(cv2.Laplacian(gray, cv2.CV_64F).var())
+
+    hints = []
+    if missing:
+        hints.extend(_direction_hints(missing))
+
+    coverage = None
+    if not missing:
+        tl, tr, bl, br = (centers[0], centers[1], centers[2], centers[3])
+        quad = np.array([tl, tr, br, bl], dtype=np.float32)
+        coverage = float(cv2.contourArea(quad))
+        if coverage < MIN_SHEET_COVERAGE:
+            hints.append("Move the camera closer to the sheet")
+
+        top, bottom = _edge_length(tl, tr), _edge_length(bl, br)
+        left, right = _edge_length(tl, bl), _edge_length(tr, br)
+        if (max(top, bottom) / max(min(top, bottom), 1e-6) > MAX_EDGE_RATIO or
+                max(left, right) / max(min(left, right), 1e-6) > MAX_EDGE_RATIO):
+            hints.append("Hold the phone parallel to the sheet")
+
+    if brightness < MIN_BRIGHTNESS:
+        hints.append("Too dark - add more light")
+    elif brightness > MAX_BRIGHTNESS:
+        hints.append("Too bright - avoid glare on the sheet")
+
+    if sharpness < MIN_SHARPNESS:
+        hints.append("Image is blurry - hold the camera steady")
+
+    return {
+        'ready': not hints,
+        'markers_found': sorted(centers.keys()),
+        'missing_markers': [MARKER_POSITIONS[marker_id] for marker_id in missing],
+        'marker_centers': {str(marker_id): center for marker_id, center in centers.items()},
+        'quality': {
+            'brightness': round(brightness, 1),
+            'sharpness': round(sharpness, 1),
+            'coverage': round(coverage, 3) if coverage is not None else None,
+            'frame_width': width,
+            'frame_height': height,
+        },
+        'hints': hints,
+    }
+
+
+class MarkerStabilityTracker:
+    """
+    Tracks marker positions across consecutive preview frames of one connection.
+    The sheet is considered stable once every marker has been visible and
+    nearly stationary for `STABLE_FRAMES` frames in a row.
+    """
+
+    def __init__(self, window: int = STABLE_FRAMES, max_shift: float = STABLE_MAX_SHIFT):
+        self.window = window
+        self.max_shift = max_shift
+        self.history = deque(maxlen=window)
+
+    def reset(self):
+        self.history.clear()
+
+    def update(self, analysis: Dict) -> bool:
+        if not analysis.get('ready'):
+            self.reset()
+            return False
+
+        self.history.append(analysis['marker_centers'])
+        return self.is_stable
+
+    @property
+    def is_stable(self) -> bool:
+        if len(self.history) < self.window:
+            return False
+
+        first = self.history[0]
+        for frame in list(self.history)[1:]:
+            for marker_id, (x, y) in frame.items():
+                x0, y0 = first[marker_id]
+                if abs(x - x0) > self.max_shift or abs(y - y0) > self.max_shift:
+                    return False
+        return True
@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.database import student_collection
+from app.routes.archive import archive_unpaid_students
+from app.utils.device_outbox import deliver_pending
+from app.utils.image_storage import purge_expired_originals
+from app.utils.scheduler import scheduler
+
+
+async def refresh_subscription_status():
+    """
+    Set is_subscription from the current month's monthsale entry.
+    Two server-side update_many calls; only documents whose flag changes are written.
+    """
+    current_month = datetime.utcnow().strftime("%Y-%m")
+    paid_field = f"subscription.monthsales.{current_month}"
+
+    subscribed = await student_collection.update_many(
+        {paid_field: {"$ne": None}, "is_subscription": {"$ne": True}},
+        {"$set": {"is_subscription": True}}
+    )
+    unsubscribed = await student_collection.update_many(
+        {paid_field: None, "is_subscription": {"$ne": False}},
+        {"$set": {"is_subscription": False}}
+    )
+
+    return {
+        "month": current_month,
+        "subscribed": subscribed.modified_count,
+        "unsubscribed": unsubscribed.modified_count
+    }
+
+
+async def purge_uploads():
+    removed = await run_in_threadpool(purge_expired_originals)
+    return {"removed_originals": removed}
+
+
+def register_maintenance_jobs():
+    interval = timedelta(minutes=settings.MAINTENANCE_INTERVAL_MINUTES)
+    scheduler.register("refresh_subscription_status", refresh_subscription_status, interval)
+    scheduler.register("archive_unpaid_students", archive_unpaid_students, interval)
+    scheduler.register("purge_expired_uploads", purge_uploads, timedelta(hours=24))
+    scheduler.register("deliver_device_outbox", deliver_pending, timedelta(seconds=settings.DEVICE_OUTBOX_INTERVAL_SECONDS))
@@ -0,0 +1,138 @@
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Dict
+
+from pymongo import monitoring
+
+
+def _percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+
+class CommandStats(monitoring.CommandListener):
+    """Per-command counts, failures and latency (recent samples for percentiles)."""
+
+    def __init__(self, samples: int = 500):
+        self.samples = samples
+        self._lock = threading.Lock()
+        self._commands: Dict[str, dict] = defaultdict(self._new_entry)
+
+    def _new_entry(self) -> dict:
+        return {"count": 0, "failures": 0, "total_ms": 0.0, "max_ms": 0.0, "recent": deque(maxlen=self.samples)}
+
+    def _record(self, event, failed: bool):
+        duration_ms = event.duration_micros / 1000
+        with self._lock:
+            entry = self._commands[event.command_name]
+            entry["count"] += 1
+            entry["failures"] += failed
+            entry["total_ms"] += duration_ms
+            entry["max_ms"] = max(entry["max_ms"], duration_ms)
+            entry["recent"].append(duration_ms)
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._record(event, failed=False)
+
+    def failed(self, event):
+        self._record(event, failed=True)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                name: {
+                    "count": entry["count"],
+                    "failures": entry["failures"],
+                    "avg_ms": round(entry["total_ms"] / entry["count"], 2) if entry["count"] else 0.0,
+                    "p50_ms": round(_percentile(entry["recent"], 0.5), 2),
+                    "p95_ms": round(_percentile(entry["recent"], 0.95), 2),
+                    "max_ms": round(entry["max_ms"], 2),
+                }
+                for name, entry in sorted(self._commands.items())
+            }
+
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """Connection pool counters across all servers of the client."""
+
+    COUNTERS = ("pools_created", "pools_cleared", "connections_created", "connections_closed",
+                "checkouts", "checkout_failures", "checked_out")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(self.COUNTERS, 0)
+        self._max_checked_out = 0
+
+    def _add(self, name: str, value: int = 1):
+        with self._lock:
+            self._counters[name] += value
+            self._max_checked_out = max(self._max_checked_out, self._counters["checked_out"])
+
+    def pool_created(self, event):
+        self._add("pools_created")
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._add("pools_cleared")
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._add("connections_created")
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._add("connections_closed")
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self._add("checkout_failures")
+
+    def connection_checked_out(self, event):
+        self._add("checkouts")
+        self._add("checked_out")
+
+    def connection_checked_in(self, event):
+        self._add("checked_out", -1)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                **self._counters,
+                "open_connections": self._counters["connections_created"] - self._counters["connections_closed"],
+                "max_checked_out": self._max_checked_out,
+            }
+
+
+class MongoStats:
+    """Listeners registered on the shared client; exposed through /maintenance/mongo-stats."""
+
+    def __init__(self):
+        self.commands = CommandStats()
+        self.pool = PoolStats()
+        self.started_at = time.time()
+
+    @property
+    def listeners(self) -> list:
+        return [self.commands, self.pool]
+
+    def snapshot(self) -> dict:
+        return {
+            "uptime_seconds": round(time.time() - self.started_at),
+            "pool": self.pool.snapshot(),
+            "commands": self.commands.snapshot(),
+        }
+
+
+mongo_stats = MongoStats()
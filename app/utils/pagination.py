@@ -0,0 +1,142 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+List endpoints keep their page/limit mode. Passing `after` switches to cursor
+mode: documents are returned in `_id` order starting after the token
+(`after=` with an empty value starts at the beginning) and the response
+carries `next_cursor` for the following page. Totals in cursor mode come
+from `count_cache`, so no page pays a full count. `paginate` runs either mode
+and returns the page with its metadata.
+"""
+
+import asyncio
+import base64
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from fastapi import HTTPException
+
+
+def encode_cursor(value: Any) -> str:
+    """Opaque token for the `_id` of the last document of a page."""
+    if isinstance(value, ObjectId):
+        payload = {"o": str(value)}
+    else:
+        payload = {"i": value}
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Any:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if "o" in payload:
+            return ObjectId(payload["o"])
+        return int(payload["i"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def keyset_filter(after: str) -> dict:
+    """Filter selecting the documents after the token; an empty token selects from the start."""
+    if not after:
+        return {}
+    return {"_id": {"$gt": decode_cursor(after)}}
+
+
+def split_page(items: List, limit: int, key: Callable = lambda doc: doc["_id"]) -> Tuple[List, Optional[str]]:
+    """
+    Split `limit + 1` fetched items into the page and the token for the next one
+    (None on the last page). `key` returns the `_id` of an item.
+    """
+    if len(items) <= limit:
+        return items, None
+    page = items[:limit]
+    return page, encode_cursor(key(page[-1]))
+
+
+class CountCache:
+    """
+    Per-collection document counts for cursor mode.
+
+    The first request answers with `estimated_document_count` (collection
+    metadata, no scan). Exact counts are refreshed in the background once the
+    cached value is older than `ttl_seconds`; requests never wait for them.
+    """
+
+    def __init__(self, ttl_seconds: int = 60):
+        self.ttl_seconds = ttl_seconds
+        self._counts: Dict[str, tuple] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+
+    async def _refresh(self, collection):
+        try:
+            total = await collection.count_documents({})
+            self._counts[collection.name] = (time.monotonic(), total)
+        except Exception as e:
+            print(f"⚠️ Count refresh for {collection.name} failed: {e}")
+        finally:
+            self._refreshing.pop(collection.name, None)
+
+    def _schedule_refresh(self, collection):
+        if collection.name not in self._refreshing:
+            self._refreshing[collection.name] = asyncio.create_task(self._refresh(collection))
+
+    async def count(self, collection) -> int:
+        """Total documents in a Motor collection, possibly slightly stale."""
+        cached = self._counts.get(collection.name)
+        if cached is None:
+            total = await collection.estimated_document_count()
+            self._counts[collection.name] = (0.0, total)  # refresh right away
+            self._schedule_refresh(collection)
+            return total
+
+        fetched_at, total = cached
+        if time.monotonic() - fetched_at >= self.ttl_seconds:
+            self._schedule_refresh(collection)
+        return total
+
+
+count_cache = CountCache()
+
+
+async def paginate(source, page: int, limit: int, after: Optional[str], projection: Optional[dict] = None) -> Tuple[List, dict]:
+    """
+    One page of a Motor collection (raw dicts) or a Beanie document class
+    (documents), in cursor mode when `after` is given, otherwise page/limit.
+    Returns the items and the pagination fields of the list responses
+    (total, page, limit, total_pages, has_next, has_prev, next_cursor).
+    """
+    is_model = hasattr(source, "get_motor_collection")
+    collection = source.get_motor_collection() if is_model else source
+
+    def find(query: dict):
+        return source.find(query) if is_model else source.find(query, projection)
+
+    async def to_list(cursor) -> List:
+        return await (cursor.to_list() if is_model else cursor.to_list(length=None))
+
+    next_cursor = None
+    if after is not None:
+        # Cursor mode: keyset over _id, cached total
+        total = await count_cache.count(collection)
+        items = await to_list(find(keyset_filter(after)).sort([("_id", 1)]).limit(limit + 1))
+        items, next_cursor = split_page(items, limit, key=(lambda doc: doc.id) if is_model else (lambda doc: doc["_id"]))
+        has_prev = bool(after)
+    else:
+        total = await collection.count_documents({})
+        items = await to_list(find({}).skip((page - 1) * limit).limit(limit))
+        has_prev = page > 1
+
+    total_pages = (total + limit - 1) // limit  # Ceiling division
+    return items, {
+        "total": total,
+        "page": page,
+        "limit": limit,
+        "total_pages": total_pages,
+        "has_next": next_cursor is not None if after is not None else page < total_pages,
+        "has_prev": has_prev,
+        "next_cursor": next_cursor,
+    }
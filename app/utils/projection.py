@@ -0,0 +1,48 @@
+from typing import Dict, Iterable, List, Optional
+
+from fastapi import HTTPException
+
+from app.database import student_collection
+from app.schemas.student import StudentOut
+
+# Stored fields StudentOut is built from; `id` comes from `_id` and `group` from the group index.
+# Leaves out the heavy exams, attendance, subscription and fingerprint_template fields.
+STUDENT_OUT_PROJECTION = {name: 1 for name in StudentOut.model_fields if name not in ("id", "group")}
+
+STUDENT_NAME_PROJECTION = {"first_name": 1, "last_name": 1}
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """
+    Validate a `fields=a,b,c` sparse fieldset against StudentOut.
+    Returns None when no fieldset was requested; `id` is always included.
+    """
+    if fields is None:
+        return None
+
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in StudentOut.model_fields]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+
+    return ["id"] + [name for name in dict.fromkeys(requested) if name != "id"]
+
+
+def student_projection(fields: Optional[List[str]]) -> dict:
+    """Mongo projection for a parsed fieldset (None -> everything StudentOut needs)."""
+    if fields is None:
+        return STUDENT_OUT_PROJECTION
+    return {name: 1 for name in fields if name in STUDENT_OUT_PROJECTION} or {"_id": 1}
+
+
+def sparse_student(student: dict, fields: List[str]) -> dict:
+    """Only the requested fields of an already converted student (id set, defaults applied)."""
+    return {name: student.get(name) for name in fields}
+
+
+async def student_name_map(student_ids: Iterable) -> Dict:
+    """{student ObjectId: "first last"} with one projected `$in` query."""
+    names = {}
+    async for student in student_collection.find({"_id": {"$in": list(student_ids)}}, STUDENT_NAME_PROJECTION):
+        names[student["_id"]] = f"{student.get('first_name', '')} {student.get('last_name', '')}"
+    return names
@@ -0,0 +1,96 @@
+import hashlib
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from bson import ObjectId
+from bson.decimal128 import Decimal128
+from fastapi.encoders import decimal_encoder, jsonable_encoder
+from fastapi.responses import ORJSONResponse as BaseORJSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+
+
+def _default(obj: Any) -> Any:
+    """Types orjson does not serialize natively (datetime, date, UUID and enums it does)."""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, Decimal128):
+        obj = obj.to_decimal()
+    if isinstance(obj, Decimal):
+        return decimal_encoder(obj)
+    return jsonable_encoder(obj, custom_encoder={ObjectId: str, Decimal128: lambda value: decimal_encoder(value.to_decimal())})
+
+
+class ORJSONResponse(BaseORJSONResponse):
+    """
+    Default response class: orjson rendering that also accepts raw Mongo
+    documents (ObjectId, Decimal128, Decimal), so routes can return them
+    without walking them first.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _opaque_tags(header: str):
+    return {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+class ETagMiddleware:
+    """
+    Weak ETag on every successful GET JSON response, and a bodyless 304 when
+    the client's If-None-Match already names it.
+
+    Sits inside the compression middleware, so the tag is computed from the
+    uncompressed body and is the same for every encoding.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        start_message = None
+        passthrough = False
+        chunks = []
+
+        async def send_with_etag(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if (message["status"] != 200 or "etag" in headers
+                        or not headers.get("content-type", "").startswith("application/json")):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+            headers = MutableHeaders(scope=start_message)
+            headers["etag"] = etag
+
+            if if_none_match and (if_none_match.strip() == "*" or etag[2:] in _opaque_tags(if_none_match)):
+                del headers["content-length"]
+                del headers["content-type"]
+                await send({**start_message, "status": 304})
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_with_etag)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+import atexit
+import os
+import queue
+import threading
+from dotenv import load_dotenv
+
+load_dotenv()
+
+RESULT_WRITER_QUEUE_SIZE = int(os.getenv('RESULT_WRITER_QUEUE_SIZE', 64))
+
+
+class ResultWriter:
+    """
+    Background writer for bubble sheet result artifacts (JSON, CSV, images).
+
+    Jobs are plain callables executed in order by a single daemon thread, so
+    request handlers never wait on disk I/O. The queue is bounded: when it is
+    full the job is dropped with a warning instead of blocking the request.
+    """
+
+    def __init__(self, max_queue_size: int = RESULT_WRITER_QUEUE_SIZE):
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="result-writer", daemon=True)
+                self._thread.start()
+
+    def submit(self, job, *args, **kwargs) -> bool:
+        """Queue a write job. Returns False if the queue is full and the job was dropped."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((job, args, kwargs))
+            return True
+        except queue.Full:
+            print(f"⚠️ Result writer queue is full, dropping {getattr(job, '__name__', 'job')}")
+            return False
+
+    def _run(self):
+        while True:
+            job, args, kwargs = self._queue.get()
+            try:
+                job(*args, **kwargs)
+            except Exception as e:
+                print(f"❌ Result writer job failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Block until every queued job has been written."""
+        if self._thread is not None:
+            self._queue.join()
+
+
+result_writer = ResultWriter()
+atexit.register(result_writer.flush)
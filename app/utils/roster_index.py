@@ -0,0 +1,58 @@
+import time
+from typing import Dict, Iterable, List
+
+from app.database import student_collection
+
+
+class RosterIndex:
+    """
+    In-memory index of numeric student_id -> student documents.
+
+    Used by batch grading to map the IDs decoded from bubble sheets to students
+    without one round trip per sheet. Misses are resolved together with a single
+    `$in` query. Entries are dropped whenever a student is updated, deleted,
+    archived or blacklisted and expire after `ttl_seconds` so changes made by
+    other workers are picked up.
+    """
+
+    PROJECTION = {"_id": 1, "student_id": 1, "first_name": 1, "last_name": 1, "level": 1}
+
+    def __init__(self, ttl_seconds: int = 600):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[int, tuple] = {}
+
+    async def resolve(self, student_ids: Iterable[int]) -> Dict[int, List[dict]]:
+        """
+        Return {student_id: [matching students]} for the given ids.
+        More than one match means the ID is ambiguous; unknown ids are omitted.
+        """
+        now = time.monotonic()
+        resolved = {}
+        missing = []
+
+        for student_id in set(student_ids):
+            entry = self._entries.get(student_id)
+            if entry and now - entry[0] < self.ttl_seconds:
+                resolved[student_id] = entry[1]
+            else:
+                missing.append(student_id)
+
+        if missing:
+            fetched: Dict[int, List[dict]] = {}
+            async for student in student_collection.find({"student_id": {"$in": missing}}, self.PROJECTION):
+                fetched.setdefault(student["student_id"], []).append(student)
+
+            for student_id, students in fetched.items():
+                self._entries[student_id] = (now, students)
+                resolved[student_id] = students
+
+        return resolved
+
+    def forget(self, student_id: int):
+        self._entries.pop(student_id, None)
+
+    def clear(self):
+        self._entries.clear()
+
+
+roster_index = RosterIndex()
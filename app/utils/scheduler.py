@@ -0,0 +1,122 @@
+import asyncio
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.models.maintenance_job import MaintenanceJob
+
+
+class ScheduledJob:
+    def __init__(self, name: str, func: Callable[[], Awaitable], interval: timedelta, lock_ttl: timedelta):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.lock_ttl = lock_ttl
+
+
+class MaintenanceScheduler:
+    """
+    Small in-process scheduler for maintenance jobs.
+
+    Each job is guarded by a lock document in the `maintenance_jobs` collection,
+    so when several workers run the scheduler a job runs once per interval
+    across all of them. The same document records the last run (start, finish,
+    status, error, duration and result).
+    """
+
+    def __init__(self, tick_seconds: int = 30):
+        self.tick_seconds = tick_seconds
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, name: str, func: Callable[[], Awaitable], interval: timedelta,
+                 lock_ttl: timedelta = timedelta(minutes=10)):
+        self.jobs[name] = ScheduledJob(name, func, interval, lock_ttl)
+
+    async def _acquire(self, job: ScheduledJob, force: bool) -> bool:
+        now = datetime.utcnow()
+        conditions = [{"$or": [{"locked_until": None}, {"locked_until": {"$lte": now}}]}]
+        if not force:
+            conditions.append({"$or": [{"last_started_at": None}, {"last_started_at": {"$lte": now - job.interval}}]})
+
+        try:
+            acquired = await MaintenanceJob.get_motor_collection().find_one_and_update(
+                {"name": job.name, "$and": conditions},
+                {
+                    "$set": {
+                        "locked_until": now + job.lock_ttl,
+                        "locked_by": self.worker_id,
+                        "last_started_at": now,
+                    },
+                    "$setOnInsert": {"runs": 0},
+                },
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            # The job document exists but is locked or not due yet
+            return False
+        return acquired is not None
+
+    async def _release(self, job: ScheduledJob, status: str, started: float, error: str = None, result=None):
+        await MaintenanceJob.get_motor_collection().update_one(
+            {"name": job.name, "locked_by": self.worker_id},
+            {
+                "$set": {
+                    "locked_until": None,
+                    "last_finished_at": datetime.utcnow(),
+                    "last_status": status,
+                    "last_error": error,
+                    "last_duration_ms": round((time.perf_counter() - started) * 1000, 1),
+                    "last_result": result if isinstance(result, dict) else None,
+                },
+                "$inc": {"runs": 1},
+            },
+        )
+
+    async def run_job(self, name: str, force: bool = False) -> bool:
+        """Run a job if it is due (or `force`) and not locked. Returns True if it ran."""
+        job = self.jobs[name]
+        if not await self._acquire(job, force):
+            return False
+
+        started = time.perf_counter()
+        try:
+            result = await job.func()
+        except Exception as e:
+            print(f"❌ Maintenance job {name} failed: {e}")
+            await self._release(job, "failed", started, error=str(e))
+        else:
+            await self._release(job, "success", started, result=result)
+        return True
+
+    async def _loop(self):
+        while True:
+            for name in list(self.jobs):
+                try:
+                    await self.run_job(name)
+                except Exception as e:
+                    print(f"❌ Maintenance scheduler error for {name}: {e}")
+            await asyncio.sleep(self.tick_seconds)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+scheduler = MaintenanceScheduler()
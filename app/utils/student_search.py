@@ -0,0 +1,76 @@
+import asyncio
+import re
+from typing import List
+
+from app.database import archived_student_collection, student_collection
+from app.utils.text_normalization import normalize_name, normalize_phone
+
+# Stored fields search_terms is computed from
+SEARCH_SOURCE_FIELDS = ("student_id", "first_name", "last_name", "phone_number", "guardian_number")
+
+SEARCH_RESULT_PROJECTION = {
+    "student_id": 1, "first_name": 1, "last_name": 1,
+    "phone_number": 1, "guardian_number": 1, "level": 1,
+}
+
+# Longer query words are cut to this length (the stored prefixes stop here)
+MAX_PREFIX_LENGTH = 15
+
+
+def _prefixes(token: str) -> List[str]:
+    return [token[:length] for length in range(1, min(len(token), MAX_PREFIX_LENGTH) + 1)]
+
+
+def search_terms(student: dict) -> List[str]:
+    """
+    Edge n-grams stored in `search_terms`: every prefix of each normalized
+    name word, of the student_id and of the digits-only phone and guardian numbers.
+    """
+    words = normalize_name(f"{student.get('first_name') or ''} {student.get('last_name') or ''}").split()
+    numbers = [str(student.get("student_id") or ""),
+               normalize_phone(student.get("phone_number")),
+               normalize_phone(student.get("guardian_number"))]
+
+    terms = set()
+    for token in words + numbers:
+        terms.update(_prefixes(token))
+    return sorted(terms)
+
+
+def query_terms(query: str) -> List[str]:
+    """Normalized query words, longest first (the first one drives the index scan)."""
+    terms = set()
+    for word in normalize_name(query).split():
+        if re.search(r"[0-9٠-٩۰-۹]", word):
+            word = normalize_phone(word)
+        if word:
+            terms.add(word[:MAX_PREFIX_LENGTH])
+    return sorted(terms, key=len, reverse=True)
+
+
+async def search_students(query: str, limit: int = 20, include_archived: bool = True) -> List[dict]:
+    """
+    Students whose name words, student_id, phone or guardian number start with
+    every word of `query`. Active students first, then archived ones.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return []
+
+    criteria = {"search_terms": {"$all": terms}}
+    collections = [(student_collection, False)]
+    if include_archived:
+        collections.append((archived_student_collection, True))
+
+    batches = await asyncio.gather(*[
+        collection.find(criteria, SEARCH_RESULT_PROJECTION).limit(limit).to_list(length=limit)
+        for collection, _ in collections
+    ])
+
+    results = []
+    for (_, archived), students in zip(collections, batches):
+        for student in sorted(students, key=lambda s: s.get("student_id", 0)):
+            student["id"] = str(student.pop("_id"))
+            student["archived"] = archived
+            results.append(student)
+    return results[:limit]
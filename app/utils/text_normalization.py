@@ -0,0 +1,39 @@
+import re
+import unicodedata
+from typing import Optional
+
+# Arabic-Indic and Eastern Arabic-Indic digits -> ASCII
+_DIGITS = str.maketrans("٠١٢٣٤٥٦٧٨٩۰۱۲۳۴۵۶۷۸۹", "01234567890123456789")
+
+# Letter variants that are commonly typed interchangeably in names
+_ARABIC_LETTERS = str.maketrans({
+    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
+    "ى": "ي", "ئ": "ي",
+    "ة": "ه",
+    "ؤ": "و",
+    "ـ": None,  # tatweel
+})
+
+# Harakat, tanween, shadda, sukun and superscript alef
+_ARABIC_MARKS = re.compile("[\u064B-\u065F\u0670]")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_phone(phone: Optional[str]) -> str:
+    """
+    Digits-only form of an Egyptian phone number so that "+20 100 123 4567",
+    "00201001234567" and "٠١٠٠١٢٣٤٥٦٧" all compare equal to "01001234567".
+    """
+    digits = re.sub(r"\D", "", str(phone or "").translate(_DIGITS))
+    if digits.startswith("0020"):
+        digits = "0" + digits[4:]
+    elif digits.startswith("20") and len(digits) == 12:
+        digits = "0" + digits[2:]
+    return digits
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """Case-, spacing- and diacritic-insensitive form of an Arabic or English name."""
+    text = unicodedata.normalize("NFKC", str(name or ""))
+    text = _ARABIC_MARKS.sub("", text).translate(_ARABIC_LETTERS)
+    return _SPACES.sub(" ", text).strip().casefold()
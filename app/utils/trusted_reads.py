@@ -0,0 +1,45 @@
+"""
+Fast read path for documents this API wrote itself.
+
+Request bodies are validated by the schemas when they come in, so data read
+back from Mongo does not need a second round of Pydantic validation (Beanie
+hydration, then the response model). Report and list endpoints that touch
+many documents read raw projected dicts through these helpers instead.
+"""
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Type
+
+from bson.decimal128 import Decimal128
+from pydantic import BaseModel
+
+
+async def raw_find(model, query: dict, projection: Optional[dict] = None) -> List[dict]:
+    """Documents of a Beanie model's collection as plain dicts (no hydration)."""
+    return await model.get_motor_collection().find(query, projection).to_list(length=None)
+
+
+def as_decimal(value: Any) -> Decimal:
+    """Stored price (Decimal128, float or int) as a Decimal."""
+    if isinstance(value, Decimal128):
+        return value.to_decimal()
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
+def as_float(value: Any) -> float:
+    return float(as_decimal(value)) if isinstance(value, Decimal128) else float(value)
+
+
+def as_date(value: Any) -> Any:
+    """`date` fields come back from Mongo as midnight datetimes."""
+    return value.date() if isinstance(value, datetime) else value
+
+
+def trusted_dict(schema: Type[BaseModel], document: dict) -> dict:
+    """`schema`'s fields taken from a trusted document, defaults filled in, without validation."""
+    return {
+        name: document[name] if name in document else (None if field.is_required() else field.get_default(call_default_factory=True))
+        for name, field in schema.model_fields.items()
+    }
@@ -1,5 +1,5 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from motor.motor_asyncio import AsyncIOMotorClient
 from beanie import init_beanie
 from app.routes import assistant
 from app.routes import student
@@ -15,6 +15,8 @@ from app.routes import archive_management
 from app.routes import financial_reports
 from app.routes import blacklist
 from app.routes import internal
+from app.routes import bubble
+from app.routes import maintenance
 from app.models.exam import ExamModel
 from app.models.student_document import StudentDocument
 from app.models.student import StudentModel
@@ -26,23 +28,50 @@ from app.models.student_default_price import StudentDefaultPrice
 from app.models.outgoing import Outgoing
 from app.models.archived_student import ArchivedStudentModel
 from app.models.blacklist import BlacklistStudent
+from app.models.grading_review import GradingReview
+from app.models.maintenance_job import MaintenanceJob
+from app.models.exam_result import ExamResult
+from app.models.attendance_event import AttendanceEvent
+from app.models.device_outbox import DeviceOutbox
 from app.config import settings
+from app import database
+from app.utils.image_storage import THUMBNAILS_DIR
+from app.utils.maintenance import register_maintenance_jobs
+from app.utils.scheduler import scheduler
+from app.utils.attendance_cache import attendance_cache
+from app.utils.blacklist_index import blacklist_index
+from app.utils.attendance_buffer import attendance_buffer
+from app.utils.responses import ORJSONResponse, ETagMiddleware
+from app.utils.host_client import close_host_client
+import asyncio
 from fastapi.staticfiles import StaticFiles
 import os
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+try:
+    # Optional: brotli for clients that accept it, gzip for the rest
+    from brotli_asgi import BrotliMiddleware
+except ImportError:
+    BrotliMiddleware = None
 
 
 
+# Cache warm-ups started at startup (kept referenced until they finish, cancelled on shutdown)
+_warmup_tasks = set()
+
+
+def start_warmup(coro):
+    task = asyncio.create_task(coro)
+    _warmup_tasks.add(task)
+    task.add_done_callback(_warmup_tasks.discard)
 
-app = FastAPI()
 
-@app.on_event("startup")
 async def app_init():
-    client = AsyncIOMotorClient(settings.MONGO_URI)  
-    db = client[settings.DATABASE_NAME]             
+    # Beanie and the raw collections share the client from app/database.py
+    await database.warm_up()
 
     await init_beanie(
-        database=db,
+        database=database.db,
         document_models=[
             ExamModel,
             StudentDocument,
@@ -55,9 +84,46 @@ async def app_init():
             Outgoing,
             ArchivedStudentModel,
             BlacklistStudent,
+            GradingReview,
+            MaintenanceJob,
+            ExamResult,
+            AttendanceEvent,
+            DeviceOutbox,
         ]
     )
 
+    # Subscription refresh, auto-archiving and upload purging run in the background
+    register_maintenance_jobs()
+    scheduler.start()
+
+    # Fill the attendance cache before the first class starts punching, without delaying startup
+    start_warmup(attendance_cache.warm())
+    start_warmup(blacklist_index.warm())
+
+    # Replays punches a crash left in the local log
+    if settings.ATTENDANCE_WRITE_BEHIND:
+        await attendance_buffer.start()
+
+
+async def app_shutdown():
+    for task in list(_warmup_tasks):
+        task.cancel()
+    await asyncio.gather(*list(_warmup_tasks), return_exceptions=True)
+    await scheduler.stop()
+    await attendance_buffer.stop()
+    await close_host_client()
+    database.close()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await app_init()
+    yield
+    await app_shutdown()
+
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
+
 
 app.mount(
     "/solutions",
@@ -71,6 +137,13 @@ app.mount(
     name="student_solutions"
 )
 
+os.makedirs(os.path.join(os.path.dirname(__file__), THUMBNAILS_DIR), exist_ok=True)
+app.mount(
+    "/thumbnails",
+    StaticFiles(directory=os.path.join(os.path.dirname(__file__), THUMBNAILS_DIR)),
+    name="thumbnails"
+)
+
 
 app.include_router(assistant.router)
 app.include_router(student.router)
@@ -86,6 +159,8 @@ app.include_router(archive_management.router)
 app.include_router(financial_reports.router)
 app.include_router(blacklist.router)
 app.include_router(internal.router)
+app.include_router(bubble.bubbles_router)
+app.include_router(maintenance.router)
 
 
 @app.get("/")
@@ -93,6 +168,13 @@ def root():
     return {"message": "Assistant Auth API Running"}
 
 
+# ETags are computed on the uncompressed body, so ETagMiddleware sits inside compression
+app.add_middleware(ETagMiddleware)
+if BrotliMiddleware is not None:
+    app.add_middleware(BrotliMiddleware, minimum_size=settings.RESPONSE_COMPRESSION_MIN_BYTES, gzip_fallback=True)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=settings.RESPONSE_COMPRESSION_MIN_BYTES)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000"],  
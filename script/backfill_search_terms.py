@@ -0,0 +1,47 @@
+"""
+Compute `search_terms` (the /students/search prefixes) for existing students,
+active and archived, and create the multikey indexes on it. Safe to run more
+than once; students created or updated through the API keep it current.
+
+Run from the project root: python script/backfill_search_terms.py
+"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from beanie import init_beanie
+from pymongo import UpdateOne
+
+from app.database import db, student_collection, archived_student_collection
+from app.models.archived_student import ArchivedStudentModel
+from app.models.student import StudentModel
+from app.utils.student_search import SEARCH_SOURCE_FIELDS, search_terms
+
+BATCH_SIZE = 1000
+
+
+async def backfill(collection) -> int:
+    updated = 0
+    operations = []
+    async for student in collection.find({}, {field: 1 for field in SEARCH_SOURCE_FIELDS}):
+        operations.append(UpdateOne({"_id": student["_id"]}, {"$set": {"search_terms": search_terms(student)}}))
+        if len(operations) >= BATCH_SIZE:
+            updated += (await collection.bulk_write(operations, ordered=False)).modified_count
+            operations = []
+    if operations:
+        updated += (await collection.bulk_write(operations, ordered=False)).modified_count
+    return updated
+
+
+async def main():
+    # Creates the search_terms indexes
+    await init_beanie(database=db, document_models=[StudentModel, ArchivedStudentModel])
+
+    print(f"✅ {await backfill(student_collection)} students updated")
+    print(f"✅ {await backfill(archived_student_collection)} archived students updated")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
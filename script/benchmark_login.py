@@ -0,0 +1,69 @@
+"""
+Event-loop latency while many logins verify passwords at once.
+
+A ticker coroutine wakes every 10 ms and records how late it runs (the
+delay an attendance punch would see). It is measured with no logins, with
+N concurrent logins calling bcrypt inline (the old login handler) and with
+N concurrent logins going through verify_password_async.
+No database is needed.
+
+Run from the project root: python script/benchmark_login.py [concurrent_logins]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.auth import hash_password, verify_password, verify_password_async
+
+TICK_SECONDS = 0.01
+
+
+async def ticker(lateness, stop):
+    while not stop.is_set():
+        expected = time.perf_counter() + TICK_SECONDS
+        await asyncio.sleep(TICK_SECONDS)
+        lateness.append((time.perf_counter() - expected) * 1000)
+
+
+async def blocking_login(hashed):
+    # Old handler: bcrypt inside the coroutine
+    verify_password("secret-password", hashed)
+
+
+async def offloaded_login(hashed):
+    await verify_password_async("secret-password", hashed)
+
+
+async def measure(login, hashed, logins: int):
+    lateness, stop = [], asyncio.Event()
+    ticking = asyncio.create_task(ticker(lateness, stop))
+    await asyncio.sleep(0.1)
+
+    started = time.perf_counter()
+    if login is not None:
+        await asyncio.gather(*[login(hashed) for _ in range(logins)])
+    else:
+        await asyncio.sleep(0.5)
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await ticking
+    return elapsed, statistics.median(lateness), max(lateness)
+
+
+async def main():
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    hashed = hash_password("secret-password")
+
+    for description, login in [("idle", None), ("inline bcrypt", blocking_login), ("thread pool", offloaded_login)]:
+        elapsed, median, worst = await measure(login, hashed, logins)
+        print(f"{description:<14} {logins if login else 0:3d} logins in {elapsed * 1000:7.0f} ms   "
+              f"loop lag median {median:6.1f} ms   max {worst:7.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
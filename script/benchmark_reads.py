@@ -0,0 +1,154 @@
+"""
+Compare validated (Beanie hydration + response models) and trusted (raw
+projected dicts) reads on the heaviest report paths.
+
+Seeds a scratch database (<DATABASE_NAME>_read_bench) with students and a
+year of month sales, book sales and outgoings, then times each path a few
+times and prints the best run. The scratch database is dropped afterwards.
+
+Run from the project root: python script/benchmark_reads.py [students]
+"""
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import orjson
+from beanie import init_beanie
+from bson import ObjectId
+from bson.decimal128 import Decimal128
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.config import settings
+from app.models.booksale import BookSale
+from app.models.monthsale import MonthlySale
+from app.models.outgoing import Outgoing
+from app.models.student import StudentModel
+from app.schemas.student import StudentOut
+from app.utils.projection import STUDENT_OUT_PROJECTION
+from app.utils.responses import ORJSONResponse
+from app.utils.trusted_reads import as_date, as_decimal, raw_find, trusted_dict
+
+RUNS = 5
+START = datetime(2025, 1, 1)
+
+
+def seed_documents(students: int):
+    student_docs = [
+        {
+            "_id": ObjectId(),
+            "student_id": 10000 + i,
+            "uid": 10000 + i,
+            "first_name": f"first{i}",
+            "last_name": f"last{i}",
+            "email": None,
+            "phone_number": f"010{i:08d}",
+            "guardian_number": f"011{i:08d}",
+            "birth_date": datetime(2008, 1, 1),
+            "gender": "male" if i % 2 else "female",
+            "level": i % 3 + 1,
+            "school_name": "school",
+            "is_subscription": True,
+            "created_at": START,
+            "exams": [],
+            "subscription": {},
+        }
+        for i in range(students)
+    ]
+    month_sales, book_sales, outgoings = [], [], []
+    for i, student in enumerate(student_docs):
+        for month in range(12):
+            created_at = START + timedelta(days=30 * month, hours=i % 24)
+            month_sales.append({
+                "_id": len(month_sales) + 1, "student_id": student["_id"], "price": 200.0, "default_price": 200.0,
+                "month": datetime(2025, month + 1, 1), "created_at": created_at,
+            })
+            book_sales.append({
+                "_id": len(book_sales) + 1, "student_id": student["_id"], "name": f"book{month}",
+                "price": Decimal128("150.00"), "default_price": Decimal128("150.00"), "created_at": created_at,
+            })
+    for i in range(len(student_docs)):
+        outgoings.append({"_id": i + 1, "product_name": "paper", "price": 50.0, "created_at": START + timedelta(hours=i)})
+    return student_docs, month_sales, book_sales, outgoings
+
+
+async def best_of(func) -> float:
+    timings = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        await func()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+async def validated_profit_reads():
+    total = Decimal("0")
+    for model in (MonthlySale, BookSale, Outgoing):
+        for document in await model.find_all().to_list():
+            total += Decimal(str(document.price))
+    return total
+
+
+async def trusted_profit_reads():
+    total = Decimal("0")
+    for model in (MonthlySale, BookSale, Outgoing):
+        for document in await raw_find(model, {}, {"price": 1, "created_at": 1}):
+            total += as_decimal(document["price"])
+    return total
+
+
+async def validated_student_page():
+    students = await StudentModel.get_motor_collection().find({}, STUDENT_OUT_PROJECTION).to_list(length=None)
+    result = []
+    for student in students:
+        student["id"] = str(student.pop("_id"))
+        result.append(StudentOut(**student))
+    return orjson.dumps([student.model_dump(mode="json") for student in result])
+
+
+async def trusted_student_page():
+    students = await StudentModel.get_motor_collection().find({}, STUDENT_OUT_PROJECTION).to_list(length=None)
+    result = []
+    for student in students:
+        student["id"] = str(student.pop("_id"))
+        student["birth_date"] = as_date(student.get("birth_date"))
+        result.append(trusted_dict(StudentOut, student))
+    return ORJSONResponse(content=result).body
+
+
+async def main():
+    students = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    client = AsyncIOMotorClient(settings.MONGO_URI)
+    db_name = f"{settings.DATABASE_NAME}_read_bench"
+    await client.drop_database(db_name)
+    db = client[db_name]
+
+    try:
+        await init_beanie(database=db, document_models=[StudentModel, MonthlySale, BookSale, Outgoing])
+        student_docs, month_sales, book_sales, outgoings = seed_documents(students)
+        await db["students"].insert_many(student_docs)
+        await db["monthsales"].insert_many(month_sales)
+        await db["booksales"].insert_many(book_sales)
+        await db["outgoings"].insert_many(outgoings)
+        print(f"Seeded {students} students, {len(month_sales)} month sales, "
+              f"{len(book_sales)} book sales, {len(outgoings)} outgoings")
+
+        cases = [
+            ("profits / monthly summary reads", validated_profit_reads, trusted_profit_reads),
+            (f"student list ({students} rows)", validated_student_page, trusted_student_page),
+        ]
+        for description, validated, trusted in cases:
+            before = await best_of(validated)
+            after = await best_of(trusted)
+            print(f"{description:<34} validated {before:8.1f} ms   trusted {after:8.1f} ms   x{before / after:.1f}")
+    finally:
+        await client.drop_database(db_name)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+"""
+Startup import budget for the API.
+
+Imports main.py in a fresh interpreter with `-X importtime`, prints the
+slowest top-level imports and fails (exit status 1) when:
+- the total import time of main exceeds the budget, or
+- a heavy dependency that should load lazily at first use (pandas, OpenCV,
+  NumPy, matplotlib, pyzk, httpx) is imported at startup.
+
+Run from the project root: python script/check_startup_time.py [budget_ms]
+The budget defaults to STARTUP_BUDGET_MS below; take the best of a few runs
+on a busy machine.
+"""
+import os
+import re
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STARTUP_BUDGET_MS = 1500
+LAZY_MODULES = ("pandas", "cv2", "numpy", "matplotlib", "zk", "httpx")
+RUNS = 3
+
+LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def import_times():
+    """[(module, cumulative_us, depth)] for one fresh `import main`."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        print(completed.stderr[-2000:])
+        sys.exit(f"❌ import main failed (exit status {completed.returncode})")
+
+    modules = []
+    for line in completed.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            _, cumulative, indent, name = match.groups()
+            modules.append((name, int(cumulative), (len(indent) - 1) // 2))
+    return modules
+
+
+def main():
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else STARTUP_BUDGET_MS
+
+    runs = [import_times() for _ in range(RUNS)]
+    modules = min(runs, key=lambda run: dict((name, us) for name, us, _ in run).get("main", 0))
+    total_ms = dict((name, us) for name, us, _ in modules).get("main", 0) / 1000
+
+    print("Slowest imports at startup:")
+    top_level = sorted((m for m in modules if m[2] <= 1 and m[0] != "main"), key=lambda m: m[1], reverse=True)
+    for name, cumulative, _ in top_level[:15]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    failures = 0
+    eager = sorted({name.split(".")[0] for name, _, _ in modules} & set(LAZY_MODULES))
+    for name in eager:
+        print(f"❌ {name} is imported at startup; import it where it is used")
+        failures += 1
+
+    if total_ms > budget_ms:
+        print(f"❌ import main took {total_ms:.0f} ms (budget {budget_ms:.0f} ms)")
+        failures += 1
+    else:
+        print(f"✅ import main took {total_ms:.0f} ms (budget {budget_ms:.0f} ms)")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+One-off compaction of images uploaded before the storage subsystem existed.
+
+- Student sheets stored as JPEG are re-encoded in place as compact grayscale
+  JPEGs (originals are kept under upload/originals for the retention period).
+  Other formats are left alone because their paths are referenced from Mongo.
+  Sheets that already have a kept original (compacted on upload or by an
+  earlier run) are skipped, so the script is safe to run again.
+- Thumbnails are generated for answer keys and course photos.
+
+Run from the project root: python script/compact_uploads.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.image_storage import compact_student_sheet, create_thumbnail, is_compacted
+
+STUDENT_SOLUTION_DIR = "upload/student_solutions"
+THUMBNAIL_DIRS = ["upload/solutions", "upload/photos"]
+
+
+def directory_size(directory):
+    return sum(
+        os.path.getsize(os.path.join(directory, name))
+        for name in os.listdir(directory)
+        if os.path.isfile(os.path.join(directory, name))
+    )
+
+
+before = directory_size(STUDENT_SOLUTION_DIR)
+compacted = 0
+already_compacted = 0
+for name in sorted(os.listdir(STUDENT_SOLUTION_DIR)):
+    path = f"{STUDENT_SOLUTION_DIR}/{name}"
+    if not (os.path.isfile(path) and name.lower().endswith((".jpg", ".jpeg"))):
+        continue
+    if is_compacted(path):
+        already_compacted += 1
+        continue
+    compact_student_sheet(path)
+    compacted += 1
+after = directory_size(STUDENT_SOLUTION_DIR)
+print(f"Compacted {compacted} student sheets: {before / 1024:.0f} KB -> {after / 1024:.0f} KB")
+print(f"Skipped {already_compacted} already compacted sheets")
+
+thumbnails = 0
+for directory in THUMBNAIL_DIRS:
+    if not os.path.isdir(directory):
+        continue
+    for name in sorted(os.listdir(directory)):
+        path = f"{directory}/{name}"
+        if os.path.isfile(path) and create_thumbnail(path):
+            thumbnails += 1
+print(f"Generated {thumbnails} thumbnails")
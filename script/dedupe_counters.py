@@ -0,0 +1,47 @@
+"""
+Merge duplicate id counters and make counters.name unique.
+
+The old get_next_id upserted counters without a unique index, so two
+workers could create the same counter twice. Each name is collapsed to one
+document holding the highest sequence_value (no id is handed out twice), the
+non-unique name index is dropped and the unique one is created.
+
+Run once from the project root before deploying: python script/dedupe_counters.py
+"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymongo import ASCENDING
+
+from app.database import db
+
+
+async def main():
+    counters = db["counters"]
+
+    merged = 0
+    async for group in counters.aggregate([
+        {"$sort": {"sequence_value": -1}},
+        {"$group": {"_id": "$name", "ids": {"$push": "$_id"}, "max": {"$max": "$sequence_value"}}},
+        {"$match": {"ids.1": {"$exists": True}}},
+    ]):
+        keep, *extra = group["ids"]
+        await counters.update_one({"_id": keep}, {"$set": {"sequence_value": group["max"]}})
+        await counters.delete_many({"_id": {"$in": extra}})
+        merged += len(extra)
+        print(f"🔧 {group['_id']}: kept sequence_value {group['max']}, removed {len(extra)} duplicates")
+    print(f"✅ {merged} duplicate counters removed")
+
+    for index in await counters.list_indexes().to_list(length=None):
+        if index["key"] == {"name": 1} and not index.get("unique"):
+            await counters.drop_index(index["name"])
+            print(f"🧹 Dropped non-unique index {index['name']}")
+    await counters.create_index([("name", ASCENDING)], unique=True)
+    print("✅ Unique index on counters.name")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,70 @@
+"""
+Local stand-in for the fingerprint host (HOST_REMOTE_URL) for testing the
+device outbox without a device.
+
+Answers DELETE /students/delete_fingerprint/{student_id} with 200, after an
+optional delay, and fails a share of the requests with 503 so retries and
+backoff can be watched in /maintenance/device-outbox. Every request is logged.
+Standard library only.
+
+Run from the project root:
+    python script/fingerprint_stub.py [--port 8001] [--failure-rate 0.3] [--latency-ms 200]
+then start the API with HOST_REMOTE_URL=http://127.0.0.1:8001
+"""
+import argparse
+import json
+import random
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DELETE_FINGERPRINT = re.compile(r"^/students/delete_fingerprint/(\d+)$")
+
+
+def make_handler(failure_rate: float, latency_ms: int):
+    class FingerprintStub(BaseHTTPRequestHandler):
+        # Keep-alive, like the real host behind the pooled client
+        protocol_version = "HTTP/1.1"
+
+        def _reply(self, status: int, body: dict):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_DELETE(self):
+            time.sleep(latency_ms / 1000)
+            match = DELETE_FINGERPRINT.match(self.path)
+            if match is None:
+                self._reply(404, {"detail": "Not found"})
+            elif random.random() < failure_rate:
+                self._reply(503, {"detail": "Device busy"})
+            else:
+                self._reply(200, {"message": f"Fingerprint of student {match.group(1)} deleted"})
+
+    return FingerprintStub
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="share of requests answered with 503")
+    parser.add_argument("--latency-ms", type=int, default=0, help="delay before every answer")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args.failure_rate, args.latency_ms))
+    print(f"🖐️ Fingerprint stub on http://{args.host}:{args.port} "
+          f"(failure rate {args.failure_rate:.0%}, latency {args.latency_ms} ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Move the legacy students.attendance {"dayN": true} maps into attendance_events.
+
+The dayN entries carry no date, so each one becomes an event with
+legacy_day=N, timestamped with the fixed LEGACY_TIMESTAMP (the epoch) so it
+never falls inside a real day, and attached to the student's current group.
+Safe to run more than once: events are upserted on (student_id, legacy_day),
+and events from earlier runs are moved to LEGACY_TIMESTAMP.
+
+Pass --unset to remove the attendance maps from the students afterwards.
+
+Run from the project root: python script/migrate_attendance_events.py [--unset]
+"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from beanie import init_beanie
+from pymongo import UpdateOne
+
+from app.database import db, student_collection
+from app.models.attendance_event import AttendanceEvent
+from app.utils.attendance_events import LEGACY_TIMESTAMP
+
+BATCH_SIZE = 1000
+
+
+def legacy_day(key):
+    number = key[3:] if key.startswith("day") else ""
+    return int(number) if number.isdigit() else None
+
+
+async def main(unset: bool):
+    # Creates the attendance_events indexes
+    await init_beanie(database=db, document_models=[AttendanceEvent])
+    events = AttendanceEvent.get_motor_collection()
+
+    group_of = {}
+    async for group in db["groups"].find({}, {"students": 1}):
+        for student_id in group.get("students", []):
+            group_of[student_id] = group["_id"]
+
+    migrated_students = 0
+    operations = []
+    upserted = 0
+    async for student in student_collection.find(
+        {"attendance": {"$exists": True, "$ne": {}}}, {"uid": 1, "attendance": 1}
+    ):
+        migrated_students += 1
+        for key, present in (student.get("attendance") or {}).items():
+            day = legacy_day(key)
+            if day is None or not present:
+                continue
+            operations.append(UpdateOne(
+                {"student_id": student["_id"], "legacy_day": day},
+                {
+                    "$set": {"timestamp": LEGACY_TIMESTAMP},
+                    "$setOnInsert": {
+                        "uid": student.get("uid", 0),
+                        "group_id": group_of.get(student["_id"]),
+                        "approved": False,
+                    },
+                },
+                upsert=True
+            ))
+            if len(operations) >= BATCH_SIZE:
+                upserted += (await events.bulk_write(operations, ordered=False)).upserted_count
+                operations = []
+    if operations:
+        upserted += (await events.bulk_write(operations, ordered=False)).upserted_count
+
+    print(f"✅ {migrated_students} students scanned, {upserted} attendance events created")
+
+    if unset:
+        result = await student_collection.update_many({"attendance": {"$exists": True}}, {"$unset": {"attendance": ""}})
+        print(f"🧹 Removed attendance maps from {result.modified_count} students")
+
+
+if __name__ == "__main__":
+    asyncio.run(main("--unset" in sys.argv[1:]))
@@ -0,0 +1,83 @@
+"""
+Copy exam submissions embedded in students.exams into the exam_results
+collection and recompute exams.student_count.
+
+Safe to run more than once: the unique (exam_id, student_id) index skips
+results that were already migrated. The embedded arrays are left in place.
+
+Run from the project root: python script/migrate_exam_results.py
+"""
+import asyncio
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from beanie import init_beanie
+from pymongo.errors import BulkWriteError
+
+from app.database import db, student_collection
+from app.models.exam_result import ExamResult
+
+BATCH_SIZE = 1000
+
+
+async def flush(documents):
+    if not documents:
+        return 0
+    try:
+        result = await ExamResult.get_motor_collection().insert_many(documents, ordered=False)
+        return len(result.inserted_ids)
+    except BulkWriteError as e:
+        if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+            raise
+        return e.details.get("nInserted", 0)
+
+
+async def main():
+    # Creates the exam_results indexes
+    await init_beanie(database=db, document_models=[ExamResult])
+
+    inserted = 0
+    scanned = 0
+    batch = []
+    async for student in student_collection.find({"exams.0": {"$exists": True}}, {"exams": 1}):
+        seen = set()
+        for entry in student.get("exams", []):
+            exam_id = str(entry.get("exam_id", ""))
+            if not exam_id or exam_id in seen:
+                continue
+            seen.add(exam_id)
+            scanned += 1
+            batch.append({
+                "exam_id": exam_id,
+                "student_id": student["_id"],
+                # ExamEntry written by the exam routes / embedded schema variants
+                "degree": entry.get("degree", entry.get("student_degree")),
+                "percentage": entry.get("percentage", entry.get("degree_percentage")),
+                "delivery_time": entry.get("delivery_time") or datetime.utcnow(),
+                "solution_photo": entry.get("solution_photo"),
+                "created_at": datetime.utcnow(),
+            })
+            if len(batch) >= BATCH_SIZE:
+                inserted += await flush(batch)
+                batch = []
+    inserted += await flush(batch)
+    print(f"✅ {scanned} embedded submissions scanned, {inserted} new exam results")
+
+    # Recompute participant counts from the migrated results
+    counts = {}
+    async for row in ExamResult.get_motor_collection().aggregate(
+        [{"$group": {"_id": "$exam_id", "count": {"$sum": 1}}}]
+    ):
+        counts[row["_id"]] = row["count"]
+
+    exams = db["exams"]
+    async for exam in exams.find({}, {"_id": 1}):
+        await exams.update_one({"_id": exam["_id"]}, {"$set": {"student_count": counts.get(str(exam["_id"]), 0)}})
+    print(f"✅ student_count updated on {len(counts)} exams with results")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
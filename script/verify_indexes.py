@@ -0,0 +1,206 @@
+"""
+Check that every hot query path is served by an index.
+
+Creates a scratch database (<DATABASE_NAME>_index_check), lets init_beanie
+build the declared indexes, seeds a few thousand documents, then runs
+explain() on the queries the routes issue. Exits with status 1 if any
+winning plan contains a COLLSCAN. The scratch database is dropped afterwards.
+
+Run from the project root: python script/verify_indexes.py
+"""
+import asyncio
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from beanie import init_beanie
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.config import settings
+from app.models.archived_student import ArchivedStudentModel
+from app.models.blacklist import BlacklistStudent
+from app.models.booksale import BookSale
+from app.models.attendance_event import AttendanceEvent
+from app.models.counter import Counter
+from app.models.exam_result import ExamResult
+from app.models.grading_review import GradingReview
+from app.models.group import Group
+from app.models.maintenance_job import MaintenanceJob
+from app.models.monthsale import MonthlySale
+from app.models.outgoing import Outgoing
+from app.models.student import StudentModel
+from app.models.student_default_price import StudentDefaultPrice
+from app.utils.student_search import search_terms
+
+SEED_STUDENTS = 2000
+EXAM_ID = str(ObjectId())
+MONTH_START = datetime(2025, 1, 1)
+
+
+def seed_students():
+    return [
+        {
+            "_id": ObjectId(),
+            "student_id": 10000 + i,
+            "uid": 1000 + i,
+            "first_name": f"first{i}",
+            "last_name": f"last{i}",
+            "phone_number": f"010{i:08d}",
+            "level": i % 3 + 1,
+            "is_subscription": i % 2 == 0,
+            "exams": [{"exam_id": EXAM_ID, "student_degree": 10}] if i % 10 == 0 else [],
+            "subscription": {"monthsales": {}},
+            "created_at": MONTH_START,
+        }
+        for i in range(SEED_STUDENTS)
+    ]
+
+
+def sales_for(students):
+    return [
+        {
+            "_id": i,
+            "student_id": student["_id"],
+            "price": 200,
+            "default_price": 200,
+            "month": MONTH_START + timedelta(days=31 * (i % 6)),
+            "created_at": MONTH_START + timedelta(days=i % 180),
+        }
+        for i, student in enumerate(students)
+    ]
+
+
+async def seed(db):
+    students = seed_students()
+    for student in students:
+        student["search_terms"] = search_terms(student)
+    await db["students"].insert_many(students)
+    await db["archived_students"].insert_many([{**s, "_id": ObjectId()} for s in students[:500]])
+    await db["blacklist"].insert_many(
+        [{**s, "_id": ObjectId(), "original_student_object_id": s["_id"]} for s in students[:500]]
+    )
+    await db["groups"].insert_many([
+        {"group_name": f"group{g}", "start_time": "10:00", "level": 1, "days": ["Saturday"],
+         "students": [s["_id"] for s in students[g::50]]}
+        for g in range(50)
+    ])
+    await db["monthsales"].insert_many(sales_for(students))
+    await db["booksales"].insert_many(sales_for(students))
+    await db["outgoings"].insert_many(
+        [{"_id": i, "product_name": "paper", "price": 10, "created_at": MONTH_START + timedelta(days=i % 180)}
+         for i in range(SEED_STUDENTS)]
+    )
+    await db["student_default_prices"].insert_many(
+        [{"student_id": s["student_id"], "default_price": 200} for s in students]
+    )
+    await db["exam_results"].insert_many(
+        [{"exam_id": EXAM_ID if i % 10 == 0 else str(ObjectId()), "student_id": s["_id"], "degree": 10,
+          "delivery_time": MONTH_START} for i, s in enumerate(students)]
+    )
+    groups = await db["groups"].find({}, {"students": 1}).to_list(length=None)
+    group_of = {student_id: group["_id"] for group in groups for student_id in group["students"]}
+    await db["attendance_events"].insert_many(
+        [{"uid": s["uid"], "student_id": s["_id"], "group_id": group_of.get(s["_id"]),
+          "timestamp": MONTH_START + timedelta(days=day, hours=i % 12), "approved": False}
+         for i, s in enumerate(students) for day in range(0, 60, 15)]
+    )
+    await db["counters"].insert_many([{"name": f"counter{i}", "sequence_value": i} for i in range(200)])
+    await db["grading_reviews"].insert_many(
+        [{"exam_id": str(ObjectId()), "solution_photo": "x.jpg", "reason": "unknown_student", "resolved": False}
+         for _ in range(500)]
+    )
+    return students
+
+
+def hot_queries(students):
+    """(description, collection, filter, sort) for each query the routes issue."""
+    sample = random.Random(0).sample(students, 25)
+    student = sample[0]
+    month_end = MONTH_START + timedelta(days=31)
+    return [
+        ("attendance: student by uid", "students", {"uid": student["uid"]}, None),
+        ("students: by student_id", "students", {"student_id": student["student_id"]}, None),
+        ("batch grading: roster $in", "students", {"student_id": {"$in": [s["student_id"] for s in sample]}}, None),
+        ("blacklist check: phone", "blacklist", {"phone_number": student["phone_number"]}, None),
+        ("blacklist check: name", "blacklist",
+         {"first_name": student["first_name"], "last_name": student["last_name"]}, None),
+        ("blacklist: original student", "blacklist", {"original_student_object_id": student["_id"]}, None),
+        ("exams: roster", "exam_results", {"exam_id": EXAM_ID}, None),
+        ("exams: student submission", "exam_results", {"exam_id": EXAM_ID, "student_id": student["_id"]}, None),
+        ("attendance: group/day roster", "attendance_events",
+         {"group_id": ObjectId(), "timestamp": {"$gte": MONTH_START, "$lt": MONTH_START + timedelta(days=1)}}, None),
+        ("attendance: student history", "attendance_events", {"student_id": student["_id"]}, [("timestamp", -1)]),
+        ("groups: group of a student", "groups", {"students": student["_id"]}, None),
+        ("groups: groups of a page", "groups", {"students": {"$in": [s["_id"] for s in sample]}}, None),
+        ("monthsales: by student", "monthsales", {"student_id": student["_id"]}, None),
+        ("monthsales: last default price", "monthsales", {"student_id": student["_id"]}, [("created_at", -1)]),
+        ("monthsales: by month", "monthsales", {"month": MONTH_START}, None),
+        ("monthsales: month range", "monthsales", {"created_at": {"$gte": MONTH_START, "$lt": month_end}}, None),
+        ("booksales: by student", "booksales", {"student_id": student["_id"]}, None),
+        ("booksales: last default price", "booksales", {"student_id": student["_id"]}, [("created_at", -1)]),
+        ("booksales: month range", "booksales", {"created_at": {"$gte": MONTH_START, "$lt": month_end}}, None),
+        ("outgoings: month range", "outgoings", {"created_at": {"$gte": MONTH_START, "$lt": month_end}}, None),
+        ("archive: by student_id", "archived_students", {"student_id": student["student_id"]}, None),
+        ("search: name prefix", "students", {"search_terms": {"$all": ["first1", "las"]}}, None),
+        ("search: archived phone prefix", "archived_students", {"search_terms": {"$all": ["0100"]}}, None),
+        ("financial reports: default price", "student_default_prices", {"student_id": student["student_id"]}, None),
+        ("counters: by name", "counters", {"name": "counter7"}, None),
+        ("exams: open grading reviews", "grading_reviews", {"exam_id": EXAM_ID, "resolved": False}, None),
+        ("maintenance: job lock", "maintenance_jobs", {"name": "archive_unpaid_students"}, None),
+    ]
+
+
+def plan_stages(plan):
+    """All stage names of a (possibly nested) query plan."""
+    stages = [plan.get("stage")]
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            stages += plan_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        stages += plan_stages(child)
+    return stages
+
+
+async def main():
+    client = AsyncIOMotorClient(settings.MONGO_URI)
+    db_name = f"{settings.DATABASE_NAME}_index_check"
+    await client.drop_database(db_name)
+    db = client[db_name]
+
+    try:
+        await init_beanie(
+            database=db,
+            document_models=[
+                StudentModel, ArchivedStudentModel, BlacklistStudent, Group, MonthlySale, BookSale,
+                Outgoing, StudentDefaultPrice, Counter, GradingReview, MaintenanceJob, ExamResult,
+                AttendanceEvent,
+            ]
+        )
+        students = await seed(db)
+
+        failures = 0
+        for description, collection, query, sort in hot_queries(students):
+            cursor = db[collection].find(query)
+            if sort:
+                cursor = cursor.sort(sort)
+            explain = await cursor.explain()
+            stages = plan_stages(explain["queryPlanner"]["winningPlan"])
+            ok = "COLLSCAN" not in stages
+            failures += not ok
+            print(f"{'✅' if ok else '❌'} {description:<38} {' <- '.join(s for s in stages if s)}")
+    finally:
+        await client.drop_database(db_name)
+        client.close()
+
+    if failures:
+        print(f"❌ {failures} queries fall back to a collection scan")
+        sys.exit(1)
+    print("✅ All hot queries use an index")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())